@@ -0,0 +1,61 @@
+# benchmarks/bench_dataset.py
+#
+# Sharded multi-athlete dataset (crimpy.dataset): time to answer one athlete's question
+# (reads only that athlete's shards) against a team-wide query, and the team-wide query
+# against the number of worker processes.
+#
+#   python benchmarks/bench_dataset.py --athletes 50 --sets 20000
+
+import os
+import time
+import argparse
+import tempfile
+from datetime import datetime
+
+from crimpy.dataset import Dataset, athlete_sources, build_dataset
+from crimpy.synthetic import iter_synthetic, write_archive
+
+
+def timeit(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded dataset queries: one athlete vs the whole team.")
+    parser.add_argument("--athletes", type=int, default=20)
+    parser.add_argument("--sets", type=int, default=20000, help="synthetic sets per athlete")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as root:
+        team = os.path.join(root, "team")
+        os.makedirs(team)
+        for a in range(args.athletes):
+            write_archive(os.path.join(team, f"athlete{a:04d}.jsonl"),
+                          iter_synthetic(args.sets, seed=a, start=datetime(2020, 1, 1)))
+        dataset_dir = os.path.join(root, "dataset")
+        t0 = time.perf_counter()
+        build_dataset(athlete_sources(team), dataset_dir)
+        dataset = Dataset(dataset_dir)
+        print(f"{args.athletes} athletes x {args.sets} sets: {len(dataset)} shards built in "
+              f"{time.perf_counter() - t0:.2f} s, {cores} cores")
+
+        one = dataset.athletes[:1]
+        print(f"{'query':>28} {'workers':>8} {'shards':>7} {'time [ms]':>10}")
+        for label, athletes, start in (("one athlete", one, None), ("one athlete, since April", one, "2020-04-01"),
+                                       ("team", None, None)):
+            n_shards = len(dataset.shards(athletes, start))
+            for workers in sorted({1, cores}):
+                t = timeit(lambda: (dataset.intensity_distribution(athletes, start, workers=workers),
+                                    dataset.edge_totals(athletes, start, workers=workers)), args.repeat)
+                print(f"{label:>28} {workers:>8} {n_shards:>7} {t * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_diagnostics.py
+#
+# Cost of the scoring diagnostics (crimpy.diagnostics) at each level, on synthetic sessions.
+# "per-set + text" writes one line per set to /dev/null, which is what the old print() calls did.
+#
+#   python benchmarks/bench_diagnostics.py --sets 100000
+
+import os
+import time
+import argparse
+
+from crimpy.synthetic import iter_synthetic
+from crimpy.diagnostics import Diagnostics
+from crimpy.intensity import WorkoutIntensityCalculator
+
+
+def score(workouts, diagnostics):
+    for data in workouts:
+        WorkoutIntensityCalculator(data, diagnostics=diagnostics).calculate_intensity_breakdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring time at each diagnostics level.")
+    parser.add_argument("--sets", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workouts = list(iter_synthetic(args.sets))
+    with open(os.devnull, "w") as devnull:
+        levels = [
+            ("off", lambda: Diagnostics("off")),
+            ("summary", lambda: Diagnostics("summary")),
+            ("per-set", lambda: Diagnostics("per-set")),
+            ("per-set + text", lambda: Diagnostics("per-set", stream=devnull)),
+        ]
+        print(f"{args.sets} sets in {len(workouts)} sessions")
+        print(f"{'level':>16} {'time [s]':>10} {'sets/s':>10} {'vs off':>8}")
+        reference = None
+        for name, make in levels:
+            best = float("inf")
+            for _ in range(args.repeat):
+                diagnostics = make()
+                t0 = time.perf_counter()
+                score(workouts, diagnostics)
+                best = min(best, time.perf_counter() - t0)
+            if reference is None:
+                reference = best
+            print(f"{name:>16} {best:>10.3f} {args.sets / best:>10.0f} {best / reference:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_import.py
+#
+# Start-up cost of the numeric (non-plotting) crimpy API, measured in fresh interpreters.
+# Reports the time spent importing numpy alone, the extra time of crimpy on top of it,
+# and checks that matplotlib is not imported along the way. The budget applies to the
+# crimpy part only: the numpy floor depends on the machine and is not ours to cut.
+#
+#   python benchmarks/bench_import.py --runs 20 --budget-ms 50
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+# The library modules a numbers-only script typically needs.
+NUMERIC_MODULES = [
+    "crimpy.intensity",
+    "crimpy.batch",
+    "crimpy.loader",
+    "crimpy.index",
+    "crimpy.records",
+    "crimpy.aggregate",
+    "crimpy.store",
+    "crimpy.archive",
+    "crimpy.ingest",
+]
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import numpy
+t1 = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1, int("matplotlib" in sys.modules))
+"""
+
+
+def probe(modules):
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (src, env.get("PYTHONPATH")) if p)
+    out = subprocess.run([sys.executable, "-c", _PROBE] + modules, env=env,
+                         capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]), float(out[1]), bool(int(out[2]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of the numeric crimpy API.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="fail when crimpy adds more than this (median)")
+    args = parser.parse_args()
+
+    numpy_times, crimpy_times = [], []
+    for _ in range(args.runs):
+        t_numpy, t_crimpy, has_matplotlib = probe(NUMERIC_MODULES)
+        numpy_times.append(t_numpy * 1000)
+        crimpy_times.append(t_crimpy * 1000)
+        if has_matplotlib:
+            sys.exit("matplotlib was imported by the numeric API")
+
+    numpy_ms = statistics.median(numpy_times)
+    crimpy_ms = statistics.median(crimpy_times)
+    print(f"numpy:          {numpy_ms:6.1f} ms (median of {args.runs})")
+    print(f"crimpy on top:  {crimpy_ms:6.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"total:          {numpy_ms + crimpy_ms:6.1f} ms")
+    print("matplotlib imported: no")
+    if crimpy_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
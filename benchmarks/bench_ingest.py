@@ -0,0 +1,73 @@
+# benchmarks/bench_ingest.py
+#
+# Speedup of crimpy.ingest.ingest against the number of worker processes.
+# Builds a throw-away archive by replicating the sessions of data/ over several athletes,
+# then times ingestion with 1, 2, 4, ... workers up to the number of cores.
+#
+#   python benchmarks/bench_ingest.py --athletes 20 --copies 50
+
+import os
+import json
+import glob
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+from crimpy.ingest import ingest
+
+data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def build_archive(root, athletes, copies):
+    """
+    Writes athletes x copies x len(data/) session files under root, one folder per athlete.
+    """
+    sessions = []
+    for file_path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        with open(file_path, "r") as f:
+            sessions.append(json.load(f))
+    n = 0
+    for a in range(athletes):
+        athlete_dir = os.path.join(root, f"athlete{a:04d}")
+        os.makedirs(athlete_dir)
+        for c in range(copies):
+            for i, data in enumerate(sessions):
+                date = datetime.strptime(data["date"], "%d-%m-%Y") + timedelta(days=7 * c)
+                data = dict(data, date=date.strftime("%d-%m-%Y"))
+                with open(os.path.join(athlete_dir, f"s{c:05d}_{i:02d}.json"), "w") as f:
+                    json.dump(data, f)
+                n += 1
+    return n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestion speedup against worker count.")
+    parser.add_argument("--athletes", type=int, default=10)
+    parser.add_argument("--copies", type=int, default=50)
+    parser.add_argument("--chunksize", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, cores} | {2 ** k for k in range(cores.bit_length()) if 2 ** k <= cores})
+
+    with tempfile.TemporaryDirectory() as root:
+        n_files = build_archive(root, args.athletes, args.copies)
+        print(f"{n_files} session files, {cores} cores, chunksize {args.chunksize}")
+        print(f"{'workers':>8} {'time [s]':>10} {'files/s':>10} {'speedup':>8}")
+        reference = None
+        for workers in worker_counts:
+            best = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                scored = ingest(root, workers=workers, chunksize=args.chunksize)
+                best = min(best, time.perf_counter() - t0)
+            assert len(scored) == n_files
+            if reference is None:
+                reference = best
+            print(f"{workers:>8} {best:>10.3f} {n_files / best:>10.0f} {reference / best:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
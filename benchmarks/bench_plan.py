@@ -0,0 +1,79 @@
+# benchmarks/bench_plan.py
+#
+# Plan simulation (crimpy.plan): Monte Carlo candidates scored as tiled set columns, against
+# building each candidate's sessions and scoring them with batch_intensity_breakdown, and
+# the tiled path against the number of worker processes.
+#
+#   python benchmarks/bench_plan.py --weeks 12 --samples 20000
+
+import os
+import time
+import copy
+import random
+import argparse
+from datetime import date
+
+import numpy as np
+
+from crimpy.batch import batch_intensity_breakdown, scored_blocks
+from crimpy.parsing import time_str_to_seconds
+from crimpy.plan import DEFAULT_REST_COLUMN, REST_COLUMNS, Plan, PlanSimulator
+from crimpy.synthetic import synthetic_session
+
+
+def synthetic_plan(weeks, days=(0, 2, 4, 5), sets_per_session=30, seed=0):
+    rng = random.Random(seed)
+    start = date(2026, 1, 5)
+    sessions = [(day, synthetic_session(rng, start, sets_per_session)) for day in days]
+    return Plan(start, weeks, sessions, name="synthetic")
+
+
+def one_by_one(workouts, keep, factors):
+    # What a script would do: write out each candidate's sessions and score them.
+    totals = []
+    for c in range(len(keep)):
+        candidate = []
+        for w, (_, data) in enumerate(workouts):
+            if not keep[c, w]:
+                continue
+            data = copy.deepcopy(data)
+            for scorer, _, sets in scored_blocks(data):
+                field = REST_COLUMNS.get(scorer.name, DEFAULT_REST_COLUMN)[:-len("_s")]
+                for s in sets:
+                    if field in s:
+                        s[field] = float(np.rint(time_str_to_seconds(s[field]) * factors[c, w]))
+            candidate.append(data)
+        totals.append(sum(values.sum() for values in batch_intensity_breakdown(candidate).values()))
+    return np.array(totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan simulation: tiled batch scoring vs one candidate at a time.")
+    parser.add_argument("--weeks", type=int, default=8)
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--baseline-samples", type=int, default=50, help="candidates scored one by one")
+    args = parser.parse_args()
+
+    plan = synthetic_plan(args.weeks)
+    t0 = time.perf_counter()
+    sim = PlanSimulator(plan)
+    print(f"{sim.n_sessions} sessions, {sim.n_sets} sets, parsed in {time.perf_counter() - t0:.3f} s")
+
+    keep, factors = sim.sample(args.baseline_samples, miss=0.1, rest=0.2)
+    t0 = time.perf_counter()
+    expected = one_by_one(plan.expand(), keep, factors)
+    t_one = (time.perf_counter() - t0) / args.baseline_samples
+    breakdown = sim.evaluate(keep, factors)
+    assert np.allclose(sum(v.sum(axis=1) for v in breakdown.values()), expected)
+
+    print(f"{'path':>12} {'workers':>8} {'candidates/s':>13} {'speedup':>8}")
+    print(f"{'one by one':>12} {1:>8} {1 / t_one:>13.0f} {1:>7.1f}x")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        t0 = time.perf_counter()
+        sim.simulate(args.samples, miss=0.1, rest=0.2, workers=workers)
+        t = (time.perf_counter() - t0) / args.samples
+        print(f"{'tiled':>12} {workers:>8} {1 / t:>13.0f} {t_one / t:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
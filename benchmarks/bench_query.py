@@ -0,0 +1,63 @@
+# benchmarks/bench_query.py
+#
+# Lazy queries with pushdown (crimpy.query) against loading everything and filtering
+# afterwards, for short and long date windows over a synthetic archive.
+#
+#   python benchmarks/bench_query.py --sets 1000000
+
+import os
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from crimpy.archive import iter_sessions
+from crimpy.query import sessions, col
+from crimpy.records import SetTable
+from crimpy.scorers import SCORERS
+from crimpy.synthetic import iter_synthetic, write_archive
+
+START = datetime(2000, 1, 1)
+
+
+def load_then_filter(archive_path, start, end):
+    # What the apps did: every set of every session, then the filters on the rows.
+    rows = SetTable.from_sessions(iter_sessions(archive_path)).array
+    mask = ((rows["day"] >= start) & (rows["day"] <= end) & (rows["kind"] == SCORERS["fingerboard"].code)
+            & (rows["edge_mm"] <= 20))
+    return rows[mask]
+
+
+def pushed_down(archive_path, start, end):
+    query = sessions(archive_path).between(start, end).of_type("fingerboard").where(col("edge_mm") <= 20)
+    return query.sets().array
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query pushdown against load-then-filter.")
+    parser.add_argument("--sets", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        archive_path = os.path.join(root, "sessions.jsonl")
+        n = write_archive(archive_path, iter_synthetic(args.sets, start=START))
+        days = [(START + timedelta(days=i)).toordinal() for i in range(n)]
+        print(f"{args.sets} sets in {n} sessions ({os.path.getsize(archive_path) / 1e6:.0f} MB)")
+        print(f"{'window':>10} {'rows':>8} {'load+filter [s]':>16} {'query [s]':>10} {'speedup':>8}")
+        for window in (7, 30, 365, n):
+            start, end = days[-min(window, n)], days[-1]
+            t0 = time.perf_counter()
+            expected = load_then_filter(archive_path, start, end)
+            t_full = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            rows = pushed_down(archive_path, start, end)
+            t_query = time.perf_counter() - t0
+            assert np.array_equal(np.sort(rows["timeon_s"]), np.sort(expected["timeon_s"]))
+            label = "all" if window == n else f"{window} d"
+            print(f"{label:>10} {len(rows):>8} {t_full:>16.2f} {t_query:>10.2f} {t_full / t_query:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_records.py
+#
+# Memory of the per-set objects built by the apps (Fingerboard, CampusBoard, Pullup)
+# against the compact SetTable of crimpy.records, for the same sets.
+#
+#   python benchmarks/bench_records.py --sets 1000000
+
+import os
+import time
+import argparse
+import tracemalloc
+from datetime import timedelta
+
+from crimpy.loader import load_sessions
+from crimpy.records import SetTable
+from crimpy.fingerboard import Fingerboard
+from crimpy.campusboard import CampusBoard
+from crimpy.pullup import Pullup
+
+data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def sessions_with_sets(n_sets):
+    """
+    Replicates the sessions of data/ (one week apart) until they hold at least n_sets sets.
+    Yields (date, data) pairs.
+    """
+    base = [s for s in load_sessions(data_dir) if "exercises" in s.data]
+    per_round = sum(len(ex.sets) for s in base for ex in s.exercises if ex.done)
+    for r in range(n_sets // per_round + 1):
+        for s in base:
+            yield s.date + timedelta(days=7 * r), s.data
+
+
+def build_objects(n_sets):
+    objects = []
+    for date, data in sessions_with_sets(n_sets):
+        for ex in data.get("exercises", []):
+            if not ex.get("executed") or ex.get("order", 0) == 0:
+                continue
+            for s in ex.get("sets", []):
+                ex_type = ex["type"].lower()
+                if ex_type == "fingerboard":
+                    objects.append(Fingerboard(date, s.get("edge"), s.get("reps"), s.get("timeon"),
+                                               s.get("timeoff"), s.get("rest")))
+                elif ex_type == "campus board" and "steps" in s:
+                    objects.append(CampusBoard(date, s.get("edge"), s.get("steps"), s.get("timeoff"), s.get("sides")))
+                elif ex_type == "pullup":
+                    objects.append(Pullup(date, s.get("edge"), s))
+    return objects
+
+
+def build_table(n_sets):
+    table = SetTable()
+    for date, data in sessions_with_sets(n_sets):
+        table.add_session(date, data)
+    table.array  # consolidate the chunks
+    return table
+
+
+def measure(func, n_sets):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = func(n_sets)
+    elapsed = time.perf_counter() - t0
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory of per-set objects against SetTable.")
+    parser.add_argument("--sets", type=int, default=200000)
+    args = parser.parse_args()
+
+    load_sessions(data_dir)  # keep the loader cache out of the measurements
+    objects, obj_bytes, obj_peak, obj_time = measure(build_objects, args.sets)
+    n_objects = len(objects)
+    del objects
+    table, tab_bytes, tab_peak, tab_time = measure(build_table, args.sets)
+
+    print(f"{'container':>12} {'sets':>10} {'bytes/set':>10} {'peak MB':>9} {'build [s]':>10}")
+    print(f"{'objects':>12} {n_objects:>10} {obj_bytes / n_objects:>10.1f} {obj_peak / 1e6:>9.1f} {obj_time:>10.2f}")
+    print(f"{'SetTable':>12} {len(table):>10} {tab_bytes / len(table):>10.1f} {tab_peak / 1e6:>9.1f} {tab_time:>10.2f}")
+    print(f"memory reduction: {obj_bytes / tab_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
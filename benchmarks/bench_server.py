@@ -0,0 +1,115 @@
+# benchmarks/bench_server.py
+#
+# Load test of the query server (crimpy.server): latency percentiles and throughput under
+# concurrent clients, with the response cache cold, warm, and disabled.
+# Runs against synthetic sessions, or a data directory / archive given as --source.
+#
+#   python benchmarks/bench_server.py --sets 200000 --clients 16 --requests 200
+
+import time
+import random
+import argparse
+import threading
+import http.client
+from datetime import datetime
+
+import numpy as np
+
+from crimpy.loader import Session, DATE_FORMAT
+from crimpy.synthetic import iter_synthetic
+from crimpy.server import QueryIndex, QueryServer, load_index
+
+QUERIES = ("effort_by_edge", "campus_by_edge", "reps_by_weight", "intensity")
+
+
+def query_targets(n, seed=0):
+    """
+    n request targets mixing the queries, windows and periods a dashboard would ask for.
+    """
+    rng = random.Random(seed)
+    targets = []
+    for _ in range(n):
+        name = rng.choice(QUERIES)
+        target = f"/{name}?days={rng.choice((7, 30, 90, 365))}"
+        if name == "intensity":
+            target += f"&period={rng.choice(('day', 'week', 'month'))}"
+        targets.append(target)
+    return targets
+
+
+def client(port, targets, latencies, errors):
+    # One keep-alive connection per client, like a dashboard polling its panels.
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    for target in targets:
+        t0 = time.perf_counter()
+        conn.request("GET", target)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - t0)
+        if response.status != 200:
+            errors.append((target, response.status))
+    conn.close()
+
+
+def run_load(port, clients, requests, seed):
+    """
+    Runs clients threads of requests each. Returns (latencies in s, wall time in s, errors).
+    """
+    latencies = []
+    errors = []
+    threads = [threading.Thread(target=client, args=(port, query_targets(requests, seed + c), latencies, errors))
+               for c in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return np.array(latencies), time.perf_counter() - t0, errors
+
+
+def report(label, latencies, wall):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    print(f"{label:>10} {len(latencies):>9} {len(latencies) / wall:>9.0f} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the query server.")
+    parser.add_argument("--source", help="data directory or .jsonl archive (synthetic sessions by default)")
+    parser.add_argument("--sets", type=int, default=100000, help="number of synthetic sets")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    if args.source:
+        index = load_index(args.source)
+    else:
+        index = QueryIndex(Session("synthetic", data, datetime.strptime(data["date"], DATE_FORMAT))
+                           for data in iter_synthetic(args.sets, seed=args.seed))
+    print(f"{index.n_sets} sets in {index.n_sessions} sessions, indexed in {time.perf_counter() - t0:.2f} s")
+    print(f"{args.clients} clients x {args.requests} requests")
+    print(f"{'cache':>10} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+    for label, cache_size in (("off", 0), ("cold", 1024)):
+        server = QueryServer(("127.0.0.1", 0), index, cache_size)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        port = server.server_address[1]
+        try:
+            latencies, wall, errors = run_load(port, args.clients, args.requests, args.seed)
+            report(label, latencies, wall)
+            if cache_size:
+                # Same requests again, all answered from the cache.
+                latencies, wall, more = run_load(port, args.clients, args.requests, args.seed)
+                report("warm", latencies, wall)
+                errors += more
+        finally:
+            server.shutdown()
+            server.server_close()
+        if errors:
+            print(f"{len(errors)} failed requests, e.g. {errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
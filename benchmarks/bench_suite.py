@@ -0,0 +1,173 @@
+# benchmarks/bench_suite.py
+#
+# Time and peak memory of every scoring path and of the app aggregations, on synthetic
+# sessions (crimpy.synthetic), with a check against a stored baseline.
+#
+#   python benchmarks/bench_suite.py --sets 100000 --save-baseline     (once, on a known-good tree)
+#   python benchmarks/bench_suite.py --sets 100000                     (reports regressions)
+#
+# The baseline is machine specific: record it on the machine that runs the comparison.
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from datetime import datetime
+
+from crimpy.synthetic import iter_synthetic, parse_mix
+from crimpy.loader import Session, DATE_FORMAT
+from crimpy.ingest import score_sessions
+from crimpy.intensity import WorkoutIntensityCalculator
+from crimpy.records import SetTable
+from crimpy.fingerboard import Fingerboard
+from crimpy.campusboard import CampusBoard
+from crimpy.pullup import Pullup
+from crimpy import aggregate
+from crimpy.rollup import RollupEngine
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def prepare(n_sets, mix, seed):
+    """
+    Builds the inputs of every case once, outside of the measurements.
+    """
+    workouts = list(iter_synthetic(n_sets, mix=mix, seed=seed))
+    sessions = [Session(f"synthetic_{i:07d}.json", data, datetime.strptime(data["date"], DATE_FORMAT))
+                for i, data in enumerate(workouts)]
+    sets = {"fingerboard": [], "campus board": [], "pullup": []}
+    for session in sessions:
+        for ex_type, bucket in sets.items():
+            bucket.extend((session.date, s) for s in session.sets(ex_type))
+    table = SetTable.from_sessions(sessions)
+    return {"workouts": workouts, "sessions": sessions, "sets": sets, "table": table,
+            "scored": score_sessions(sessions)}
+
+
+def _scalar_breakdown(inputs):
+    return [WorkoutIntensityCalculator(w).calculate_intensity_breakdown() for w in inputs["workouts"]]
+
+
+def _fingerboard_objects(inputs):
+    return [Fingerboard(d, s.get("edge"), s.get("reps"), s.get("timeon"), s.get("timeoff"), s.get("rest"))
+            for d, s in inputs["sets"]["fingerboard"]]
+
+
+def _campusboard_objects(inputs):
+    return [CampusBoard(d, s.get("edge"), s.get("steps"), s.get("timeoff"), s.get("sides"))
+            for d, s in inputs["sets"]["campus board"]]
+
+
+def _pullup_objects(inputs):
+    return [Pullup(d, s.get("edge"), s) for d, s in inputs["sets"]["pullup"]]
+
+
+def _set_table(inputs):
+    table = SetTable.from_sessions(inputs["sessions"])
+    return table.array
+
+
+def _rollups(inputs):
+    # Every set-level measure at every calendar period, from a cold engine.
+    engine = RollupEngine(inputs["table"])
+    return [engine.rollup(measure, period) for measure in ("effort", "campus", "pullup")
+            for period in ("day", "week", "month", "year")]
+
+
+CASES = {
+    "breakdown_scalar": _scalar_breakdown,
+    "breakdown_batch": lambda inputs: WorkoutIntensityCalculator.calculate_intensity_breakdown_batch(inputs["workouts"]),
+    "fingerboard_objects": _fingerboard_objects,
+    "campusboard_objects": _campusboard_objects,
+    "pullup_objects": _pullup_objects,
+    "set_table": _set_table,
+    "effort_by_day_edge": lambda inputs: aggregate.effort_by_day_edge(inputs["table"].array, inputs["table"].edge_names),
+    "moves_spread_by_day_edge": lambda inputs: aggregate.moves_spread_by_day_edge(inputs["table"].array,
+                                                                                  inputs["table"].edge_names),
+    "reps_by_day_weight": lambda inputs: aggregate.reps_by_day_weight(inputs["table"].array),
+    "intensity_series": lambda inputs: aggregate.intensity_series(inputs["scored"]),
+    "rollups": _rollups,
+}
+
+
+def measure(func, inputs, repeat):
+    """
+    Best wall time over repeat runs, then the tracemalloc peak of one more run.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(inputs)
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    func(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"time_s": best, "peak_bytes": peak}
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance, min_time=0.002):
+    """
+    Names of the cases slower or hungrier than the baseline beyond the tolerances.
+    Slowdowns under min_time seconds are timer noise and are not reported.
+    """
+    regressions = []
+    for name, result in results.items():
+        ref = baseline.get(name)
+        if ref is None:
+            continue
+        slower = result["time_s"] > max(ref["time_s"] * (1 + time_tolerance), ref["time_s"] + min_time)
+        if slower or result["peak_bytes"] > ref["peak_bytes"] * (1 + memory_tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scoring paths and aggregations.")
+    parser.add_argument("--sets", type=int, default=10000)
+    parser.add_argument("--mix", nargs="+", default=[], help="shares by exercise, e.g. fingerboard=2 pullup=1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.2)
+    parser.add_argument("--memory-tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    inputs = prepare(args.sets, parse_mix(args.mix) or None, args.seed)
+    print(f"{args.sets} sets in {len(inputs['workouts'])} sessions")
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            stored = json.load(f)
+        if stored.get("sets") == args.sets and stored.get("mix") == args.mix and stored.get("seed") == args.seed:
+            baseline = stored["cases"]
+        else:
+            print(f"{args.baseline} was recorded with other settings, not comparing")
+
+    results = {}
+    print(f"{'case':>26} {'time [ms]':>10} {'peak MB':>9} {'vs base':>8}")
+    for name in args.cases:
+        results[name] = result = measure(CASES[name], inputs, args.repeat)
+        ref = baseline.get(name)
+        ratio = f"{result['time_s'] / ref['time_s']:.2f}x" if ref else "-"
+        print(f"{name:>26} {result['time_s'] * 1000:>10.1f} {result['peak_bytes'] / 1e6:>9.1f} {ratio:>8}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"sets": args.sets, "mix": args.mix, "seed": args.seed, "cases": results}, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if regressions:
+        print(f"regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,12 @@ setup(
     install_requires=[
         "numpy",
         "matplotlib",
-        "PyQt5"
     ],
+    extras_require={
+        # Interactive windows of the apps/ scripts; reports render without a display.
+        "gui": ["PyQt5"],
+    },
+    entry_points={
+        "console_scripts": ["crimpy-report=crimpy.report:main"],
+    },
 )
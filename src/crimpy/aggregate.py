@@ -0,0 +1,139 @@
+# src/crimpy/aggregate.py
+#
+# Per-date aggregations behind the progression plots, computed on set columns
+# (a SetTable array, or a memory-mapped ColumnStore) instead of per-set objects.
+
+import numpy as np
+
+from crimpy.records import select_kind
+from crimpy.scorers import breakdown_keys
+from crimpy.metrics import timed
+
+
+def group_sum(days, labels, values):
+    """
+    Sums values by (day, label) with a single bincount.
+
+    Args:
+        days (array): Day ordinal of each set.
+        labels (array): Grouping label of each set (edge id, weight, ...).
+        values (array): Value to sum for each set.
+
+    Returns:
+        tuple: (sorted unique days, sorted unique labels, sums of shape (n_days, n_labels)).
+    """
+    uniq_days, day_idx = np.unique(np.asarray(days), return_inverse=True)
+    uniq_labels, label_idx = np.unique(np.asarray(labels), return_inverse=True)
+    flat = day_idx.reshape(-1) * len(uniq_labels) + label_idx.reshape(-1)
+    sums = np.bincount(flat, weights=np.asarray(values, dtype=float),
+                       minlength=len(uniq_days) * len(uniq_labels))
+    return uniq_days, uniq_labels, sums.reshape(len(uniq_days), len(uniq_labels))
+
+
+def _by_edge_name(days, edge_ids, values, edge_names):
+    # Relabel edge ids with their names, sorted by name like the apps do.
+    uniq_days, ids, sums = group_sum(days, edge_ids, values)
+    names = [edge_names[i] for i in ids.tolist()]
+    order = sorted(range(len(names)), key=lambda j: names[j])
+    return uniq_days, [names[j] for j in order], sums[:, order]
+
+
+def fingerboard_effort(rows):
+    """
+    Vectorized Fingerboard.compute_effort over fingerboard rows.
+    """
+    ton = np.asarray(rows["timeon_s"], dtype=float)
+    toff = np.asarray(rows["timeoff_s"], dtype=float)
+    r = np.asarray(rows["rest_s"], dtype=float)
+    edge_val = np.asarray(rows["edge_mm"], dtype=float)
+    reps = np.asarray(rows["reps"], dtype=float)
+
+    has_edge = ~np.isnan(edge_val) & (edge_val != 0)
+    edge_factor = np.ones(len(edge_val))
+    edge_factor[has_edge] = 1.0 / np.sqrt(edge_val[has_edge])
+
+    part1 = (ton / 7) * 0.2
+    part2 = np.zeros(len(toff))
+    part2[toff > 0] = (3 / toff[toff > 0]) * 0.1
+    part3 = (35 * edge_factor) * 0.4
+    part4 = (reps / 6) * 0.3
+
+    divisor = np.ones(len(r))
+    divisor[r > 0] = np.log(np.e - 1 + r[r > 0] / 60)
+    return (part1 + part2 + part3 + part4) / divisor
+
+
+@timed("aggregate")
+def effort_by_day_edge(rows, edge_names):
+    """
+    Total fingerboard effort per day and edge.
+
+    Args:
+        rows: SET_DTYPE rows (all exercise types).
+        edge_names (list): Edge labels indexed by edge_id.
+
+    Returns:
+        tuple: (day ordinals, edge labels, effort of shape (n_days, n_edges)).
+    """
+    fb = select_kind(rows, "fingerboard")
+    return _by_edge_name(fb["day"], fb["edge_id"], fingerboard_effort(fb), edge_names)
+
+
+@timed("aggregate")
+def moves_spread_by_day_edge(rows, edge_names):
+    """
+    Total campus board moves and spread per day and edge.
+
+    Returns:
+        tuple: (day ordinals, edge labels, moves, spread), both of shape (n_days, n_edges).
+    """
+    cb = select_kind(rows, "campusboard")
+    days, edges, moves = _by_edge_name(cb["day"], cb["edge_id"], cb["moves"], edge_names)
+    _, _, spread = _by_edge_name(cb["day"], cb["edge_id"], cb["spread"], edge_names)
+    return days, edges, moves.astype(int), spread.astype(int)
+
+
+@timed("aggregate")
+def reps_by_day_weight(rows):
+    """
+    Total pullup repetitions per day and added weight (kg). Sets without a weight are left out.
+
+    Returns:
+        tuple: (day ordinals, weights, reps of shape (n_days, n_weights)).
+    """
+    pu = select_kind(rows, "pullup")
+    weight = np.asarray(pu["weight_kg"])
+    has_weight = ~np.isnan(weight)
+    days, weights, reps = group_sum(np.asarray(pu["day"])[has_weight], weight[has_weight],
+                                    np.asarray(pu["reps"])[has_weight])
+    return days, weights.tolist(), reps.astype(int)
+
+
+# Keys of the intensity breakdown, in plotting (stacking) order. Groups of scorers
+# registered later (see crimpy.scorers) are stacked after these.
+INTENSITY_KEYS = ("fingerboard", "campusboard", "pullup", "project", "outdoor")
+
+
+@timed("aggregate")
+def intensity_series(entries):
+    """
+    Per-session intensity series from scored sessions (IndexEntry or ScoredSession-like
+    objects with date, breakdown and, optionally, outdoor, name and project_grade).
+
+    Returns:
+        tuple: (dates of the scored workouts, {key: intensity array}, project grade labels,
+        [(date, name)] of the outdoor sessions), all sorted by date.
+    """
+    workouts = []
+    outdoor = []
+    for entry in sorted(entries, key=lambda e: e.date):
+        if getattr(entry, "outdoor", False):
+            outdoor.append((entry.date.date(), getattr(entry, "name", None) or "Outdoor"))
+        if entry.breakdown:
+            workouts.append(entry)
+    dates = [entry.date for entry in workouts]
+    keys = list(INTENSITY_KEYS) + [key for key in breakdown_keys() if key not in INTENSITY_KEYS]
+    series = {key: np.array([entry.breakdown.get(key, 0) for entry in workouts], dtype=float)
+              for key in keys}
+    grades = [getattr(entry, "project_grade", None) for entry in workouts]
+    return dates, series, grades, outdoor
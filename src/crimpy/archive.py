@@ -0,0 +1,159 @@
+# src/crimpy/archive.py
+#
+# Append-only JSON Lines archive: one session per line, in the workout_template.json schema,
+# plus a "source" key holding the name of the file it came from and, for the lines written by
+# convert_directory, a "source_stat" key holding its [mtime_ns, size].
+#
+#   python -m crimpy.archive data/ sessions.jsonl
+
+import os
+import glob
+import json
+import argparse
+
+from crimpy.loader import Session, parse_date, parse_session
+
+
+def session_to_line(session, source_stat=None):
+    """
+    Serialises a Session to one compact JSON line (without the trailing newline).
+    """
+    record = dict(session.data)
+    record["source"] = session.source_file
+    if source_stat is not None:
+        record["source_stat"] = list(source_stat)
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_sessions(archive_path, sessions, append=True, stats=None):
+    """
+    Writes sessions to the archive, one per line.
+
+    Args:
+        archive_path (str): Path of the .jsonl archive.
+        sessions (iterable): Session objects (see crimpy.loader).
+        append (bool): Append to an existing archive instead of overwriting it.
+        stats (dict): Source file name -> (mtime_ns, size), recorded with the sessions.
+
+    Returns:
+        int: Number of sessions written.
+    """
+    n = 0
+    with open(archive_path, "a" if append else "w", encoding="utf-8") as f:
+        for session in sessions:
+            f.write(session_to_line(session, (stats or {}).get(session.source_file)))
+            f.write("\n")
+            n += 1
+    return n
+
+
+def iter_sessions(archive_path):
+    """
+    Lazily yields the sessions of an archive, one line at a time, so that memory use does
+    not depend on the archive size. Malformed lines are reported and skipped.
+    """
+    with open(archive_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+                date_obj = parse_date(data["date"])
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Error reading {archive_path}:{line_no}: {e}")
+                continue
+            source = data.pop("source", None)
+            data.pop("source_stat", None)
+            path = f"{archive_path}:{source}" if source else f"{archive_path}:{line_no}"
+            yield Session(path, data, date_obj)
+
+
+def archived_sources(archive_path):
+    """
+    Source files already present in the archive.
+
+    Returns:
+        dict: Source file name -> [mtime_ns, size] of the file when archived, None if
+        not recorded.
+    """
+    if not os.path.exists(archive_path):
+        return {}
+    sources = {}
+    with open(archive_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                source = record.get("source")
+            except (ValueError, AttributeError):
+                continue
+            if source:
+                sources[source] = record.get("source_stat")
+    return sources
+
+
+def _drop_sources(archive_path, sources):
+    # Rewrites the archive without the lines of the given source files.
+    tmp_path = f"{archive_path}.{os.getpid()}.tmp"
+    with open(archive_path, "r", encoding="utf-8") as f, open(tmp_path, "w", encoding="utf-8") as out:
+        for line in f:
+            try:
+                source = json.loads(line).get("source")
+            except (ValueError, AttributeError):
+                source = None
+            if source not in sources:
+                out.write(line)
+    os.replace(tmp_path, archive_path)
+
+
+def convert_directory(data_dir, archive_path, normalize=False):
+    """
+    Appends the *.json session files of data_dir to the archive, sorted by date.
+    Files already archived (same file name, mtime and size) are skipped, so the conversion
+    can be re-run after copying new files from the phone. Files edited since, or archived
+    without their mtime and size, replace their previous line.
+
+    With normalize, sessions are validated and archived in canonical form (see
+    crimpy.normalize), and files with errors are reported and left out.
+
+    Returns:
+        int: Number of sessions appended (including replaced ones).
+    """
+    done = archived_sources(archive_path)
+    if normalize:
+        from crimpy.normalize import load_normalized
+    sessions = []
+    stats = {}
+    for file_path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        name = os.path.basename(file_path)
+        st = os.stat(file_path)
+        stat = [st.st_mtime_ns, st.st_size]
+        if done.get(name) == stat:
+            continue
+        try:
+            sessions.append(load_normalized(file_path) if normalize else parse_session(file_path))
+        except (ValueError, TypeError, AttributeError) as e:
+            # Non-object JSON or a non-string date raise TypeError or AttributeError.
+            print(f"Error reading {file_path}: {e}")
+            continue
+        stats[name] = stat
+    # A file that no longer parses keeps its previous line.
+    replaced = {name for name in stats if name in done}
+    if replaced:
+        _drop_sources(archive_path, replaced)
+    sessions.sort(key=lambda s: (s.date, s.path))
+    return write_sessions(archive_path, sessions, stats=stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append the session files of a directory to a JSON Lines archive.")
+    parser.add_argument("data_dir")
+    parser.add_argument("archive")
+    parser.add_argument("--normalize", action="store_true", help="validate and archive in canonical form")
+    args = parser.parse_args()
+    n = convert_directory(args.data_dir, args.archive, args.normalize)
+    print(f"{n} sessions appended to {args.archive}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# src/crimpy/batch.py
+
+import numpy as np
+from crimpy.metrics import registry, timed
+from crimpy.scorers import SCORERS, EXERCISES, CLIMBS, scorer_for
+
+
+class SetColumns:
+    FIELDS = ("edge_mm", "reps", "timeon_s", "timeoff_s", "rest_s", "span", "n_steps", "weight_kg", "attempts",
+              "grade", "style", "locktime_s", "n_success", "success")
+
+    def __init__(self, key, n_workouts, exercise_workout, exercise, **columns):
+        """
+        Column arrays holding every set of one exercise type, flattened across many workouts.
+
+        Args:
+            key (str): Name of the scorer of the exercise type (e.g. "fingerboard").
+            n_workouts (int): Number of workouts the sets were collected from.
+            exercise_workout (array): For each exercise, the index of its workout.
+            exercise (array): For each set, the index of its exercise.
+            **columns: One float array per name in FIELDS (zeros if not given), plus any
+                other field a registered scorer parses, one entry per set.
+                Missing edges, weights and grades are stored as NaN.
+        """
+        self.key = key
+        self.n_workouts = n_workouts
+        self.exercise_workout = np.asarray(exercise_workout, dtype=np.intp)
+        self.exercise = np.asarray(exercise, dtype=np.intp)
+        for name in self.FIELDS:
+            setattr(self, name, np.asarray(columns.get(name, np.zeros(len(self.exercise))), dtype=float))
+        for name, values in columns.items():
+            if name not in self.FIELDS:
+                setattr(self, name, np.asarray(values, dtype=float))
+
+    def __len__(self):
+        return len(self.exercise)
+
+    def select(self, mask):
+        """
+        SetColumns of the sets where mask is True (same exercises and workouts).
+        """
+        columns = {name: value[mask] for name, value in vars(self).items()
+                   if name not in ("key", "n_workouts", "exercise_workout", "exercise")}
+        return SetColumns(self.key, self.n_workouts, self.exercise_workout, self.exercise[mask], **columns)
+
+    @property
+    def n_exercises(self):
+        return len(self.exercise_workout)
+
+
+def parse_set(key, s, ex_type=""):
+    """
+    Parses the strings of one set into the numeric fields used by the intensity formulas.
+
+    Args:
+        key (str): Scorer name of the exercise type (see crimpy.scorers).
+        s (dict): The raw set dictionary.
+        ex_type (str): Lowercase type of the exercise or climb block.
+
+    Returns:
+        dict: Field name (see SetColumns) -> value, for the fields of that type.
+    """
+    return SCORERS[key].parse(s, ex_type)
+
+
+def scored_blocks(data, keys=None):
+    """
+    The executed exercises and climb blocks of a session that have a scorer (nonzero order,
+    as in WorkoutIntensityCalculator.calculate_intensity_breakdown).
+
+    Args:
+        data (dict): The workout JSON content.
+        keys (set): Scorer names to keep, all of them if None.
+
+    Yields:
+        tuple: (Scorer, lowercase type string, list of set dictionaries).
+    """
+    for section in (EXERCISES, CLIMBS):
+        for ex in data.get(section, []):
+            if not ex.get("executed", False) or ex.get("order", 0) == 0:
+                continue
+            ex_type = ex.get("type", "").lower()
+            scorer = scorer_for(ex_type, section)
+            if scorer is not None and (keys is None or scorer.name in keys):
+                yield scorer, ex_type, ex.get("sets", [])
+
+
+def flatten_all(workouts, keys=None):
+    """
+    Flattens the sets of many workouts into one SetColumns per exercise type, in a single
+    pass. Strings are parsed here, once, so that the intensity formulas can run on plain arrays.
+
+    Args:
+        workouts (list): Workout dicts as loaded from the JSON files.
+        keys (list): Scorer names to collect, all registered scorers by default.
+
+    Returns:
+        dict: scorer name -> SetColumns.
+    """
+    keys = list(SCORERS) if keys is None else keys
+    exercise_workout = {key: [] for key in keys}
+    exercise = {key: [] for key in keys}
+    cols = {key: {} for key in keys}
+
+    for w, data in enumerate(workouts):
+        for scorer, ex_type, sets in scored_blocks(data):
+            key = scorer.name
+            if key not in cols:
+                continue
+            key_cols = cols[key]
+            key_exercise = exercise[key]
+            e = len(exercise_workout[key])
+            exercise_workout[key].append(w)
+            for s in sets:
+                fields = scorer.parse(s, ex_type)
+                if scorer.required and not fields[scorer.required]:
+                    continue
+                # Fields first seen now are zero for the sets before.
+                for name, value in fields.items():
+                    column = key_cols.get(name)
+                    if column is None:
+                        column = key_cols[name] = [0.0] * len(key_exercise)
+                    column.append(value)
+                key_exercise.append(e)
+                n = len(key_exercise)
+                for column in key_cols.values():
+                    if len(column) < n:
+                        column.append(0.0)
+
+    return {key: SetColumns(key, len(workouts), exercise_workout[key], exercise[key], **cols[key])
+            for key in keys}
+
+
+def flatten_sets(workouts, key):
+    """
+    Flattens all sets of one exercise type, across many workouts, into a SetColumns.
+
+    Args:
+        workouts (list): Workout dicts as loaded from the JSON files.
+        key (str): Scorer name (see crimpy.scorers.SCORERS).
+    """
+    return flatten_all(workouts, [key])[key]
+
+
+def exercise_columns(scorer, ex_type, sets):
+    """
+    SetColumns of the sets of a single exercise (one workout, one exercise).
+    """
+    rows = [scorer.parse(s, ex_type) for s in sets]
+    if scorer.required:
+        rows = [f for f in rows if f[scorer.required]]
+    names = dict.fromkeys(name for f in rows for name in f)
+    columns = {name: [f.get(name, 0.0) for f in rows] for name in names}
+    return SetColumns(scorer.name, 1, [0], [0] * len(rows), **columns)
+
+
+def workout_intensity(cols, set_intensity=None, constants=None, scale=None):
+    """
+    Sums per-set intensities into one value per workout.
+
+    Sets are summed per exercise and scaled, then exercises are summed per workout, in the
+    same order as the scalar code. np.bincount accumulates sequentially, so the totals are
+    bit-identical with the loops in WorkoutIntensityCalculator.
+
+    Args:
+        cols (SetColumns): Flattened sets of one exercise type.
+        set_intensity (array): Precomputed per-set intensities (computed if None).
+        constants (ScorerConstants): Parameters of the scorer (its defaults if None).
+        scale (float or array): Scaling constant, or one per exercise (from constants if None).
+    """
+    constants = constants or SCORERS[cols.key].defaults
+    if set_intensity is None:
+        set_intensity = SCORERS[cols.key].set_intensity(cols, constants) if len(cols) else np.zeros(0)
+    if scale is None:
+        scale = constants.scale
+    per_exercise = np.bincount(cols.exercise, weights=set_intensity, minlength=cols.n_exercises)
+    per_exercise = scale * per_exercise / 10
+    return np.bincount(cols.exercise_workout, weights=per_exercise, minlength=cols.n_workouts).astype(float)
+
+
+def group_breakdown(per_scorer, n_workouts):
+    """
+    Adds up per-scorer intensities into the breakdown keys (scorer groups), in registration
+    order like the scalar code.
+
+    Args:
+        per_scorer (dict): scorer name -> array with one value per workout.
+        n_workouts (int): Number of workouts.
+    """
+    breakdown = {}
+    for name, scorer in SCORERS.items():
+        total = breakdown.setdefault(scorer.group, np.zeros(n_workouts))
+        values = per_scorer.get(name)
+        if values is not None:
+            breakdown[scorer.group] = total + values
+    return breakdown
+
+
+def _profile_groups(profiles, n_workouts):
+    # (profile number of each workout, compiled profiles), for a profile or a list of profiles.
+    from crimpy.profiles import DEFAULT_PROFILE
+    if profiles is None or not isinstance(profiles, (list, tuple)):
+        return np.zeros(n_workouts, dtype=np.intp), [(profiles or DEFAULT_PROFILE).compile()]
+    if len(profiles) != n_workouts:
+        raise ValueError(f"Expected one profile per workout, got {len(profiles)} for {n_workouts} workouts")
+    numbers = {}
+    compiled = []
+    index = np.empty(n_workouts, dtype=np.intp)
+    for w, profile in enumerate(profiles):
+        profile = profile or DEFAULT_PROFILE
+        number = numbers.get(id(profile))
+        if number is None:
+            number = numbers[id(profile)] = len(compiled)
+            compiled.append(profile.compile())
+        index[w] = number
+    return index, compiled
+
+
+def profiles_intensity(cols, profile_index, compiled):
+    """
+    workout_intensity of workouts scored with different parameter profiles: the sets of
+    each profile are scored with its constants, then everything is summed at once.
+
+    Args:
+        cols (SetColumns): Flattened sets of one exercise type.
+        profile_index (array): Profile number of each workout.
+        compiled (list): Compiled profiles (scorer name -> ScorerConstants), by number.
+    """
+    if len(compiled) == 1:
+        return workout_intensity(cols, constants=compiled[0][cols.key])
+    scorer = SCORERS[cols.key]
+    exercise_profile = profile_index[cols.exercise_workout]
+    set_profile = exercise_profile[cols.exercise]
+    set_intensity = np.zeros(len(cols))
+    for number in np.unique(set_profile).tolist():
+        mask = set_profile == number
+        set_intensity[mask] = scorer.set_intensity(cols.select(mask), compiled[number][cols.key])
+    scales = np.array([constants[cols.key].scale for constants in compiled])
+    return workout_intensity(cols, set_intensity, scale=scales[exercise_profile])
+
+
+@timed("score_batch")
+def batch_intensity_breakdown(workouts, profiles=None):
+    """
+    Intensity breakdown of many workouts: one parsing pass, then one vectorized pass per
+    exercise type.
+
+    Args:
+        workouts (list): Workout dicts as loaded from the JSON files.
+        profiles: A crimpy.profiles.Profile for all workouts, or a list with the Profile of
+            each workout (e.g. per athlete). Default parameters if None.
+
+    Returns:
+        dict: breakdown key -> float array with one entry per workout, in input order.
+    """
+    profile_index, compiled = _profile_groups(profiles, len(workouts))
+    per_scorer = {}
+    n_sets = 0
+    for key, cols in flatten_all(workouts).items():
+        n_sets += len(cols)
+        per_scorer[key] = profiles_intensity(cols, profile_index, compiled)
+    registry.count("sessions_scored", len(workouts))
+    registry.count("sets_scored", n_sets)
+    return group_breakdown(per_scorer, len(workouts))
@@ -1,10 +1,12 @@
 # src/campusboard.py
 
-from datetime import datetime
-import numpy as np
+# Re-exported: extract_edge_value used to live here, and apps import it from this module.
+from crimpy.parsing import extract_edge_value  # noqa: F401
 
 
 class CampusBoard:
+    __slots__ = ("date", "edge", "steps_str", "timeoff", "sides", "moves", "spread")
+
     def __init__(self, date, edge, steps_str, timeoff, sides):
         """
         Initialize a CampusBoard instance.
@@ -35,13 +37,3 @@ class CampusBoard:
         except ValueError:
             return 0
         return sum(abs(numbers[i] - numbers[i - 1]) for i in range(1, len(numbers)))
-
-
-def extract_edge_value(edge_str):
-    """
-    Extract the numeric part of an edge string (e.g., "20mm" -> 20).
-    Returns None if no numeric value is found.
-    """
-    numeric_part = ''.join(filter(str.isdigit, edge_str))
-    return float(numeric_part) if numeric_part else None
-
@@ -0,0 +1,518 @@
+# src/crimpy/dataset.py
+#
+# Multi-athlete dataset: the sessions of every athlete partitioned by athlete and period
+# (month or year) into shards, each one a columnar store (crimpy.store). A manifest lists
+# the shards with the date range they cover, so a query only opens the shards of the
+# athletes and dates it asks for, and never scans the rest of the corpus.
+#
+#   dataset_dir/
+#       manifest.json                 athletes, source fingerprints and shards
+#       <athlete>/<build>/<period>/   one ColumnStore per athlete and period (2025-03, ...)
+#
+# Each build of an athlete writes a new <build> directory next to the previous one; the
+# manifest switches to it in one atomic replace, and only then is the previous build deleted.
+# A build that stops halfway leaves the dataset as it was.
+#
+# Shards are scored and aggregated in parallel worker processes, and the partial results
+# merged: team-wide intensity distributions, per-edge totals, per-athlete series.
+#
+#   python -m crimpy.dataset build athletes/ dataset/ --workers 8
+#   python -m crimpy.dataset query dataset/ --athletes alice bob --start 2025-01-01
+
+import os
+import glob
+import json
+import shutil
+import hashlib
+import time
+import argparse
+from datetime import date
+
+import numpy as np
+
+from crimpy.store import STORE_VERSION, ColumnStore, write_store
+from crimpy.records import SetTable
+from crimpy.aggregate import fingerboard_effort
+from crimpy.metrics import registry, timed
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+PERIODS = ("month", "year")
+
+
+def period_key(day, period="month"):
+    """
+    Shard key of a date: "2025-03" by month, "2025" by year.
+    """
+    if period == "month":
+        return f"{day.year:04d}-{day.month:02d}"
+    if period == "year":
+        return f"{day.year:04d}"
+    raise ValueError(f"Unknown period {period!r}, expected one of {', '.join(PERIODS)}")
+
+
+def partition_sessions(sessions, period="month"):
+    """
+    Sessions grouped by shard key, sorted by date within each shard.
+
+    Returns:
+        dict: shard key -> list of Sessions, keys in increasing order.
+    """
+    shards = {}
+    for session in sorted(sessions, key=lambda s: (s.date, s.path)):
+        shards.setdefault(period_key(session.date, period), []).append(session)
+    return dict(sorted(shards.items()))
+
+
+def _ordinal(value):
+    # Day ordinal of a date, datetime or ISO string; None stays None.
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+def athlete_sources(root):
+    """
+    Sources of every athlete under root: sub-directories holding *.json session files, and
+    .jsonl archives (crimpy.archive), named after the directory or file.
+
+    Returns:
+        dict: athlete name -> data directory or archive path, sorted by name.
+    """
+    sources = {}
+    for athlete_dir in glob.glob(os.path.join(root, "*", "")):
+        if glob.glob(os.path.join(athlete_dir, "*.json")):
+            sources[os.path.basename(os.path.normpath(athlete_dir))] = athlete_dir
+    for archive_path in glob.glob(os.path.join(root, "*.jsonl")):
+        sources[os.path.splitext(os.path.basename(archive_path))[0]] = archive_path
+    return dict(sorted(sources.items()))
+
+
+def source_fingerprint(source, period):
+    """
+    Hash of an athlete's sources (file names, mtimes and sizes), the store version and the
+    partitioning period: the athlete's shards are rebuilt only when it changes.
+    """
+    h = hashlib.sha1()
+    h.update(f"{STORE_VERSION}:{period}\n".encode())
+    paths = sorted(glob.glob(os.path.join(source, "*.json"))) if os.path.isdir(source) else [source]
+    for file_path in paths:
+        st = os.stat(file_path)
+        h.update(f"{os.path.basename(file_path)}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return h.hexdigest()
+
+
+def _read_sessions(source):
+    if os.path.isdir(source):
+        from crimpy.loader import load_sessions
+        return load_sessions(source)
+    from crimpy.archive import iter_sessions
+    return iter_sessions(source)
+
+
+def _write_athlete(dataset_dir, athlete, source, period):
+    """
+    Writes the shards of one athlete into a new build directory, next to the previous one
+    (see the module comment). Runs in a worker process.
+
+    Returns:
+        list: Manifest entries of the shards written.
+    """
+    build = f"{time.time_ns():x}-{os.getpid()}"
+    build_dir = os.path.join(dataset_dir, athlete, build)
+    tmp_dir = f"{build_dir}.tmp"
+    entries = []
+    for key, sessions in partition_sessions(_read_sessions(source), period).items():
+        table = SetTable.from_sessions(sessions)
+        write_store(os.path.join(tmp_dir, key), table)
+        entries.append({
+            "athlete": athlete,
+            "key": key,
+            "path": f"{athlete}/{build}/{key}",
+            "start": sessions[0].date.date().isoformat(),
+            "end": sessions[-1].date.date().isoformat(),
+            "n_sessions": table.n_sessions,
+            "n_rows": len(table),
+        })
+    # The build appears in one rename, once every shard is written. The manifest does not
+    # point to it yet.
+    if entries:
+        os.replace(tmp_dir, build_dir)
+    return entries
+
+
+def _remove_old_builds(dataset_dir, athlete, shards):
+    # Deletes what the manifest no longer points to: previous builds of the athlete, and
+    # builds left by interrupted runs.
+    athlete_dir = os.path.join(dataset_dir, athlete)
+    current = {shard["path"].split("/")[1] for shard in shards if shard["athlete"] == athlete}
+    for name in os.listdir(athlete_dir) if os.path.isdir(athlete_dir) else []:
+        if name not in current:
+            path = os.path.join(athlete_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+
+def _empty_manifest():
+    return {"version": MANIFEST_VERSION, "store_version": STORE_VERSION, "period": None,
+            "athletes": {}, "shards": []}
+
+
+def read_manifest(dataset_dir):
+    """
+    Content of the manifest of dataset_dir, an empty one if there is none yet.
+
+    Raises:
+        ValueError: If the dataset was written by another version.
+    """
+    try:
+        with open(os.path.join(dataset_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return _empty_manifest()
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("store_version") != STORE_VERSION:
+        raise ValueError(f"Unsupported dataset version in {dataset_dir}: "
+                         f"{manifest.get('version')} (store {manifest.get('store_version')})")
+    return manifest
+
+
+def _write_manifest(dataset_dir, manifest):
+    path = os.path.join(dataset_dir, MANIFEST_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+@timed("dataset_build")
+def build_dataset(sources, dataset_dir, period="month", workers=None, force=False):
+    """
+    Writes (or updates) the shards of many athletes, in parallel worker processes.
+
+    Athletes whose sources did not change since the last build are skipped. Athletes of the
+    dataset that are not in sources are kept, unless the dataset was written by another
+    version: it is then rebuilt from sources alone.
+
+    Args:
+        sources (dict): Athlete name -> data directory or .jsonl archive (see athlete_sources).
+        dataset_dir (str): Output directory (created if needed).
+        period (str): Shard period, "month" or "year".
+        workers (int): Number of worker processes, None for every core.
+        force (bool): Rebuild every athlete even if unchanged.
+
+    Returns:
+        list: Names of the athletes (re)built.
+    """
+    period_key(date.today(), period)  # validates the period
+    os.makedirs(dataset_dir, exist_ok=True)
+    try:
+        manifest = read_manifest(dataset_dir)
+    except ValueError as e:
+        # Shards of another version cannot be read: every athlete of sources is rebuilt.
+        print(f"{e}, rebuilding")
+        manifest = _empty_manifest()
+    if manifest["period"] not in (None, period):
+        # Shards of another period cannot be mixed with the new ones.
+        force = True
+    athletes = manifest["athletes"]
+    tasks = []
+    for athlete, source in sources.items():
+        fingerprint = source_fingerprint(source, period)
+        if force or athletes.get(athlete, {}).get("fingerprint") != fingerprint:
+            tasks.append((athlete, source, fingerprint))
+
+    if workers == 1 or len(tasks) <= 1:
+        results = [_write_athlete(dataset_dir, athlete, source, period) for athlete, source, _ in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_write_athlete, dataset_dir, athlete, source, period)
+                       for athlete, source, _ in tasks]
+            results = [future.result() for future in futures]
+
+    rebuilt = {athlete for athlete, _, _ in tasks}
+    shards = [shard for shard in manifest["shards"] if shard["athlete"] not in rebuilt]
+    for (athlete, source, fingerprint), entries in zip(tasks, results):
+        athletes[athlete] = {"source": os.path.abspath(source), "fingerprint": fingerprint}
+        shards.extend(entries)
+    manifest["period"] = period
+    manifest["athletes"] = dict(sorted(athletes.items()))
+    manifest["shards"] = sorted(shards, key=lambda s: (s["athlete"], s["key"]))
+    _write_manifest(dataset_dir, manifest)
+    for athlete in rebuilt:
+        _remove_old_builds(dataset_dir, athlete, manifest["shards"])
+    registry.count("shards_written", sum(len(entries) for entries in results))
+    return [athlete for athlete, _, _ in tasks]
+
+
+# --- per-shard work, run in worker processes ---
+
+# Compiled profiles of a worker, by (name, parameters): compiled once, not once per shard.
+_profiles = {}
+
+
+def _profile(spec):
+    if spec is None:
+        return None
+    name, params = spec
+    key = (name, json.dumps(params, sort_keys=True))
+    profile = _profiles.get(key)
+    if profile is None:
+        from crimpy.profiles import Profile
+        profile = _profiles[key] = Profile(name, params)
+    return profile
+
+
+def _in_range(rows, start, end):
+    days = np.asarray(rows["day"])
+    mask = np.ones(len(days), dtype=bool)
+    if start is not None:
+        mask &= days >= start
+    if end is not None:
+        mask &= days <= end
+    return {name: np.asarray(values)[mask] for name, values in rows.items()}
+
+
+def shard_intensity(store_dir, start=None, end=None, profile=None):
+    """
+    Intensity breakdown of the sessions of one shard in [start, end].
+
+    Args:
+        store_dir (str): Shard directory.
+        start, end (int): Day ordinals, None for no bound.
+        profile (tuple): (name, parameters) of the athlete's Profile, None for the defaults.
+
+    Returns:
+        tuple: (session day ordinals, {key: intensity array}).
+    """
+    store = ColumnStore(store_dir)
+    breakdown = store.intensity_breakdown(_profile(profile))
+    days = np.asarray(store.session_days)
+    keep = np.ones(len(days), dtype=bool)
+    if start is not None:
+        keep &= days >= start
+    if end is not None:
+        keep &= days <= end
+    return days[keep], {key: values[keep] for key, values in breakdown.items()}
+
+
+def shard_edge_totals(store_dir, start=None, end=None):
+    """
+    Fingerboard effort and campus board moves and spread of one shard in [start, end],
+    summed per edge label.
+
+    Returns:
+        dict: edge label -> {"effort": float, "moves": int, "spread": int}.
+    """
+    store = ColumnStore(store_dir)
+    n_edges = len(store.edge_names)
+    fb = _in_range(store.of_kind("fingerboard"), start, end)
+    cb = _in_range(store.of_kind("campusboard"), start, end)
+    sums = {
+        "effort": np.bincount(fb["edge_id"], weights=fingerboard_effort(fb), minlength=n_edges),
+        "moves": np.bincount(cb["edge_id"], weights=cb["moves"], minlength=n_edges),
+        "spread": np.bincount(cb["edge_id"], weights=cb["spread"], minlength=n_edges),
+    }
+    totals = {}
+    for i, edge in enumerate(store.edge_names):
+        if sums["effort"][i] or sums["moves"][i] or sums["spread"][i]:
+            totals[edge] = {"effort": float(sums["effort"][i]), "moves": int(sums["moves"][i]),
+                            "spread": int(sums["spread"][i])}
+    return totals
+
+
+class Dataset:
+    def __init__(self, dataset_dir):
+        """
+        Read-only view on a dataset written by build_dataset.
+
+        Args:
+            dataset_dir (str): Directory holding the manifest and the shards.
+        """
+        self.dataset_dir = dataset_dir
+        manifest = read_manifest(dataset_dir)
+        self.period = manifest["period"]
+        self.athletes = list(manifest["athletes"])
+        self.manifest = manifest
+
+    def __len__(self):
+        return len(self.manifest["shards"])
+
+    def shards(self, athletes=None, start=None, end=None):
+        """
+        Manifest entries of the shards holding sessions of the given athletes in [start, end].
+
+        Args:
+            athletes (list): Athlete names, all of them if None.
+            start, end: Dates (date, datetime or ISO string), None for no bound.
+        """
+        athletes = set(athletes) if athletes is not None else None
+        start, end = _ordinal(start), _ordinal(end)
+        selected = []
+        for shard in self.manifest["shards"]:
+            if athletes is not None and shard["athlete"] not in athletes:
+                continue
+            if start is not None and _ordinal(shard["end"]) < start:
+                continue
+            if end is not None and _ordinal(shard["start"]) > end:
+                continue
+            selected.append(shard)
+        return selected
+
+    def shard_dir(self, shard):
+        return os.path.join(self.dataset_dir, *shard["path"].split("/"))
+
+    def open(self, shard):
+        """
+        ColumnStore of one shard.
+        """
+        return ColumnStore(self.shard_dir(shard))
+
+    def map(self, func, shards, *args, workers=None, profiles=None):
+        """
+        Runs func(shard directory, *args) on every shard, in parallel worker processes.
+
+        Args:
+            func: Module-level function (picklable), e.g. shard_intensity.
+            shards (list): Manifest entries (see shards()).
+            *args: Extra arguments of func.
+            workers (int): Number of worker processes, None for every core, 1 to run here.
+            profiles (dict): Profile name -> Profile (crimpy.profiles). When given, the
+                (name, parameters) of each shard's athlete profile is passed as the last argument.
+
+        Returns:
+            list: Results of func, in the order of shards.
+        """
+        calls = []
+        for shard in shards:
+            call_args = (self.shard_dir(shard),) + args
+            if profiles is not None:
+                from crimpy.profiles import profile_for
+                profile = profile_for(profiles, shard["athlete"])
+                call_args += ((profile.name, profile.params),)
+            calls.append(call_args)
+        registry.count("shards_read", len(calls))
+        if workers == 1 or len(calls) <= 1:
+            return [func(*call_args) for call_args in calls]
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(func, *call_args) for call_args in calls]
+            return [future.result() for future in futures]
+
+    @timed("dataset_query")
+    def session_intensity(self, athletes=None, start=None, end=None, profiles=None, workers=None):
+        """
+        Per-session intensity breakdown of each athlete, scored with the athlete's profile.
+
+        Returns:
+            dict: athlete -> (session day ordinals, {key: intensity array}), sorted by day.
+        """
+        start, end = _ordinal(start), _ordinal(end)
+        shards = self.shards(athletes, start, end)
+        results = self.map(shard_intensity, shards, start, end, workers=workers, profiles=profiles)
+        parts = {}
+        for shard, result in zip(shards, results):
+            parts.setdefault(shard["athlete"], []).append(result)
+        merged = {}
+        for athlete, athlete_parts in parts.items():
+            # Shards are in key (date) order, so concatenating keeps the days sorted.
+            days = np.concatenate([d for d, _ in athlete_parts])
+            keys = athlete_parts[0][1].keys()
+            merged[athlete] = (days, {key: np.concatenate([b[key] for _, b in athlete_parts]) for key in keys})
+        return merged
+
+    def intensity_distribution(self, athletes=None, start=None, end=None, bins=20, profiles=None, workers=None):
+        """
+        Distribution of the session intensity (sum of the breakdown) over the athletes.
+        Sessions without scored exercises are left out.
+
+        Args:
+            bins (int or list): Number of bins, or bin edges (as for numpy.histogram).
+
+        Returns:
+            dict: "sessions" count, "edges" and "counts" of the histogram, "percentiles"
+            (p10, p50, p90) and "mean" per athlete.
+        """
+        per_athlete = {}
+        for athlete, (_, breakdown) in self.session_intensity(athletes, start, end, profiles, workers).items():
+            total = sum(breakdown.values())
+            per_athlete[athlete] = total[total > 0]
+        totals = np.concatenate(list(per_athlete.values())) if per_athlete else np.zeros(0)
+        counts, edges = np.histogram(totals, bins=bins)
+        percentiles = np.percentile(totals, [10, 50, 90]).tolist() if len(totals) else [np.nan] * 3
+        return {
+            "sessions": int(len(totals)),
+            "edges": edges.tolist(),
+            "counts": counts.tolist(),
+            "percentiles": dict(zip(("p10", "p50", "p90"), percentiles)),
+            "mean": {athlete: float(t.mean()) if len(t) else 0.0 for athlete, t in per_athlete.items()},
+        }
+
+    @timed("dataset_query")
+    def edge_totals(self, athletes=None, start=None, end=None, workers=None):
+        """
+        Fingerboard effort and campus board moves and spread per edge label, summed over
+        the athletes and dates.
+
+        Returns:
+            dict: edge label -> {"effort": float, "moves": int, "spread": int}, sorted by label.
+        """
+        start, end = _ordinal(start), _ordinal(end)
+        merged = {}
+        for totals in self.map(shard_edge_totals, self.shards(athletes, start, end), start, end, workers=workers):
+            for edge, values in totals.items():
+                target = merged.setdefault(edge, {"effort": 0.0, "moves": 0, "spread": 0})
+                for name, value in values.items():
+                    target[name] += value
+        return dict(sorted(merged.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query a sharded multi-athlete dataset.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="shard the athletes of a root directory")
+    build.add_argument("root", help="one sub-directory of session files (or one .jsonl archive) per athlete")
+    build.add_argument("dataset_dir")
+    build.add_argument("--period", default="month", choices=PERIODS)
+    build.add_argument("--workers", type=int)
+    build.add_argument("--force", action="store_true", help="rebuild every athlete even if unchanged")
+    query = commands.add_parser("query", help="team intensity distribution and per-edge totals")
+    query.add_argument("dataset_dir")
+    query.add_argument("--athletes", nargs="+")
+    query.add_argument("--start", help="first day (YYYY-MM-DD)")
+    query.add_argument("--end", help="last day (YYYY-MM-DD)")
+    query.add_argument("--profiles", help="JSON profiles file (see crimpy.profiles)")
+    query.add_argument("--bins", type=int, default=10)
+    query.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        rebuilt = build_dataset(athlete_sources(args.root), args.dataset_dir, args.period, args.workers, args.force)
+        dataset = Dataset(args.dataset_dir)
+        print(f"{len(rebuilt)} athletes rebuilt, {len(dataset.athletes)} athletes in {len(dataset)} shards")
+        return
+
+    dataset = Dataset(args.dataset_dir)
+    profiles = None
+    if args.profiles:
+        from crimpy.profiles import load_profiles
+        profiles = load_profiles(args.profiles)
+    shards = dataset.shards(args.athletes, args.start, args.end)
+    print(f"{len(shards)} of {len(dataset)} shards, {sum(s['n_rows'] for s in shards)} sets")
+    distribution = dataset.intensity_distribution(args.athletes, args.start, args.end, args.bins, profiles, args.workers)
+    print(f"\nIntensity of {distribution['sessions']} sessions "
+          + " ".join(f"{k}={v:.1f}" for k, v in distribution["percentiles"].items()))
+    edges = distribution["edges"]
+    for i, count in enumerate(distribution["counts"]):
+        print(f"  {edges[i]:8.1f} - {edges[i + 1]:8.1f}  {count}")
+    print(f"\n{'edge':>10} {'effort':>10} {'moves':>8} {'spread':>8}")
+    for edge, values in dataset.edge_totals(args.athletes, args.start, args.end, args.workers).items():
+        print(f"{edge:>10} {values['effort']:>10.1f} {values['moves']:>8} {values['spread']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# src/crimpy/diagnostics.py
+#
+# Diagnostics of the intensity scoring, collected in a buffer instead of printed.
+#
+#   off      nothing is collected (default)
+#   summary  number of sets and intensity per exercise type
+#   per-set  summary, plus one record per set with the terms of its formula
+#
+# The level of the default instance, used by WorkoutIntensityCalculator when no other
+# is given, is read from the CRIMPY_DIAGNOSTICS environment variable. At the per-set
+# level it also writes one line per set to stdout, like the scripts used to.
+#
+#   CRIMPY_DIAGNOSTICS=per-set python apps/plot_intensity.py
+
+import os
+import sys
+import csv
+import numpy as np
+
+OFF = "off"
+SUMMARY = "summary"
+PER_SET = "per-set"
+LEVELS = (OFF, SUMMARY, PER_SET)
+
+# Terms of the set formulas, NaN where a term does not apply to the exercise type.
+TERMS = ("timeon_term", "timeoff_term", "edge_term", "reps_term", "span_term", "step_term",
+         "weight_term", "attempts_term", "grade_term", "locktime_term", "success_term")
+
+# The kind is a scorer name, of any length for registered scorers, hence an object field.
+RECORD_DTYPE = np.dtype(
+    [("kind", object), ("source", object), ("date", object), ("edge_mm", "f8")]
+    + [(name, "f8") for name in TERMS]
+    + [("rest_factor", "f8"), ("intensity", "f8")]
+)
+
+_nan = float("nan")
+
+
+class Diagnostics:
+    def __init__(self, level=OFF, stream=None):
+        """
+        Buffer of scoring diagnostics.
+
+        Args:
+            level (str): One of "off", "summary", "per-set".
+            stream (file): If given, per-set records are also written there as text lines.
+        """
+        self.stream = stream
+        self.level = level
+        self.clear()
+
+    @property
+    def level(self):
+        return self._level
+
+    @level.setter
+    def level(self, level):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown diagnostics level {level!r}, expected one of {', '.join(LEVELS)}")
+        self._level = level
+        # Read once per exercise by the calculator, so that the "off" level costs nothing per set.
+        self.enabled = level != OFF
+        self.per_set = level == PER_SET
+
+    def clear(self):
+        """
+        Drops everything collected so far.
+        """
+        self._records = []
+        self._totals = {}
+
+    def add_exercise(self, kind, n_sets, intensity):
+        """
+        Adds one scored exercise to the summary.
+        """
+        totals = self._totals.setdefault(kind, [0, 0, 0.0])
+        totals[0] += 1
+        totals[1] += n_sets
+        totals[2] += intensity
+
+    def add_set(self, kind, source, date, edge_mm, terms, rest_factor, intensity):
+        """
+        Adds one per-set record.
+
+        Args:
+            kind (str): Breakdown key ("fingerboard", "campusboard", ...).
+            source (str): Session file, if known.
+            date: Session date, if known.
+            edge_mm (float): Edge size, None when not parsed.
+            terms (dict): Term name (see TERMS) -> value, the others are left as NaN.
+            rest_factor (float): Divisor accounting for the rest after the set.
+            intensity (float): Intensity of the set, after the rest division and before
+                the scaling constant of the exercise.
+        """
+        record = (kind, source, date, _nan if edge_mm is None else edge_mm,
+                  *(terms.get(name, _nan) for name in TERMS), rest_factor, intensity)
+        self._records.append(record)
+        if self.stream is not None:
+            self.stream.write(format_record(record) + "\n")
+
+    def records(self):
+        """
+        Per-set records as a structured array (see RECORD_DTYPE), in scoring order.
+        """
+        return np.array(self._records, dtype=RECORD_DTYPE)
+
+    def summary(self):
+        """
+        Returns:
+            dict: kind -> {"exercises": int, "sets": int, "intensity": float}, where the
+            intensity includes the scaling constant of the exercise.
+        """
+        return {kind: {"exercises": n_ex, "sets": n_sets, "intensity": total}
+                for kind, (n_ex, n_sets, total) in self._totals.items()}
+
+    def to_csv(self, path):
+        """
+        Writes the per-set records to a CSV file, one row per set.
+        """
+        names = RECORD_DTYPE.names
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            writer.writerows(self._records)
+
+
+def format_record(record):
+    """
+    One human-readable line for a per-set record.
+    """
+    values = dict(zip(RECORD_DTYPE.names, record))
+    terms = ", ".join(f"{name[:-5]}: {values[name]:.2f}" for name in TERMS if values[name] == values[name])
+    return (f"{values['kind'].capitalize()} ::: [{values['source']} | {values['date']}] edge: {values['edge_mm']}, "
+            f"I = {values['intensity']:.3f} : {terms}, rest factor: {values['rest_factor']:.2f}")
+
+
+_default = None
+
+
+def default_diagnostics():
+    """
+    The process-wide Diagnostics, created on first use from CRIMPY_DIAGNOSTICS (off if unset).
+    """
+    global _default
+    if _default is None:
+        level = os.environ.get("CRIMPY_DIAGNOSTICS", OFF).strip().lower() or OFF
+        _default = Diagnostics(level, stream=sys.stdout if level == PER_SET else None)
+    return _default
+
+
+def set_default_diagnostics(diagnostics):
+    """
+    Replaces the process-wide Diagnostics, e.g. with Diagnostics("summary") in a script.
+    """
+    global _default
+    _default = diagnostics
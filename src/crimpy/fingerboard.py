@@ -1,10 +1,11 @@
 # src/crimpy/fingerboard.py
 
 import numpy as np
-import re
-from crimpy.intensity import time_str_to_seconds  # reuse the helper from intensity module, if available
+from crimpy.parsing import time_str_to_seconds, extract_edge_value
 
 class Fingerboard:
+    __slots__ = ("date", "edge", "reps", "timeon", "timeoff", "rest", "effort")
+
     def __init__(self, date, edge, reps, timeon, timeoff, rest):
         """
         Represents a single fingerboard set.
@@ -57,10 +58,4 @@ class Fingerboard:
         Extracts the numeric part from an edge string (e.g., "35mm" → 35).
         Returns None if no number is found.
         """
-        try:
-            numeric_part = ''.join(filter(lambda c: c.isdigit() or c == '.', edge_str))
-            if numeric_part:
-                return float(numeric_part)
-        except Exception:
-            pass
-        return None
+        return extract_edge_value(edge_str)
@@ -0,0 +1,59 @@
+# src/crimpy/grades.py
+#
+# Climbing grades on one numeric scale, the "grade index": 6 per French number, 2 per
+# letter and 1 for a "+". So 6a = 36, 6a+ = 37, 6b = 38, 7a = 42, 8a = 48.
+#
+# French sport and Fontainebleau boulder grades are read directly (same notation, the
+# latter often in capitals). V-scale and YDS grades are mapped to their usual French or
+# Font equivalent, with half steps for grades that fall in between (V4 = 6B/6B+ = 38.5).
+# The whole table is built once at import, so a lookup is a single dictionary access.
+
+# V-scale -> Font grade index.
+_V_SCALE = {
+    "vb": 18, "v0-": 22, "v0": 24, "v0+": 27, "v1": 30, "v2": 31, "v3": 36.5, "v4": 38.5,
+    "v5": 40.5, "v6": 42, "v7": 43, "v8": 44.5, "v9": 46, "v10": 47, "v11": 48, "v12": 49,
+    "v13": 50, "v14": 51, "v15": 52, "v16": 53, "v17": 54,
+}
+
+# YDS -> French grade index.
+_YDS = {
+    "5.4": 24, "5.5": 26, "5.6": 28, "5.7": 30, "5.8": 32, "5.9": 34,
+    "5.10a": 36, "5.10b": 36.5, "5.10c": 37.5, "5.10d": 38,
+    "5.11a": 39, "5.11b": 40, "5.11c": 41, "5.11d": 42,
+    "5.12a": 43, "5.12b": 44, "5.12c": 45, "5.12d": 46,
+    "5.13a": 47, "5.13b": 48, "5.13c": 49, "5.13d": 50,
+    "5.14a": 51, "5.14b": 52, "5.14c": 53, "5.14d": 54,
+    "5.15a": 55, "5.15b": 56, "5.15c": 57, "5.15d": 58,
+    # Grades given without a letter sit in the middle of their number.
+    "5.10": 37, "5.11": 40.5, "5.12": 44.5, "5.13": 48.5, "5.14": 52.5, "5.15": 56.5,
+}
+
+
+def _french_table():
+    table = {}
+    for number in range(1, 10):
+        base = 6 * number
+        table[str(number)] = base
+        table[f"{number}+"] = base + 1
+        if number >= 3:
+            for i, letter in enumerate("abc"):
+                table[f"{number}{letter}"] = base + 2 * i
+                table[f"{number}{letter}+"] = base + 2 * i + 1
+    return table
+
+
+GRADE_TABLE = {**_french_table(), **_V_SCALE, **_YDS}
+
+
+def grade_value(grade):
+    """
+    Grade index of a French, Font, V-scale or YDS grade (e.g. "6b+", "7A", "V5", "5.11c").
+
+    Returns:
+        float: The grade index, or None if the grade is not recognised.
+    """
+    if not isinstance(grade, str):
+        return None
+    value = GRADE_TABLE.get(grade.strip().lower().replace(" ", ""))
+    return None if value is None else float(value)
+
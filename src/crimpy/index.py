@@ -0,0 +1,267 @@
+# src/crimpy/index.py
+
+import os
+import glob
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+
+from crimpy.intensity import WorkoutIntensityCalculator, SCORING_VERSION, SCORING_ERRORS
+from crimpy.loader import parse_session
+from crimpy.metrics import timed
+
+INDEX_FILE = ".crimpy_index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    outdoor INTEGER NOT NULL,
+    name TEXT,
+    project_grade TEXT
+);
+CREATE TABLE IF NOT EXISTS breakdown (
+    path TEXT NOT NULL REFERENCES sessions(path) ON DELETE CASCADE,
+    ex_type TEXT NOT NULL,
+    intensity REAL NOT NULL,
+    PRIMARY KEY (path, ex_type)
+);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions(day);
+"""
+
+
+class IndexEntry:
+    def __init__(self, path, date, outdoor, name, project_grade, breakdown):
+        """
+        One scored session, as stored in the intensity index.
+
+        Args:
+            path (str): Path of the source file.
+            date (datetime): The session date.
+            outdoor (bool): True for outdoor ("climbs") sessions.
+            name (str): Session name, if any.
+            project_grade (str): Grade of the first successful project set, if any.
+            breakdown (dict): Intensity per exercise type.
+        """
+        self.path = path
+        self.date = date
+        self.outdoor = outdoor
+        self.name = name
+        self.project_grade = project_grade
+        self.breakdown = breakdown
+
+
+def first_project_grade(data):
+    """
+    Grade of the first successful set of the first project exercise, used to label plots.
+    """
+    for exercise in data.get("exercises", []):
+        if exercise.get("type", "").lower() == "project":
+            for s in exercise.get("sets", []):
+                if s.get("success") and "grade" in s:
+                    return s["grade"]
+            break
+    return None
+
+
+def _breakdown(session):
+    # Intensity breakdown of a session, empty for files with neither exercises nor climbs.
+    data = session.data
+    if "exercises" in data or session.is_outdoor:
+        calc = WorkoutIntensityCalculator(data, source_file=session.source_file, date=data.get("date"))
+        return calc.calculate_intensity_breakdown()
+    return {}
+
+
+class IntensityIndex:
+    def __init__(self, data_dir, index_path=None):
+        """
+        Persistent per-file index of session dates and intensity breakdowns.
+
+        The index is a SQLite file (by default next to the data). refresh() only rescores
+        files that were added or modified since the previous refresh and prunes deleted ones,
+        so its cost scales with what changed rather than with the size of the history.
+
+        Args:
+            data_dir (str): Directory holding the *.json workout files.
+            index_path (str): Location of the SQLite file.
+        """
+        self.data_dir = os.path.abspath(data_dir)
+        self.index_path = index_path or os.path.join(self.data_dir, INDEX_FILE)
+        self.conn = sqlite3.connect(self.index_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+        self._check_version()
+        # Files left out by the last refresh() or update(): path -> what went wrong.
+        self.errors = {}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check_version(self):
+        # Stored intensities are only valid for the formulas they were computed with.
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'scoring_version'").fetchone()
+        if row is None or row[0] != str(SCORING_VERSION):
+            with self.conn:
+                self.conn.execute("DELETE FROM sessions")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('scoring_version', ?)",
+                                  (str(SCORING_VERSION),))
+
+    @timed("index_refresh")
+    def refresh(self):
+        """
+        Brings the index up to date with the data directory.
+
+        A file is rescored only if its mtime or size changed and its content hash differs
+        from the stored one. Files that cannot be parsed or scored are reported, left out and
+        listed in self.errors; the others are still indexed.
+
+        Returns:
+            dict: Number of "added", "updated", "removed" and "unchanged" files.
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        known = {
+            path: (mtime_ns, size, sha1)
+            for path, mtime_ns, size, sha1 in self.conn.execute("SELECT path, mtime_ns, size, sha1 FROM sessions")
+        }
+        present = set()
+        with self.conn:
+            for file_path in sorted(glob.glob(os.path.join(self.data_dir, "*.json"))):
+                present.add(file_path)
+                status = self._update(file_path, known.get(file_path))
+                if status in stats:
+                    stats[status] += 1
+
+            for path in known.keys() - present:
+                self.conn.execute("DELETE FROM sessions WHERE path = ?", (path,))
+                stats["removed"] += 1
+        self.errors = {path: message for path, message in self.errors.items() if path in present}
+        return stats
+
+    def update(self, file_path):
+        """
+        Brings the index up to date with a single file, e.g. one that was just copied or
+        deleted. Same rules as refresh().
+
+        Returns:
+            str: "added", "updated", "unchanged", "removed" or "error" (a file that cannot
+            be parsed or scored, see self.errors).
+        """
+        file_path = os.path.abspath(file_path)
+        row = self.conn.execute("SELECT mtime_ns, size, sha1 FROM sessions WHERE path = ?", (file_path,)).fetchone()
+        with self.conn:
+            if not os.path.exists(file_path):
+                self.conn.execute("DELETE FROM sessions WHERE path = ?", (file_path,))
+                self.errors.pop(file_path, None)
+                return "removed" if row is not None else "unchanged"
+            return self._update(file_path, row)
+
+    def _update(self, file_path, row):
+        # row: stored (mtime_ns, size, sha1) of the file, None if not indexed.
+        st = os.stat(file_path)
+        if row is not None and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            return "unchanged"
+
+        with open(file_path, "rb") as f:
+            content = f.read()
+        sha1 = hashlib.sha1(content).hexdigest()
+        if row is not None and row[2] == sha1:
+            # Touched but not modified: only refresh the stat key.
+            self.conn.execute("UPDATE sessions SET mtime_ns = ?, size = ? WHERE path = ?",
+                              (st.st_mtime_ns, st.st_size, file_path))
+            return "unchanged"
+
+        try:
+            session = parse_session(file_path, content)
+        except json.JSONDecodeError as e:
+            return self._error(file_path, f"Error reading {file_path}: {e}")
+        except ValueError as e:
+            return self._error(file_path, f"Date error in {file_path}: {e}")
+        except SCORING_ERRORS as e:  # not an object, exercises that are not objects, ...
+            return self._error(file_path, f"Invalid session in {file_path}: {type(e).__name__}: {e}")
+        try:
+            breakdown = _breakdown(session)
+        except SCORING_ERRORS as e:
+            return self._error(file_path, f"Scoring error in {file_path}: {type(e).__name__}: {e}")
+        self.errors.pop(file_path, None)
+        self._store(session, st, sha1, breakdown)
+        return "updated" if row is not None else "added"
+
+    def _error(self, file_path, message):
+        # The file stays out of the index, and is read again by the next refresh.
+        print(message)
+        self.errors[file_path] = message
+        self.conn.execute("DELETE FROM sessions WHERE path = ?", (file_path,))
+        return "error"
+
+    def _store(self, session, st, sha1, breakdown):
+        data = session.data
+        self.conn.execute("DELETE FROM sessions WHERE path = ?", (session.path,))
+        self.conn.execute(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (session.path, st.st_mtime_ns, st.st_size, sha1, session.date.toordinal(),
+             int(session.is_outdoor), session.name, first_project_grade(data)),
+        )
+        self.conn.executemany(
+            "INSERT INTO breakdown VALUES (?, ?, ?)",
+            [(session.path, ex_type, float(value)) for ex_type, value in breakdown.items()],
+        )
+
+    def entry(self, file_path):
+        """
+        IndexEntry of one file, None if it is not indexed.
+        """
+        file_path = os.path.abspath(file_path)
+        row = self.conn.execute("SELECT path, day, outdoor, name, project_grade FROM sessions WHERE path = ?",
+                                (file_path,)).fetchone()
+        if row is None:
+            return None
+        path, day, outdoor, name, grade = row
+        breakdown = dict(self.conn.execute("SELECT ex_type, intensity FROM breakdown WHERE path = ?", (path,)))
+        return IndexEntry(path, datetime.fromordinal(day), bool(outdoor), name, grade, breakdown)
+
+    def days(self):
+        """
+        Stat key and day ordinal of every indexed file, read without rescoring anything:
+        path -> (mtime_ns, size, day). A file whose stat key changed may have another date.
+        """
+        return {path: (mtime_ns, size, day)
+                for path, mtime_ns, size, day in self.conn.execute("SELECT path, mtime_ns, size, day FROM sessions")}
+
+    def entries(self):
+        """
+        All indexed sessions, sorted by date.
+        """
+        breakdowns = {}
+        for path, ex_type, intensity in self.conn.execute("SELECT path, ex_type, intensity FROM breakdown"):
+            breakdowns.setdefault(path, {})[ex_type] = intensity
+        rows = self.conn.execute(
+            "SELECT path, day, outdoor, name, project_grade FROM sessions ORDER BY day, path"
+        )
+        return [
+            IndexEntry(path, datetime.fromordinal(day), bool(outdoor), name, grade, breakdowns.get(path, {}))
+            for path, day, outdoor, name, grade in rows
+        ]
+
+
+def load_intensity_entries(data_dir):
+    """
+    Refreshes the index of data_dir and returns its entries, sorted by date.
+    """
+    with IntensityIndex(data_dir) as index:
+        index.refresh()
+        return index.entries()
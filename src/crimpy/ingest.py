@@ -0,0 +1,141 @@
+# src/crimpy/ingest.py
+
+import os
+import glob
+
+from crimpy.intensity import WorkoutIntensityCalculator, SCORING_ERRORS
+from crimpy.loader import parse_session
+
+
+class ScoredSession:
+    def __init__(self, session, breakdown):
+        """
+        A parsed session together with its intensity breakdown.
+
+        Args:
+            session (Session): The parsed session.
+            breakdown (dict): Intensity per exercise type (and "outdoor" for climbs),
+                empty for files with neither exercises nor climbs.
+        """
+        self.session = session
+        self.breakdown = breakdown
+
+    @property
+    def date(self):
+        return self.session.date
+
+    @property
+    def path(self):
+        return self.session.path
+
+
+def find_workout_files(root, recursive=True):
+    """
+    Lists the *.json files under root, sorted. Archives usually hold one sub-directory per athlete.
+    """
+    pattern = os.path.join(root, "**", "*.json") if recursive else os.path.join(root, "*.json")
+    return sorted(glob.glob(pattern, recursive=recursive))
+
+
+def score_sessions(sessions):
+    """
+    Scores a list of sessions with the batch (vectorized) path of WorkoutIntensityCalculator.
+
+    Returns:
+        list: ScoredSession objects, in input order.
+    """
+    # Indoor and outdoor sessions are scored together, in one pass.
+    workouts = [s for s in sessions if "exercises" in s.data or s.is_outdoor]
+    batch = WorkoutIntensityCalculator.calculate_intensity_breakdown_batch([s.data for s in workouts])
+    breakdowns = {}
+    for i, s in enumerate(workouts):
+        breakdowns[id(s)] = {key: float(values[i]) for key, values in batch.items()}
+    return [ScoredSession(s, breakdowns.get(id(s), {})) for s in sessions]
+
+
+def iter_scored(sessions, batch_size=256):
+    """
+    Lazily scores a stream of sessions (e.g. crimpy.archive.iter_sessions) in batches,
+    so that memory use stays bounded by batch_size whatever the length of the stream.
+
+    Yields:
+        ScoredSession: In input order.
+    """
+    batch = []
+    for session in sessions:
+        batch.append(session)
+        if len(batch) >= batch_size:
+            yield from score_sessions(batch)
+            batch = []
+    if batch:
+        yield from score_sessions(batch)
+
+
+def _ingest_chunk(paths):
+    """
+    Parses and scores one chunk of files. Runs in a worker process.
+
+    Returns the scored sessions and a list of (path, error message) for the files that
+    cannot be read, parsed or scored.
+    """
+    sessions = []
+    errors = []
+    for path in paths:
+        try:
+            sessions.append(parse_session(path))
+        except (OSError, *SCORING_ERRORS) as e:  # ValueError, not a JSON object, ...
+            errors.append((path, str(e)))
+    try:
+        return score_sessions(sessions), errors
+    except SCORING_ERRORS:
+        pass
+    # Some file cannot be scored: score them one by one to find it, and keep the others.
+    scored = []
+    for session in sessions:
+        try:
+            scored.extend(score_sessions([session]))
+        except SCORING_ERRORS as e:
+            errors.append((session.path, f"{type(e).__name__}: {e}"))
+    return scored, errors
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def ingest(paths, workers=None, chunksize=64):
+    """
+    Parses and scores many workout files across a process pool.
+
+    Files are split into chunks of chunksize, and each chunk is parsed and scored in a worker.
+    Larger chunks amortise the inter-process overhead, smaller ones balance the load better.
+
+    Args:
+        paths (str or list): A directory (searched recursively) or a list of files.
+        workers (int): Number of worker processes. None uses every core, 1 runs in-process.
+        chunksize (int): Number of files per task.
+
+    Returns:
+        list: ScoredSession objects, sorted by date then path, whatever the worker count.
+    """
+    if isinstance(paths, str):
+        paths = find_workout_files(paths)
+    chunks = _chunks(list(paths), max(1, int(chunksize)))
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1 or len(chunks) <= 1:
+        results = [_ingest_chunk(chunk) for chunk in chunks]
+    else:
+        # Imported here: the process pool machinery is slow to import and often not needed.
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_ingest_chunk, chunks))
+
+    scored = []
+    for chunk_sessions, errors in results:
+        scored.extend(chunk_sessions)
+        for path, message in errors:
+            print(f"Error reading {path}: {message}")
+    scored.sort(key=lambda s: (s.date, s.path))
+    return scored
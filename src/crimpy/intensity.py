@@ -1,22 +1,17 @@
-import re
 import numpy as np
+from crimpy.parsing import time_str_to_seconds, extract_edge_value, set_edge_mm
+from crimpy.diagnostics import default_diagnostics
+from crimpy.metrics import registry, timed
+from crimpy.grades import grade_value
+from crimpy.outdoor import CLIMB_STYLES, climb_grade
+from crimpy.scorers import SCORERS, EXERCISES, CLIMBS, scorer_for
 
-def time_str_to_seconds(time_str):
-    """
-    Convert a time string like '7s' or '15m' to seconds.
-    """
-    if time_str is None:
-        return 0
-    time_str = time_str.strip().lower()
-    match = re.match(r"(\d+\.?\d*)([sm])", time_str)
-    if match:
-        value, unit = match.groups()
-        value = float(value)
-        if unit == "s":
-            return value
-        elif unit == "m":
-            return value * 60
-    return 0
+# Bump whenever a formula below (or in crimpy.scorers) changes, so that stored intensities get rescored.
+SCORING_VERSION = 4
+
+# What scoring a malformed session can raise: a fingerboard set without timeoff divides by
+# zero, a number written as a string ("reps": "6") is a TypeError, ...
+SCORING_ERRORS = (ArithmeticError, TypeError, ValueError, KeyError, AttributeError, IndexError)
 
 
 class WorkoutIntensityCalculator:
@@ -27,13 +22,29 @@ class WorkoutIntensityCalculator:
     In this way, if an excerises hits all its reference values, it will contribute to the intensity with a factor of one.
     The intensity is also very weakly depending on the rest between sets, through a logarithmic function.
     """
-    def __init__(self, workout_data, source_file=None, date=None):
+    # Scorers (see crimpy.scorers) with a method below, which also reports the terms of each
+    # set to the diagnostics. Other scorers go through scorer_intensity.
+    METHODS = {
+        "fingerboard": "fingerboard_intensity",
+        "campusboard": "campusboard_intensity",
+        "pullup": "pullup_intensity",
+        "project": "project_intensity",
+        "outdoor": "outdoor_intensity",
+    }
+
+    def __init__(self, workout_data, source_file=None, date=None, diagnostics=None, profile=None):
         """
         workout_data: dict loaded from a workout JSON.
+        diagnostics: crimpy.diagnostics.Diagnostics collecting the per-set terms,
+            the process-wide one (off unless CRIMPY_DIAGNOSTICS is set) by default.
+        profile: crimpy.profiles.Profile with the reference values and weights of the
+            athlete, the default ones if None.
         """
         self.data = workout_data
         self.source_file = source_file
         self.date = date
+        self.diagnostics = diagnostics
+        self.profile = profile
 
     def calculate_intensity(self):
         """
@@ -42,44 +53,70 @@ class WorkoutIntensityCalculator:
         breakdown = self.calculate_intensity_breakdown()
         return sum(breakdown.values())
 
+    @timed("score")
     def calculate_intensity_breakdown(self):
         """
         Returns a dictionary with intensity contributions per exercise type.
-        The keys are: "fingerboard", "campusboard", "pullup", "project".
-        """
-        breakdown = {
-            "fingerboard": 0.0,
-            "campusboard": 0.0,
-            "pullup": 0.0,
-            "project": 0.0,
-        }
-        for exercise in self.data.get("exercises", []):
-            # Only consider executed exercises with nonzero order.
-            if not exercise.get("executed", False) or exercise.get("order", 0) == 0:
-                continue
-            ex_type = exercise.get("type", "").lower()
-            if ex_type == "fingerboard":
-                breakdown["fingerboard"] += self.fingerboard_intensity(exercise)
-            elif ex_type == "campus board":
-                breakdown["campusboard"] += self.campusboard_intensity(exercise)
-            elif ex_type == "pullup":
-                breakdown["pullup"] += self.pullup_intensity(exercise)
-            elif ex_type == "project":
-                breakdown["project"] += self.project_intensity(exercise)
+        The keys are the scorer groups of crimpy.scorers: "fingerboard", "campusboard",
+        "pullup", "project", "outdoor", and those of any registered scorer.
+        """
+        # Exercises are summed per scorer, then scorers per group in registration order,
+        # like crimpy.batch, so that both give the same floats.
+        totals = dict.fromkeys(SCORERS, 0.0)
+        n_sets = 0
+        # Outdoor sessions log climbs instead of exercises, with the same executed/order rule.
+        for section in (EXERCISES, CLIMBS):
+            for exercise in self.data.get(section, []):
+                # Only consider executed exercises with nonzero order.
+                if not exercise.get("executed", False) or exercise.get("order", 0) == 0:
+                    continue
+                ex_type = exercise.get("type", "").lower()
+                scorer = scorer_for(ex_type, section)
+                if scorer is None:
+                    continue
+                n_sets += len(exercise.get("sets", []))
+                method = self.METHODS.get(scorer.name)
+                if method is not None:
+                    totals[scorer.name] += getattr(self, method)(exercise)
+                else:
+                    totals[scorer.name] += self.scorer_intensity(scorer, ex_type, exercise)
+        breakdown = {}
+        for name, scorer in SCORERS.items():
+            breakdown[scorer.group] = breakdown.get(scorer.group, 0.0) + totals[name]
+        registry.count("sessions_scored")
+        registry.count("sets_scored", n_sets)
         return breakdown
 
+    @staticmethod
+    def calculate_intensity_breakdown_batch(workouts, profiles=None):
+        """
+        Batch mode of calculate_intensity_breakdown for many workouts at once.
+        All sets of one exercise type are flattened into column arrays and scored in a
+        single vectorized pass (see crimpy.batch). Results match the per-workout method.
+        profiles is one Profile for all workouts or a list with one per workout (e.g. a team).
+
+        Returns a dictionary with the same keys, each holding an array with one value per workout.
+        """
+        from crimpy.batch import batch_intensity_breakdown
+        return batch_intensity_breakdown(workouts, profiles)
+
     def extract_edge_value(self, edge_str):
         """
         Extracts the numeric part from an edge string (e.g., '20mm' -> 20).
         Returns None if not found.
         """
-        try:
-            numeric_part = ''.join(filter(lambda c: c.isdigit() or c == '.', edge_str))
-            if numeric_part:
-                return float(numeric_part)
-        except Exception:
-            pass
-        return None
+        return extract_edge_value(edge_str)
+
+    def constants(self, key):
+        """
+        Compiled parameters (crimpy.scorers.ScorerConstants) of one scorer, for the profile.
+        """
+        if self.profile is None:
+            return SCORERS[key].defaults
+        return self.profile.constants(key)
+
+    def _diagnostics(self):
+        return self.diagnostics if self.diagnostics is not None else default_diagnostics()
 
     def fingerboard_intensity(self, exercise):
         """
@@ -90,27 +127,38 @@ class WorkoutIntensityCalculator:
         xxx0 being your reference numbers, and the
         xxx_weights are supposed to sum to 1
         Then we sum over all sets and multiply by a scaling constant.
+        The reference numbers and weights come from the profile (see crimpy.scorers.FINGERBOARD_PARAMS).
         """
         intensity = 0.0
-        K_fb = 0.03  # scaling constant
-        for s in exercise.get("sets", []):
-            edge_val = self.extract_edge_value(s.get("edge", ""))
-            edge_ref = 35.0  # reference edge in mm
-            alpha = 1.5  # exponent > 1 for convex reward
-
-            edge_factor = (edge_ref / edge_val) ** alpha if edge_val and edge_val != 0 else 1.0
+        p = self.constants("fingerboard")
+        diag = self._diagnostics()
+        sets = exercise.get("sets", [])
+        for s in sets:
+            edge_val = set_edge_mm(s)
+            # (edge0/edge)^alpha, alpha > 1 for convex reward, 1 if the edge is not known
+            edge_factor = p.edge_factor(np.nan if edge_val is None else edge_val)
 
             reps = s.get("reps", 0)
             timeon = time_str_to_seconds(s.get("timeon", "0s"))
             timeoff = time_str_to_seconds(s.get("timeoff", "0s"))
             rest = time_str_to_seconds(s.get("rest", "0s"))
-            intensity_set = (timeon/7)*0.2 + (3/timeoff)*0.1 + (35*edge_factor)*0.4 + (reps/6)*0.3
-            rest_factor = 1.8*np.log(np.e - 1 + rest/1800)
-            print("Fingerboard ::: ", f"[{self.source_file} | {self.date}] edge: {edge_val}, I = {intensity_set:.3f} : "
-                  f"{(timeon / 7) * 0.2:.2f}, {(3 / timeoff) * 0.1:.2f}, {(35 * edge_factor) * 0.4:.2f}, {(reps / 6) * 0.3:.2f}, {rest_factor:.2f}")
+            timeon_term = (timeon/p.timeon_ref)*p.w_timeon
+            timeoff_term = (p.timeoff_ref/timeoff)*p.w_timeoff
+            edge_term = (p.edge_ref*edge_factor)*p.w_edge
+            reps_term = (reps/p.reps_ref)*p.w_reps
+            intensity_set = timeon_term + timeoff_term + edge_term + reps_term
+            rest_factor = p.rest_factor(rest)
             intensity_set /= rest_factor
             intensity += intensity_set
-        return K_fb * intensity / 10 # all are divided by 10 so that the typical intensity is O(1)
+            if diag.per_set:
+                diag.add_set("fingerboard", self.source_file, self.date, edge_val,
+                             {"timeon_term": timeon_term, "timeoff_term": timeoff_term,
+                              "edge_term": edge_term, "reps_term": reps_term},
+                             rest_factor, intensity_set)
+        intensity = p.scale * intensity / 10 # all are divided by 10 so that the typical intensity is O(1)
+        if diag.enabled:
+            diag.add_exercise("fingerboard", len(sets), intensity)
+        return intensity
 
     def campusboard_intensity(self, exercise):
         """
@@ -123,21 +171,15 @@ class WorkoutIntensityCalculator:
         where:
           - span = (max(steps) - min(steps))
           - num_steps = number of moves in the "steps" string.
+        The reference numbers and weights come from the profile (see crimpy.scorers.CAMPUSBOARD_PARAMS).
         """
         intensity = 0.0
-        K_cb = 0.25  # scaling constant
-
-        # reference values
-        ref_span = 3.0
-        ref_steps = 6.0
-        # weights
-        w_span = 0.25
-        w_step = 0.35
-        w_edge = 0.40
-
-        for s in exercise.get("sets", []):
-            edge_val = self.extract_edge_value(s.get("edge", ""))
-            edge_factor = 1.0 / edge_val if edge_val and edge_val != 0 else 1/35
+        p = self.constants("campusboard")
+        diag = self._diagnostics()
+        sets = exercise.get("sets", [])
+        for s in sets:
+            edge_val = set_edge_mm(s)
+            edge_factor = p.edge_factor(np.nan if edge_val is None else edge_val)
             steps_str = s.get("steps", "")
             try:
                 steps = [float(x) for x in steps_str.split("-") if x]
@@ -149,22 +191,28 @@ class WorkoutIntensityCalculator:
             span = max(steps) - min(steps)
             timeoff = time_str_to_seconds(s.get("timeoff", "0s"))
 
-            span_norm = span / ref_span
-            step_norm = (span / num_steps) / (ref_span / ref_steps)
+            span_norm = span / p.ref_span
+            step_norm = (span / num_steps) / (p.ref_span / p.ref_steps)
 
-            edge_term = (35 * edge_factor) * w_edge
-            span_term = span_norm * w_span
-            step_term = step_norm * w_step
+            edge_term = (p.edge_ref * edge_factor) * p.w_edge
+            span_term = span_norm * p.w_span
+            step_term = step_norm * p.w_step
 
             intensity_set = span_term + step_term + edge_term
 
-            rest_factor = np.log(np.e- 1 + timeoff/1200) / 0.6
+            rest_factor = p.rest_factor(timeoff)
             intensity_set /= rest_factor
             intensity += intensity_set
 
-            print("Campusboard ::: ", f"[{self.source_file} | {self.date}] edge: {edge_val}, I = {intensity_set:.3f} : edge contrib: {(35*edge_factor)*0.4:.2f}, steps contrib : {((num_steps/6)*0.35):.2f}, span contrib {(span/3)*0.25:.2f}, rest factor {rest_factor:2f}")
+            if diag.per_set:
+                diag.add_set("campusboard", self.source_file, self.date, edge_val,
+                             {"edge_term": edge_term, "span_term": span_term, "step_term": step_term},
+                             rest_factor, intensity_set)
 
-        return K_cb * intensity / 10
+        intensity = p.scale * intensity / 10
+        if diag.enabled:
+            diag.add_exercise("campusboard", len(sets), intensity)
+        return intensity
 
     def pullup_intensity(self, exercise):
         """
@@ -175,8 +223,10 @@ class WorkoutIntensityCalculator:
           xxx_weights are supposed to sum to 1
         """
         intensity = 0.0
-        K_pu = 0.9  # scaling constant
-        for s in exercise.get("sets", []):
+        p = self.constants("pullup")
+        diag = self._diagnostics()
+        sets = exercise.get("sets", [])
+        for s in sets:
             reps = s.get("repetitions", 0)
             if "weight_kg" in s:
                 weight = float(s["weight_kg"])
@@ -185,25 +235,95 @@ class WorkoutIntensityCalculator:
             else:
                 weight = 0.0
             timeoff = time_str_to_seconds(s.get("timeoff", "0s"))
-            intensity_set = (reps/8)*0.5 + (weight/10)*0.5
-            intensity_set /= np.log(np.e - 1 + timeoff / 180)
+            reps_term = (reps/p.reps_ref)*p.w_reps
+            weight_term = (weight/p.weight_ref)*p.w_weight
+            intensity_set = reps_term + weight_term
+            rest_factor = p.rest_factor(timeoff)
+            intensity_set /= rest_factor
             intensity += intensity_set
-        return K_pu * intensity / 10
+            if diag.per_set:
+                diag.add_set("pullup", self.source_file, self.date, None,
+                             {"reps_term": reps_term, "weight_term": weight_term}, rest_factor, intensity_set)
+        intensity = p.scale * intensity / 10
+        if diag.enabled:
+            diag.add_exercise("pullup", len(sets), intensity)
+        return intensity
 
     def project_intensity(self, exercise):
         """
         For project exercises, we propose:
 
           intensity_set = attempts * log(e - 1 + rest[s]/300s)
+
+        The scaling constant is quite small: project intensity is very dependent on the
+        grade and the effort put, which is not being measured.
         """
         intensity = 0.0
-        K_proj = 0.45  # scaling constant is quite small.
-                      # Project intensity is very dependent on the grade and the effort put,
-                      # which is not being measured
-        for s in exercise.get("sets", []):
+        p = self.constants("project")
+        diag = self._diagnostics()
+        sets = exercise.get("sets", [])
+        for s in sets:
             attempts = s.get("attempts", 0)
             timeoff = time_str_to_seconds(s.get("timeoff", "0s"))
             intensity_set = attempts
-            intensity_set /= np.log(np.e - 1 + timeoff / 300)
+            rest_factor = p.rest_factor(timeoff)
+            intensity_set /= rest_factor
+            intensity += intensity_set
+            if diag.per_set:
+                diag.add_set("project", self.source_file, self.date, None,
+                             {"attempts_term": attempts}, rest_factor, intensity_set)
+        intensity = p.scale * intensity / 10
+        if diag.enabled:
+            diag.add_exercise("project", len(sets), intensity)
+        return intensity
+
+    def outdoor_intensity(self, climbs):
+        """
+        For outdoor climbs (one lead, toprope or boulder block), we propose:
+
+          intensity_set = style * attempts * (grade/grade0)^2
+
+        grade being the grade index of crimpy.grades (French, Font, V-scale or YDS), grade0 = 6a,
+        and style the share of a lead attempt's effort (see crimpy.outdoor.CLIMB_STYLES).
+        Unknown grades count as grade0. There is no rest time between climbs in the logs.
+        """
+        intensity = 0.0
+        p = self.constants("outdoor")
+        style = CLIMB_STYLES.get(climbs.get("type", "").lower(), 1.0)
+        diag = self._diagnostics()
+        sets = climbs.get("sets", [])
+        for s in sets:
+            grade = grade_value(climb_grade(s))
+            grade_factor = p.grade_factor(np.nan if grade is None else grade)
+            attempts = s.get("attempts", 1)
+            intensity_set = style * attempts * grade_factor
             intensity += intensity_set
-        return K_proj * intensity / 10
+            if diag.per_set:
+                diag.add_set("outdoor", self.source_file, self.date, None,
+                             {"attempts_term": attempts, "grade_term": grade_factor}, 1.0, intensity_set)
+        intensity = p.scale * intensity / 10
+        if diag.enabled:
+            diag.add_exercise("outdoor", len(sets), intensity)
+        return intensity
+
+    def scorer_intensity(self, scorer, ex_type, exercise):
+        """
+        Intensity of an exercise scored by a registered scorer with no method here (6in6,
+        deadhang, ...), through its vectorized set formula. See crimpy.scorers.
+        """
+        from crimpy.batch import exercise_columns
+        diag = self._diagnostics()
+        cols = exercise_columns(scorer, ex_type, exercise.get("sets", []))
+        p = self.constants(scorer.name)
+        set_intensity = np.asarray(scorer.set_intensity(cols, p), dtype=float)
+        intensity = p.scale * sum(set_intensity.tolist()) / 10
+        if diag.per_set:
+            terms = {name: np.broadcast_to(values, len(cols)).tolist()
+                     for name, values in (scorer.terms(cols, p) if scorer.terms else {}).items()}
+            rest_factors = terms.pop("rest_factor", [np.nan] * len(cols))
+            for i, (edge, value) in enumerate(zip(cols.edge_mm.tolist(), set_intensity.tolist())):
+                diag.add_set(scorer.name, self.source_file, self.date, edge if edge == edge and edge else None,
+                             {name: values[i] for name, values in terms.items()}, rest_factors[i], value)
+        if diag.enabled:
+            diag.add_exercise(scorer.name, len(exercise.get("sets", [])), intensity)
+        return intensity
@@ -0,0 +1,208 @@
+# src/crimpy/loader.py
+
+import os
+import glob
+import json
+import pickle
+from datetime import datetime
+
+from crimpy.metrics import registry, timed
+
+DATE_FORMAT = "%d-%m-%Y"
+# Normalized sessions (see crimpy.normalize) and the template use ISO dates.
+ISO_DATE_FORMAT = "%Y-%m-%d"
+
+# The parsed sessions are pickled next to the data, in a hidden file that "*.json" does not match.
+CACHE_FILE = ".crimpy_cache.pkl"
+CACHE_VERSION = 2
+
+# In-process copy of the disk cache, per data directory.
+_memory_cache = {}
+
+
+class Exercise:
+    def __init__(self, type, executed, order, sets):
+        """
+        One exercise block of a workout.
+
+        Args:
+            type (str): Exercise type as written in the file (e.g. "campus board").
+            executed (bool): Whether the exercise was done.
+            order (int): Position in the workout, 0 for skipped exercises.
+            sets (list): The raw set dictionaries.
+        """
+        self.type = type
+        self.executed = executed
+        self.order = order
+        self.sets = sets
+
+    @property
+    def done(self):
+        # Same rule as everywhere else: executed exercises with nonzero order.
+        return bool(self.executed) and self.order != 0
+
+
+class Session:
+    def __init__(self, path, data, date):
+        """
+        A workout (or outdoor climbing) session parsed from one JSON file.
+
+        Args:
+            path (str): Path of the source file.
+            data (dict): The JSON content, as expected by WorkoutIntensityCalculator.
+            date (datetime): The session date.
+        """
+        self.path = path
+        self.data = data
+        self.date = date
+        self.name = data.get("name")
+        self.exercises = [
+            Exercise(ex.get("type", ""), ex.get("executed", False), ex.get("order", 0), ex.get("sets", []))
+            for ex in data.get("exercises", [])
+        ]
+
+    @property
+    def source_file(self):
+        return os.path.basename(self.path)
+
+    @property
+    def is_outdoor(self):
+        # Outdoor sessions log "climbs" instead of "exercises".
+        return "climbs" in self.data
+
+    def done_exercises(self, ex_type):
+        """
+        Executed exercises of the given type (case insensitive).
+        """
+        ex_type = ex_type.lower()
+        return [ex for ex in self.exercises if ex.done and ex.type.lower() == ex_type]
+
+    def sets(self, ex_type):
+        """
+        All sets of the executed exercises of the given type.
+        """
+        return [s for ex in self.done_exercises(ex_type) for s in ex.sets]
+
+
+def parse_date(date_str):
+    """
+    Session date from a DD-MM-YYYY or a YYYY-MM-DD string.
+
+    Raises:
+        ValueError: If the date is in neither format.
+    """
+    date_format = ISO_DATE_FORMAT if date_str[4:5] == "-" else DATE_FORMAT
+    return datetime.strptime(date_str, date_format)
+
+
+@timed("parse")
+def parse_session(path, content=None):
+    """
+    Reads and parses one workout file.
+
+    Args:
+        path (str): Path of the workout file.
+        content (bytes or str): File content, if already read by the caller.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON.
+        ValueError: If the date is missing or not in DD-MM-YYYY (or YYYY-MM-DD) format.
+    """
+    if content is None:
+        with open(path, "r") as f:
+            data = json.load(f)
+    else:
+        data = json.loads(content)
+    workout_date = data.get("date")
+    if not workout_date:
+        raise ValueError("missing date")
+    date_obj = parse_date(workout_date)
+    return Session(path, data, date_obj)
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, "rb") as f:
+            version, entries = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, TypeError):
+        return {}
+    if version != CACHE_VERSION:
+        return {}
+    return entries
+
+
+def _write_cache(cache_path, entries):
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump((CACHE_VERSION, entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write cache {cache_path}: {e}")
+
+
+@timed("load")
+def load_sessions(data_dir, use_cache=True):
+    """
+    Loads every session in data_dir, parsing each file only once.
+
+    Parsed sessions are cached on disk, keyed by path, mtime and size. Files that changed
+    since the last run are parsed again, and entries of deleted files are evicted.
+    Files that cannot be parsed are reported and skipped, and their error is cached too.
+
+    Args:
+        data_dir (str): Directory holding the *.json workout files.
+        use_cache (bool): Set to False to ignore and leave the cache untouched.
+
+    Returns:
+        list: Session objects sorted by date.
+    """
+    data_dir = os.path.abspath(data_dir)
+    cache_path = os.path.join(data_dir, CACHE_FILE)
+    if use_cache:
+        entries = _memory_cache.get(data_dir)
+        if entries is None:
+            entries = _read_cache(cache_path)
+    else:
+        entries = {}
+
+    fresh = {}
+    changed = False
+    for file_path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        key = _file_key(file_path)
+        cached = entries.get(file_path)
+        if cached is not None and cached[0] == key:
+            fresh[file_path] = cached
+            if cached[2] is not None:
+                print(cached[2])
+            continue
+        changed = True
+        session = error = None
+        try:
+            session = parse_session(file_path)
+        except json.JSONDecodeError as e:
+            error = f"Error reading {file_path}: {e}"
+        except ValueError as e:
+            error = f"Date error in {file_path}: {e}"
+        except (TypeError, AttributeError) as e:
+            # Non-object JSON, or a date that is not a string.
+            error = f"Error reading {file_path}: {e}"
+        if error is not None:
+            print(error)
+        fresh[file_path] = (key, session, error)
+
+    if use_cache:
+        # Deleted files simply do not make it into the fresh entries.
+        if changed or len(fresh) != len(entries):
+            _write_cache(cache_path, fresh)
+        _memory_cache[data_dir] = fresh
+
+    sessions = [session for _, session, _ in fresh.values() if session is not None]
+    sessions.sort(key=lambda s: (s.date, s.path))
+    registry.count("sessions_loaded", len(sessions))
+    return sessions
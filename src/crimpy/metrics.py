@@ -0,0 +1,141 @@
+# src/crimpy/metrics.py
+#
+# Timers and counters of the processing stages (load, parse, score, aggregate), to tell
+# where a slow run spends its time. The stages are instrumented with the timed decorator
+# and the process-wide registry is exported as JSON or Prometheus text.
+#
+#   from crimpy.metrics import registry
+#   ...
+#   print(registry.to_prometheus())
+#
+# Timers are inclusive: "load" contains the "parse" of the files it reads. Only the calling
+# process is measured, work done in pool workers (crimpy.ingest, crimpy.report) is not.
+
+import json
+import time
+import functools
+from contextlib import contextmanager
+
+
+class Metrics:
+    def __init__(self, enabled=True):
+        """
+        Registry of named timers and counters.
+
+        Args:
+            enabled (bool): When False, timers and counters record nothing.
+        """
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """
+        Drops every timer and counter.
+        """
+        # name -> [calls, total seconds, max seconds]
+        self._timers = {}
+        self._counters = {}
+
+    def add_time(self, name, seconds):
+        timer = self._timers.get(name)
+        if timer is None:
+            self._timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+    def count(self, name, n=1):
+        """
+        Adds n to a counter.
+        """
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Context manager timing its block under name.
+        """
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t0)
+
+    def timed(self, name):
+        """
+        Decorator timing every call of a function under name.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add_time(name, time.perf_counter() - t0)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {"timers": {name: {"calls", "total_s", "max_s"}}, "counters": {name: int},
+            "parse_cache": crimpy.parsing.parse_cache_stats()}.
+        """
+        from crimpy.parsing import parse_cache_stats
+        return {
+            "timers": {name: {"calls": calls, "total_s": total, "max_s": worst}
+                       for name, (calls, total, worst) in sorted(self._timers.items())},
+            "counters": dict(sorted(self._counters.items())),
+            "parse_cache": parse_cache_stats(),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix="crimpy"):
+        """
+        Snapshot in the Prometheus text exposition format.
+        """
+        snap = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for label, value in samples:
+                lines.append(f"{prefix}_{name}{{{label}}} {value}")
+
+        timers = snap["timers"].items()
+        family("stage_seconds_total", "counter", "Time spent in each stage.",
+               [(f'stage="{n}"', t["total_s"]) for n, t in timers])
+        family("stage_calls_total", "counter", "Number of calls of each stage.",
+               [(f'stage="{n}"', t["calls"]) for n, t in timers])
+        family("stage_max_seconds", "gauge", "Longest single call of each stage.",
+               [(f'stage="{n}"', t["max_s"]) for n, t in timers])
+        family("items_total", "counter", "Number of items processed.",
+               [(f'name="{n}"', v) for n, v in snap["counters"].items()])
+        for field in ("hits", "misses"):
+            family(f"parse_cache_{field}_total", "counter", f"Parsing cache {field}.",
+                   [(f'cache="{n}"', s[field]) for n, s in snap["parse_cache"].items()])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Writes the snapshot to path, as Prometheus text if it ends with .prom, JSON otherwise.
+        """
+        with open(path, "w") as f:
+            f.write(self.to_prometheus() if path.endswith(".prom") else self.to_json())
+
+
+# Process-wide registry used by the instrumented crimpy functions.
+registry = Metrics()
+timed = registry.timed
@@ -0,0 +1,336 @@
+# src/crimpy/normalize.py
+#
+# One-time validation and normalization of session files, at ingest. Every value is checked
+# once and written in a canonical, pre-parsed form, so that reading a normalized session
+# needs no coercion:
+#
+#   date            ISO string (YYYY-MM-DD), from DD-MM-YYYY or YYYY-MM-DD
+#   type            lowercase; executed a bool, order an int
+#   timeon, timeoff, rest, locktime
+#                   seconds, as numbers ("7s" -> 7.0, "2m" -> 120.0, "120" -> 120.0)
+#   edge            label kept as written ("20mm", "Sphere"), plus edge_mm: a number, or
+#                   null when the label has no size
+#   weight_kg       kilograms, weight_lb converted
+#   reps, repetitions, attempts, n_success
+#                   ints; success, flash, redpoint bools
+#   grade           outdoor climb grade, from "Grade" or "grade"
+#
+# Other keys (steps, sides, locktype, notes, ...) are kept as they are. Each problem is
+# reported with its location in the file; a session with errors is not normalized, while
+# warnings (a value read with a guess, an exercise no scorer knows) are only reported.
+#
+#   python -m crimpy.normalize data/                     (report only)
+#   python -m crimpy.normalize data/ normalized/         (write the normalized files)
+
+import os
+import re
+import sys
+import glob
+import json
+import argparse
+
+from crimpy.loader import ISO_DATE_FORMAT, parse_date
+from crimpy.scorers import EXERCISES, CLIMBS, scorer_for
+from crimpy.parsing import TIME_RE, extract_edge_value
+from crimpy.grades import grade_value
+
+ERROR = "error"
+WARNING = "warning"
+
+TIME_KEYS = ("timeon", "timeoff", "rest", "locktime")
+INT_KEYS = ("reps", "repetitions", "attempts", "n_success")
+BOOL_KEYS = ("success", "flash", "redpoint")
+
+LB_TO_KG = 0.453592
+
+_STEPS_RE = re.compile(r"\d+(-\d+)*")
+
+
+class Problem:
+    __slots__ = ("severity", "location", "message")
+
+    def __init__(self, severity, location, message):
+        """
+        One problem found in a session.
+
+        Args:
+            severity (str): "error" (the session is rejected) or "warning".
+            location (str): Where in the file, e.g. "exercises[2].sets[0].timeoff".
+            message (str): What is wrong.
+        """
+        self.severity = severity
+        self.location = location
+        self.message = message
+
+    def __repr__(self):
+        return f"Problem({self.severity!r}, {self.location!r}, {self.message!r})"
+
+    def __str__(self):
+        return f"{self.severity}: {self.location}: {self.message}" if self.location else f"{self.severity}: {self.message}"
+
+
+class ValidationError(ValueError):
+    def __init__(self, problems, source=None):
+        """
+        A session that cannot be normalized.
+
+        Args:
+            problems (list): Every Problem found, errors and warnings.
+            source (str): File the session was read from, if known.
+        """
+        self.problems = problems
+        self.source = source
+        errors = [str(p) for p in problems if p.severity == ERROR]
+        super().__init__(f"{source + ': ' if source else ''}{len(errors)} error(s): " + "; ".join(errors))
+
+
+class _Checker:
+    # Collects the problems of one session while its values are converted.
+
+    def __init__(self):
+        self.problems = []
+
+    def error(self, location, message):
+        self.problems.append(Problem(ERROR, location, message))
+
+    def warning(self, location, message):
+        self.problems.append(Problem(WARNING, location, message))
+
+    def seconds(self, location, value):
+        if isinstance(value, bool) or value is None:
+            self.error(location, f"expected a time, got {value!r}")
+            return None
+        if isinstance(value, (int, float)):
+            if value < 0:
+                self.error(location, f"negative time {value!r}")
+                return None
+            return float(value)
+        if not isinstance(value, str):
+            self.error(location, f"expected a time, got {value!r}")
+            return None
+        text = value.strip().lower()
+        match = TIME_RE.match(text)
+        if not match:
+            self.error(location, f"cannot read time {value!r}")
+            return None
+        number, unit = match.groups()
+        seconds = float(number) * (60 if unit == "m" else 1)
+        if match.end() != len(text):
+            # "360s-360s", "180s-120": the scorers read the first value only.
+            self.warning(location, f"time {value!r} read as {seconds:g}s, the rest is ignored")
+        return seconds
+
+    def integer(self, location, value):
+        if isinstance(value, bool):
+            self.error(location, f"expected a whole number, got {value!r}")
+            return None
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value.strip())
+        self.error(location, f"expected a whole number, got {value!r}")
+        return None
+
+    def boolean(self, location, value):
+        if isinstance(value, bool):
+            return value
+        if value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return value.strip().lower() == "true"
+        self.error(location, f"expected true or false, got {value!r}")
+        return None
+
+    def number(self, location, value):
+        if not isinstance(value, bool) and isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                pass
+        self.error(location, f"expected a number, got {value!r}")
+        return None
+
+    def date(self, value):
+        if not isinstance(value, str) or not value:
+            self.error("date", "missing date" if value is None else f"expected a date string, got {value!r}")
+            return None
+        try:
+            return parse_date(value.strip()).strftime(ISO_DATE_FORMAT)
+        except ValueError:
+            self.error("date", f"invalid date {value!r}, expected DD-MM-YYYY or YYYY-MM-DD")
+            return None
+
+
+def _normalize_set(check, location, s, scorer):
+    out = {}
+    for key, value in s.items():
+        at = f"{location}.{key}"
+        if key in TIME_KEYS:
+            value = check.seconds(at, value)
+        elif key in INT_KEYS:
+            value = check.integer(at, value)
+        elif key in BOOL_KEYS:
+            value = check.boolean(at, value)
+        elif key == "weight_kg":
+            value = check.number(at, value)
+        elif key == "weight_lb":
+            if "weight_kg" in s:
+                check.warning(at, "both weight_kg and weight_lb given, weight_lb is ignored")
+                continue
+            value = check.number(at, value)
+            key = "weight_kg"
+            if value is not None:
+                value *= LB_TO_KG
+        elif key == "edge":
+            if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+                check.error(at, f"expected an edge label, got {value!r}")
+                continue
+            out[key] = value
+            out["edge_mm"] = extract_edge_value(value)
+            continue
+        elif key in ("Grade", "grade"):
+            if key == "grade" and "Grade" in s:
+                continue  # "Grade" comes first, as in crimpy.outdoor.climb_grade
+            key = "grade"
+            if grade_value(value) is None:
+                check.warning(at, f"unknown grade {value!r}, scored as the reference grade")
+        elif key == "steps":
+            if not isinstance(value, str) or not _STEPS_RE.fullmatch(value.strip()):
+                check.warning(at, f"cannot read steps {value!r}, the set is not scored")
+        if value is not None:
+            out[key] = value
+    if scorer is not None and scorer.name == "fingerboard" and ("timeoff" not in s or out.get("timeoff") == 0):
+        check.error(f"{location}.timeoff", "fingerboard sets need a nonzero timeoff")
+    return out
+
+
+def _normalize_block(check, location, block, section):
+    if not isinstance(block, dict):
+        check.error(location, f"expected an object, got {type(block).__name__}")
+        return None
+    out = dict(block)
+    ex_type = block.get("type")
+    if not isinstance(ex_type, str):
+        check.error(f"{location}.type", f"expected a type string, got {ex_type!r}")
+        return None
+    out["type"] = ex_type.strip().lower()
+    executed = check.boolean(f"{location}.executed", block.get("executed", False))
+    order = check.integer(f"{location}.order", block.get("order", 0))
+    out["executed"] = bool(executed)
+    out["order"] = order or 0
+    done = out["executed"] and out["order"] != 0
+    scorer = scorer_for(out["type"], section)
+    if done and scorer is None:
+        check.warning(f"{location}.type", f"no scorer for type {ex_type!r}, the exercise is not scored")
+    sets = block.get("sets", [])
+    if not isinstance(sets, list):
+        check.error(f"{location}.sets", f"expected a list, got {type(sets).__name__}")
+        return None
+    out["sets"] = []
+    for i, s in enumerate(sets):
+        if not isinstance(s, dict):
+            check.error(f"{location}.sets[{i}]", f"expected an object, got {type(s).__name__}")
+            continue
+        # Sets of skipped exercises are not scored: they are kept, but only checked lightly.
+        out["sets"].append(_normalize_set(check, f"{location}.sets[{i}]", s, scorer if done else None))
+    return out
+
+
+def normalize_session(data):
+    """
+    Validates a session (the content of a session file) and converts it to the canonical
+    form described in the module comment.
+
+    Returns:
+        tuple: (normalized dict, or None if there are errors, list of Problems).
+    """
+    check = _Checker()
+    if not isinstance(data, dict):
+        check.error("", f"expected a JSON object, got {type(data).__name__}")
+        return None, check.problems
+    out = dict(data)
+    out["date"] = check.date(data.get("date"))
+    for section in (EXERCISES, CLIMBS):
+        if section not in data:
+            continue
+        blocks = data[section]
+        if not isinstance(blocks, list):
+            check.error(section, f"expected a list, got {type(blocks).__name__}")
+            continue
+        out[section] = [_normalize_block(check, f"{section}[{i}]", block, section) for i, block in enumerate(blocks)]
+    if any(p.severity == ERROR for p in check.problems):
+        return None, check.problems
+    return out, check.problems
+
+
+def normalize_file(path):
+    """
+    Reads and normalizes one session file.
+
+    Returns:
+        tuple: (normalized dict or None, list of Problems), with invalid JSON as an error.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        return None, [Problem(ERROR, f"line {e.lineno} column {e.colno}", f"invalid JSON: {e.msg}")]
+    return normalize_session(data)
+
+
+def load_normalized(path):
+    """
+    Session (crimpy.loader) of a normalized file.
+
+    Raises:
+        ValidationError: If the file has errors.
+    """
+    from crimpy.loader import Session
+    data, problems = normalize_file(path)
+    if data is None:
+        raise ValidationError(problems, path)
+    return Session(path, data, parse_date(data["date"]))
+
+
+def normalize_directory(data_dir, out_dir=None):
+    """
+    Validates every *.json session file of data_dir and, if out_dir is given, writes the
+    normalized ones there under the same names. Files with errors are not written.
+
+    Returns:
+        dict: file path -> list of Problems, for the files with problems.
+    """
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    report = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        data, problems = normalize_file(path)
+        if problems:
+            report[path] = problems
+        if data is not None and out_dir is not None:
+            with open(os.path.join(out_dir, os.path.basename(path)), "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate session files and write them in canonical form.")
+    parser.add_argument("data_dir")
+    parser.add_argument("out_dir", nargs="?", help="write the normalized files here")
+    args = parser.parse_args()
+    report = normalize_directory(args.data_dir, args.out_dir)
+    n_errors = 0
+    for path, problems in report.items():
+        for problem in problems:
+            print(f"{path}: {problem}")
+        n_errors += any(p.severity == ERROR for p in problems)
+    print(f"{n_errors} file(s) with errors, {len(report) - n_errors} with warnings only")
+    sys.exit(1 if n_errors else 0)
+
+
+if __name__ == "__main__":
+    main()
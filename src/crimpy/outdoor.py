@@ -0,0 +1,19 @@
+# src/crimpy/outdoor.py
+#
+# Outdoor sessions log "climbs" instead of "exercises" (see data/outdoor1.json): blocks of
+# lead, toprope or boulder climbs, each set being one route or problem with its grade.
+
+# Climb type -> share of a lead attempt's effort that an attempt of this style represents.
+# Other climb types count as lead.
+CLIMB_STYLES = {
+    "lead": 1.0,
+    "toprope": 0.8,
+    "top rope": 0.8,
+    "boulder": 0.6,
+}
+
+
+def climb_grade(set_data):
+    # The template writes "Grade", older files "grade".
+    return set_data.get("Grade", set_data.get("grade"))
+
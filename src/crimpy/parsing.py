@@ -0,0 +1,98 @@
+# src/crimpy/parsing.py
+
+import re
+from functools import lru_cache
+
+# Workout files repeat the same few strings ("7s", "90s", "20mm") over and over,
+# so the parsed values are kept in a bounded LRU cache.
+CACHE_SIZE = 1024
+
+# A number of seconds or minutes; a number without a unit is in seconds ("120" = "120s").
+# Shared with crimpy.normalize, so that validation reads times exactly like the scorers.
+TIME_RE = re.compile(r"(\d+\.?\d*)\s*([sm]?)")
+_NON_NUMERIC_RE = re.compile(r"[^\d.]")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_time(time_str):
+    match = TIME_RE.match(time_str.strip().lower())
+    if match:
+        value, unit = match.groups()
+        value = float(value)
+        if unit == "m":
+            return value * 60
+        return value
+    return 0
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_edge(edge_str):
+    numeric_part = _NON_NUMERIC_RE.sub("", edge_str)
+    if numeric_part:
+        try:
+            return float(numeric_part)
+        except ValueError:
+            pass
+    return None
+
+
+def time_str_to_seconds(time_str):
+    """
+    Convert a time string like '7s', '15m' or '120' (seconds) to seconds.
+    Numbers, as in normalized sessions (see crimpy.normalize), are already seconds.
+    """
+    if time_str is None:
+        return 0
+    if isinstance(time_str, (int, float)):
+        return float(time_str)
+    return _parse_time(time_str)
+
+
+def extract_edge_value(edge_str):
+    """
+    Extracts the numeric part from an edge string (e.g., '20mm' -> 20).
+    Returns None if not found (e.g. "sphere" or a missing edge).
+    """
+    if isinstance(edge_str, (int, float)) and not isinstance(edge_str, bool):
+        return float(edge_str)
+    if not isinstance(edge_str, str):
+        return None
+    return _parse_edge(edge_str)
+
+
+def set_edge_mm(s):
+    """
+    Edge size in mm of a set: its "edge_mm" field in normalized sessions (None when the edge
+    has no size, like "Sphere" or "bar"), else read from its "edge" label.
+    """
+    if "edge_mm" in s:
+        return s["edge_mm"]
+    return extract_edge_value(s.get("edge", ""))
+
+
+def parse_cache_stats():
+    """
+    Hit/miss counters of the parsing caches, to see how much parsing they save.
+
+    Returns:
+        dict: For "time" and "edge", the number of hits, misses, cached entries and the hit rate.
+    """
+    stats = {}
+    for name, func in (("time", _parse_time), ("edge", _parse_edge)):
+        info = func.cache_info()
+        calls = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "hit_rate": info.hits / calls if calls else 0.0,
+        }
+    return stats
+
+
+def clear_parse_caches():
+    """
+    Empties the parsing caches and resets their counters.
+    """
+    _parse_time.cache_clear()
+    _parse_edge.cache_clear()
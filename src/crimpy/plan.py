@@ -0,0 +1,579 @@
+# src/crimpy/plan.py
+#
+# Training-plan simulator: projects the intensity breakdown and training load of a proposed
+# block of sessions, and how far they spread when sessions are missed or rests run long or
+# short, to compare plans before following one.
+#
+# A plan file is a JSON object with sessions written like workout_template.json, each on a
+# day of the week (0 = the weekday of "start"), repeated for "weeks" weeks, and progression
+# rules moving a set field by "step" every "every" weeks, up (or down) to "limit":
+#
+#   {
+#     "name": "strength",
+#     "start": "2026-11-02",
+#     "weeks": 6,
+#     "sessions": [
+#       {"day": 0, "session": {"exercises": [{"type": "fingerboard", "sets": [
+#           {"edge": "20mm", "reps": 6, "timeon": "7s", "timeoff": "3s", "rest": "180s"}]}]}},
+#       {"day": 3, "session": "sessions/pullups.json"}
+#     ],
+#     "progression": [
+#       {"type": "fingerboard", "field": "edge", "step": -2, "every": 2, "limit": 14},
+#       {"type": "pullup", "field": "weight_kg", "step": 2.5}
+#     ]
+#   }
+#
+# Every exercise of a planned session counts as executed. Session paths are relative to the
+# plan file; "type" is a scorer name (see crimpy.scorers).
+#
+# The plan is expanded and its sets parsed once. A Monte Carlo candidate misses each session
+# with probability `miss` and scales the rest of its sets by a factor drawn in
+# [1 - rest, 1 + rest] (rounded to whole seconds); a block of candidates is scored in one
+# vectorized pass on the set columns tiled once per candidate, and blocks run across a
+# process pool. The daily load of each candidate is rolled into the crimpy.training_load
+# series, carrying on from the athlete's history if given.
+#
+#   python -m crimpy.plan base.json peak.json --samples 5000 --miss 0.1 --rest 0.2 --history data/
+#
+#   sim = PlanSimulator(Plan.load("base.json"))
+#   sim.simulate(2000, miss=0.2).percentiles()      (cheap to repeat: nothing is parsed again)
+
+import os
+import copy
+import json
+import argparse
+from datetime import date, timedelta
+
+import numpy as np
+
+from crimpy.batch import SetColumns, flatten_all, group_breakdown, workout_intensity
+from crimpy.loader import parse_date
+from crimpy.parsing import set_edge_mm, time_str_to_seconds
+from crimpy.scorers import SCORERS, EXERCISES, CLIMBS, scorer_for
+from crimpy.training_load import ACUTE_DAYS, CHRONIC_DAYS, acwr, daily_load, ewma, monotony, rolling_mean
+from crimpy.metrics import registry, timed
+
+TIME_FIELDS = ("timeon", "timeoff", "rest", "locktime")
+NUMBER_FIELDS = ("reps", "repetitions", "weight_kg", "attempts", "n_success")
+PROGRESSION_FIELDS = TIME_FIELDS + NUMBER_FIELDS + ("edge",)
+
+# Set column holding the rest between sets, the one the rest variations scale.
+REST_COLUMNS = {"fingerboard": "rest_s"}
+DEFAULT_REST_COLUMN = "timeoff_s"
+
+# ACWR above this counts as a load spike.
+ACWR_LIMIT = 1.5
+
+# Upper bound on candidates x sets held in one tiled block.
+MAX_BLOCK_ELEMENTS = 1_000_000
+
+
+def _day(value):
+    # Date of a date, datetime or ISO (or DD-MM-YYYY) string.
+    if isinstance(value, str):
+        return parse_date(value).date()
+    return value if type(value) is date else value.date()
+
+
+class Progression:
+    def __init__(self, key, field, step, every=1, limit=None):
+        """
+        Rule changing one field of every set of an exercise type as the weeks go by.
+
+        Args:
+            key (str): Scorer name of the exercise type (e.g. "fingerboard").
+            field (str): Set field, one of PROGRESSION_FIELDS. Times are in seconds and
+                edges in mm.
+            step (float): Change per step, negative to go down (smaller edges, shorter rests).
+            every (int): Weeks per step.
+            limit (float): Value the field stops at, None for no limit.
+        """
+        if key not in SCORERS:
+            raise ValueError(f"Unknown scorer {key!r}, expected one of {', '.join(SCORERS)}")
+        if field not in PROGRESSION_FIELDS:
+            raise ValueError(f"Cannot progress {field!r}, expected one of {', '.join(PROGRESSION_FIELDS)}")
+        if every < 1:
+            raise ValueError(f"Expected every >= 1, got {every}")
+        self.key = key
+        self.field = field
+        self.step = step
+        self.every = every
+        self.limit = limit
+
+    def __repr__(self):
+        return f"Progression({self.key!r}, {self.field!r}, {self.step!r}, every={self.every}, limit={self.limit})"
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["type"], data["field"], data["step"], data.get("every", 1), data.get("limit"))
+
+    def value(self, value, week):
+        """
+        Value of the field in week (0 for the first one), from its value in the template.
+        """
+        value = value + self.step * (week // self.every)
+        if self.limit is not None:
+            value = min(value, self.limit) if self.step > 0 else max(value, self.limit)
+        return max(value, 0)
+
+    def apply(self, s, week):
+        """
+        Changes the field of set s (a dict, modified in place) for week. Sets without the
+        field, or with an edge of no size, are left as they are.
+        """
+        if self.field == "edge":
+            mm = set_edge_mm(s)
+            if mm is not None:
+                mm = self.value(mm, week)
+                s["edge"] = f"{mm:g}mm"
+                s["edge_mm"] = mm
+        elif self.field in s:
+            if self.field in TIME_FIELDS:
+                s[self.field] = self.value(time_str_to_seconds(s[self.field]), week)
+            else:
+                value = self.value(s[self.field], week)
+                # Repetitions stay whole numbers.
+                s[self.field] = int(value) if isinstance(s[self.field], int) and value == int(value) else value
+
+
+class Plan:
+    def __init__(self, start, weeks, sessions, progression=(), name="plan"):
+        """
+        A block of training: the same week of sessions repeated, with progression rules.
+
+        Args:
+            start (date or str): First day of the first week.
+            weeks (int): Number of weeks.
+            sessions (list): (day of the week, session dict) tuples, days 0 to 6 counted
+                from start. Sessions are written like workout_template.json; their date,
+                executed and order are set when the plan is expanded.
+            progression (list): Progression rules, applied in order.
+            name (str): Name shown when comparing plans.
+        """
+        self.start = _day(start)
+        self.weeks = weeks
+        self.sessions = sorted(sessions, key=lambda item: item[0])
+        self.progression = list(progression)
+        self.name = name
+        for day, _ in self.sessions:
+            if not 0 <= day < 7:
+                raise ValueError(f"Expected a day of the week from 0 to 6, got {day}")
+
+    def __repr__(self):
+        return f"Plan({self.name!r}, start={self.start.isoformat()}, weeks={self.weeks}, sessions={len(self.sessions)})"
+
+    @classmethod
+    def from_dict(cls, data, base_dir="."):
+        """
+        Plan from the content of a plan file (see the module comment).
+
+        Args:
+            data (dict): The plan.
+            base_dir (str): Directory the session paths are relative to.
+        """
+        sessions = []
+        for item in data["sessions"]:
+            session = item["session"]
+            if isinstance(session, str):
+                with open(os.path.join(base_dir, session), "r", encoding="utf-8") as f:
+                    session = json.load(f)
+            sessions.append((item.get("day", 0), session))
+        progression = [Progression.from_dict(rule) for rule in data.get("progression", [])]
+        return cls(data["start"], data.get("weeks", 1), sessions, progression, data.get("name", "plan"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+        return cls.from_dict(data, os.path.dirname(path))
+
+    def expand(self):
+        """
+        Every planned session, with its date and the progression of its week applied.
+
+        Returns:
+            list: (date, session dict) tuples, sorted by date.
+        """
+        workouts = []
+        for week in range(self.weeks):
+            for day, template in self.sessions:
+                when = self.start + timedelta(days=7 * week + day)
+                workouts.append((when, self._session(template, when, week)))
+        return workouts
+
+    def _session(self, template, when, week):
+        data = copy.deepcopy(template)
+        data["date"] = when.isoformat()
+        for section in (EXERCISES, CLIMBS):
+            for i, block in enumerate(data.get(section, [])):
+                block["executed"] = True
+                block["order"] = block.get("order") or i + 1
+                scorer = scorer_for(block.get("type", "").lower(), section)
+                if scorer is None:
+                    continue
+                for rule in self.progression:
+                    if rule.key == scorer.name:
+                        for s in block.get("sets", []):
+                            rule.apply(s, week)
+        return data
+
+
+def _tile(cols, factors, rest_column):
+    # SetColumns of len(factors) copies of cols, as workouts c * n_workouts + w, with the rest
+    # column of copy c scaled by factors[c, workout of the set].
+    n_copies = len(factors)
+    copies = np.arange(n_copies)[:, None]
+    exercise_workout = (cols.exercise_workout[None, :] + copies * cols.n_workouts).ravel()
+    exercise = (cols.exercise[None, :] + copies * cols.n_exercises).ravel()
+    columns = {name: np.tile(value, n_copies) for name, value in vars(cols).items()
+               if name not in ("key", "n_workouts", "exercise_workout", "exercise")}
+    set_workout = cols.exercise_workout[cols.exercise]
+    columns[rest_column] = np.rint(getattr(cols, rest_column)[None, :] * factors[:, set_workout]).ravel()
+    return SetColumns(cols.key, n_copies * cols.n_workouts, exercise_workout, exercise, **columns)
+
+
+def _peak(values):
+    # Maximum of each row, ignoring NaN (NaN for a row of NaN).
+    peak = np.where(np.isnan(values), -np.inf, values).max(axis=-1, initial=-np.inf)
+    return np.where(np.isneginf(peak), np.nan, peak)
+
+
+class PlanResult:
+    def __init__(self, name, days, keep, breakdown, series):
+        """
+        Outcome of the candidates of one plan.
+
+        Args:
+            name (str): Plan name.
+            days (array): Day ordinals from the first to the last planned day.
+            keep (array): Sessions done, bool array of shape (n_candidates, n_sessions).
+            breakdown (dict): key -> intensity of each session, (n_candidates, n_sessions).
+            series (dict): "load", "acute", "chronic", "acwr", "fatigue", "fitness", "form"
+                and "monotony", each of shape (n_candidates, n_days).
+        """
+        self.name = name
+        self.days = days
+        self.keep = keep
+        self.breakdown = breakdown
+        self.series = series
+
+    def __len__(self):
+        return len(self.keep)
+
+    def summary(self):
+        """
+        Per-candidate outcomes: "sessions" done, total "intensity", its total per breakdown
+        key, the peak acute load and ACWR, the number of days with ACWR above ACWR_LIMIT,
+        and the fitness and form on the last day.
+
+        Returns:
+            dict: name -> array with one value per candidate.
+        """
+        totals = {key: values.sum(axis=1) for key, values in self.breakdown.items()}
+        acwr = self.series["acwr"]
+        with np.errstate(invalid="ignore"):
+            spikes = (acwr > ACWR_LIMIT).sum(axis=1)
+        return {
+            "sessions": self.keep.sum(axis=1).astype(float),
+            "intensity": sum(totals.values()) if totals else np.zeros(len(self)),
+            **totals,
+            "peak_acute": self.series["acute"].max(axis=1, initial=0.0),
+            "peak_acwr": _peak(acwr),
+            "spike_days": spikes.astype(float),
+            "fitness": self.series["fitness"][:, -1] if len(self.days) else np.zeros(len(self)),
+            "form": self.series["form"][:, -1] if len(self.days) else np.zeros(len(self)),
+        }
+
+    def percentiles(self, q=(10, 50, 90)):
+        """
+        Percentiles of each summary() value over the candidates.
+
+        Returns:
+            dict: name -> list of len(q) floats.
+        """
+        return {name: np.nanpercentile(values, q).tolist() if len(values) else [np.nan] * len(q)
+                for name, values in self.summary().items()}
+
+    def daily(self, name="acwr", q=(10, 50, 90)):
+        """
+        Percentiles of one load series over the candidates, day by day.
+
+        Returns:
+            tuple: (ISO dates, array of shape (len(q), n_days)).
+        """
+        with np.errstate(invalid="ignore"):
+            values = np.nanpercentile(self.series[name], q, axis=0)
+        return [date.fromordinal(int(d)).isoformat() for d in self.days], values
+
+
+class PlanSimulator:
+    def __init__(self, plan, profile=None, history=None, acute=ACUTE_DAYS, chronic=CHRONIC_DAYS):
+        """
+        Scores the candidates of one plan. The plan is expanded and its sets parsed here,
+        once; each simulation then only costs the vectorized formulas.
+
+        Args:
+            plan (Plan): The plan.
+            profile (Profile): Parameters of the intensity formulas (crimpy.profiles), the
+                defaults if None.
+            history: Scored sessions before the plan (IndexEntry, ScoredSession, ... with a
+                date and a breakdown), which the training load carries on from. Sessions on
+                or after the plan start are ignored.
+            acute (int): Acute window, in days.
+            chronic (int): Chronic window, in days.
+        """
+        if not 0 < acute <= chronic:
+            raise ValueError(f"Expected 0 < acute <= chronic, got {acute} and {chronic}")
+        from crimpy.profiles import DEFAULT_PROFILE
+        self.plan = plan
+        self.acute = acute
+        self.chronic = chronic
+        workouts = plan.expand()
+        self.session_days = np.array([d.toordinal() for d, _ in workouts], dtype=np.int64)
+        self.n_sessions = len(workouts)
+        self.columns = {key: cols for key, cols in flatten_all([data for _, data in workouts]).items() if len(cols)}
+        self.n_sets = sum(len(cols) for cols in self.columns.values())
+        self.constants = (profile or DEFAULT_PROFILE).compile()
+        # Scores with the rests as planned, for candidates without rest variations.
+        self._planned = {key: workout_intensity(cols, constants=self.constants[key])
+                         for key, cols in self.columns.items()}
+        first = plan.start.toordinal()
+        last = int(self.session_days.max()) if self.n_sessions else first - 1
+        self.days = np.arange(first, last + 1, dtype=np.int64)
+        self._history_state(history or [], first)
+
+    def _history_state(self, history, first):
+        # Load of the `chronic` days before the plan and the averages on the day before it.
+        self._prefix = np.zeros(self.chronic)
+        self._fatigue = self._fitness = 0.0
+        days, load = daily_load([entry for entry in history if entry.date.toordinal() < first])
+        if not len(days):
+            return
+        # Rest days up to the day before the plan.
+        load = np.concatenate((load, np.zeros(first - 1 - int(days[-1]))))
+        self._fatigue = float(ewma(load, self.acute)[-1])
+        self._fitness = float(ewma(load, self.chronic)[-1])
+        tail = load[-self.chronic:]
+        self._prefix[self.chronic - len(tail):] = tail
+
+    def expected(self):
+        """
+        Breakdown of the plan followed as written: key -> intensity of each session.
+        """
+        return group_breakdown(self._planned, self.n_sessions)
+
+    def sample(self, n, miss=0.0, rest=0.0, seed=0):
+        """
+        Draws n candidates.
+
+        Args:
+            n (int): Number of candidates.
+            miss (float): Probability of missing each session.
+            rest (float): Largest relative change of the rests, drawn uniformly per session.
+            seed (int): Random seed.
+
+        Returns:
+            tuple: (keep, bool array (n, n_sessions); rest factors, float array
+            (n, n_sessions), or None when the rests do not vary).
+        """
+        if not 0 <= miss <= 1:
+            raise ValueError(f"Expected 0 <= miss <= 1, got {miss}")
+        if not 0 <= rest < 1:
+            raise ValueError(f"Expected 0 <= rest < 1, got {rest}")
+        rng = np.random.default_rng(seed)
+        keep = rng.random((n, self.n_sessions)) >= miss
+        factors = 1 + rest * rng.uniform(-1, 1, (n, self.n_sessions)) if rest else None
+        return keep, factors
+
+    def block_size(self):
+        """
+        Number of candidates scored at once, so that the tiled columns stay small.
+        """
+        return max(1, MAX_BLOCK_ELEMENTS // max(1, self.n_sets))
+
+    def evaluate_block(self, keep, factors=None):
+        """
+        Breakdowns of a block of candidates, scored together.
+
+        Args:
+            keep (array): Sessions done, bool array (n, n_sessions).
+            factors (array): Rest factors (n, n_sessions), None to keep the planned rests.
+
+        Returns:
+            dict: breakdown key -> array of shape (n, n_sessions).
+        """
+        n = len(keep)
+        per_scorer = {}
+        for key, cols in self.columns.items():
+            if factors is None:
+                values = self._planned[key]
+            else:
+                tiled = _tile(cols, factors, REST_COLUMNS.get(key, DEFAULT_REST_COLUMN))
+                values = workout_intensity(tiled, constants=self.constants[key]).reshape(n, self.n_sessions)
+            # A missed session scores 0, the others exactly what they score alone.
+            per_scorer[key] = np.where(keep, values, 0.0)
+        breakdown = group_breakdown(per_scorer, self.n_sessions)
+        return {key: np.broadcast_to(values, (n, self.n_sessions)) for key, values in breakdown.items()}
+
+    @timed("simulate")
+    def evaluate(self, keep, factors=None, workers=1):
+        """
+        Breakdowns of every candidate, block by block.
+
+        Args:
+            keep, factors: Candidates, see sample().
+            workers (int): Number of worker processes. None uses every core, 1 runs in-process.
+
+        Returns:
+            dict: breakdown key -> array of shape (n, n_sessions).
+        """
+        size = self.block_size()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1:
+            # Smaller blocks, so that every worker gets some.
+            size = max(1, min(size, -(-len(keep) // workers)))
+        blocks = [(keep[i:i + size], None if factors is None else factors[i:i + size])
+                  for i in range(0, len(keep), size)]
+
+        if workers == 1 or len(blocks) <= 1:
+            results = [self.evaluate_block(*block) for block in blocks]
+        else:
+            # Imported here: the process pool machinery is slow to import and often not needed.
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+                results = list(pool.map(_evaluate_in_worker, blocks))
+
+        registry.count("plans_simulated", len(keep))
+        if not results:
+            return {key: np.zeros((0, self.n_sessions)) for key in self.expected()}
+        return {key: np.concatenate([r[key] for r in results]) for key in results[0]}
+
+    def project(self, breakdown):
+        """
+        Training load series of each candidate over the plan days, carrying on from the
+        history (see crimpy.training_load.load_series).
+
+        Args:
+            breakdown (dict): key -> intensity of each session, (n, n_sessions).
+
+        Returns:
+            dict: "load", "acute", "chronic", "acwr", "fatigue", "fitness", "form" and
+            "monotony", each of shape (n, n_days).
+        """
+        values = list(breakdown.values())
+        n = len(values[0]) if values else 0
+        n_days = len(self.days)
+        session_load = np.zeros((n, self.n_sessions))
+        for v in values:
+            session_load = session_load + v
+        # Sessions of the same day add up in date order, as in daily_load.
+        index = (np.arange(n)[:, None] * n_days + (self.session_days - self.days[0] if n_days else 0)).ravel()
+        load = np.bincount(index, weights=session_load.ravel(), minlength=n * n_days).reshape(n, n_days)
+        full = np.concatenate((np.broadcast_to(self._prefix, (n, self.chronic)), load), axis=1)
+        fatigue = ewma(load, self.acute, self._fatigue) if n else load
+        fitness = ewma(load, self.chronic, self._fitness) if n else load
+        return {
+            "load": load,
+            "acute": rolling_mean(full, self.acute)[:, self.chronic:],
+            "chronic": rolling_mean(full, self.chronic)[:, self.chronic:],
+            "acwr": acwr(full, self.acute, self.chronic)[:, self.chronic:],
+            "fatigue": fatigue,
+            "fitness": fitness,
+            "form": fitness - fatigue,
+            "monotony": monotony(full, self.acute)[:, self.chronic:],
+        }
+
+    def simulate(self, n=1000, miss=0.0, rest=0.0, seed=0, workers=1):
+        """
+        Draws, scores and projects n candidates (see sample()). The same seed draws the
+        same candidates whatever the number of workers.
+
+        Returns:
+            PlanResult
+        """
+        keep, factors = self.sample(n, miss, rest, seed)
+        breakdown = self.evaluate(keep, factors, workers)
+        return PlanResult(self.plan.name, self.days, keep, breakdown, self.project(breakdown))
+
+
+_worker_simulator = None
+
+
+def _init_worker(simulator):
+    # The parsed columns are sent once per worker, not once per block.
+    global _worker_simulator
+    _worker_simulator = simulator
+
+
+def _evaluate_in_worker(block):
+    return {key: np.ascontiguousarray(values) for key, values in _worker_simulator.evaluate_block(*block).items()}
+
+
+def compare(plans, n=1000, miss=0.0, rest=0.0, seed=0, workers=1, profile=None, history=None):
+    """
+    Simulates several plans under the same conditions.
+
+    Args:
+        plans (list): Plan objects.
+        n, miss, rest, seed, workers: See PlanSimulator.simulate.
+        profile, history: See PlanSimulator.
+
+    Returns:
+        list: PlanResult of each plan.
+    """
+    return [PlanSimulator(plan, profile, history).simulate(n, miss, rest, seed, workers) for plan in plans]
+
+
+def format_comparison(results, q=(10, 50, 90)):
+    """
+    Summary percentiles of several plans side by side: one row per summary value, one
+    column per plan, each cell "median [low, high]".
+    """
+    if not results:
+        return ""
+    stats = [r.percentiles(q) for r in results]
+    names = list(dict.fromkeys(name for s in stats for name in s))
+    header = ["", *(r.name for r in results)]
+    rows = [[name, *(f"{s[name][1]:.4g} [{s[name][0]:.4g}, {s[name][-1]:.4g}]" if name in s else "-"
+                     for s in stats)] for name in names]
+    widths = [max(len(row[j]) for row in [header] + rows) for j in range(len(header))]
+
+    def line(values):
+        return "  ".join(v.ljust(w) if j == 0 else v.rjust(w) for j, (v, w) in enumerate(zip(values, widths)))
+    return "\n".join([line(header)] + [line(row) for row in rows])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate training plans and compare their projected load.")
+    parser.add_argument("plans", nargs="+", help="plan files (JSON)")
+    parser.add_argument("--samples", type=int, default=1000, help="Monte Carlo candidates per plan")
+    parser.add_argument("--miss", type=float, default=0.0, help="probability of missing each session")
+    parser.add_argument("--rest", type=float, default=0.0, help="largest relative change of the rests")
+    parser.add_argument("--history", help="session directory the training load carries on from")
+    parser.add_argument("--profiles", help="profiles file (see crimpy.profiles)")
+    parser.add_argument("--athlete", help="profile to score with")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 for every core)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    profile = None
+    if args.profiles:
+        from crimpy.profiles import load_profiles, profile_for
+        profile = profile_for(load_profiles(args.profiles), args.athlete)
+    history = None
+    if args.history:
+        from crimpy.index import IntensityIndex
+        with IntensityIndex(args.history) as index:
+            index.refresh()
+            history = index.entries()
+
+    plans = [Plan.load(path) for path in args.plans]
+    results = compare(plans, args.samples, args.miss, args.rest, args.seed, args.workers or None, profile, history)
+    print(f"{args.samples} candidates per plan, miss {args.miss:g}, rest +/-{args.rest:.0%}")
+    print(format_comparison(results))
+
+
+if __name__ == "__main__":
+    main()
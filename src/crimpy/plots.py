@@ -0,0 +1,226 @@
+# src/crimpy/plots.py
+#
+# Progression charts, drawn on a given matplotlib Axes so that the same code serves the
+# interactive apps (pyplot) and the headless report (plain Figure, no display needed).
+# matplotlib itself is only imported when a chart is drawn.
+
+import numpy as np
+from datetime import datetime
+
+from crimpy.aggregate import (effort_by_day_edge, moves_spread_by_day_edge, reps_by_day_weight,
+                              intensity_series)
+from crimpy.parsing import extract_edge_value
+
+# Colors of the exercise types in the intensity charts.
+INTENSITY_COLORS = {
+    "fingerboard": "#e41a1c",  # red
+    "campusboard": "#377eb8",  # blue
+    "pullup": "#4daf4a",       # green
+    "project": "#984ea3",      # purple
+    "outdoor": "#ff7f00",      # orange
+}
+INTENSITY_LABELS = {
+    "fingerboard": "Fingerboard",
+    "campusboard": "Campusboard",
+    "pullup": "Pullup",
+    "project": "Project",
+    "outdoor": "Outdoor climbing",
+}
+
+
+def _date_labels(days):
+    return [datetime.fromordinal(int(d)).strftime("%d-%m-%Y") for d in days]
+
+
+def _cmap(name):
+    from matplotlib import cm
+    return getattr(cm, name)
+
+
+def edge_colors(edges, cmap):
+    """
+    Maps edge labels to colors so that smaller (harder) edges get more intense shades.
+    Non-numeric edges (e.g. "sphere") are light gray.
+
+    Args:
+        edges (list): Edge labels.
+        cmap (str): Name of a matplotlib colormap (e.g. "Blues").
+    """
+    cmap = _cmap(cmap)
+    edge_values = {edge: extract_edge_value(edge) for edge in edges}
+    numeric_values = [v for v in edge_values.values() if v is not None]
+    min_edge = min(numeric_values) if numeric_values else 0
+    max_edge = max(numeric_values) if numeric_values else 1
+    colors = {}
+    for edge, value in edge_values.items():
+        if value is None:
+            colors[edge] = "lightgray"
+        else:
+            norm = (value - min_edge) / (max_edge - min_edge) if max_edge > min_edge else 0
+            # Rescale to [0.2, 1.0] so the largest edge is not white.
+            colors[edge] = cmap(0.2 + 0.8 * (1 - norm))
+    return colors
+
+
+def _stacked_bars(ax, x, values, labels, colors, legend_labels):
+    bottom = np.zeros(len(x))
+    for j, label in enumerate(labels):
+        ax.bar(x, values[:, j], bottom=bottom, color=colors[label], label=legend_labels[j])
+        bottom += np.array(values[:, j])
+    return bottom
+
+
+def plot_fingerboard(ax, sets):
+    """
+    Stacked bars of the total fingerboard effort per date and edge.
+
+    Args:
+        ax: matplotlib Axes to draw on.
+        sets: Set columns (SetTable or ColumnStore).
+    """
+    days, edges, effort = effort_by_day_edge(sets, sets.edge_names)
+    x = np.arange(len(days))
+    _stacked_bars(ax, x, effort, edges, edge_colors(edges, "Oranges"), [f"{edge}" for edge in edges])
+    ax.set_xticks(x)
+    ax.set_xticklabels(_date_labels(days), rotation=45)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Total Fingerboard Effort")
+    ax.set_title("Fingerboard Progression")
+    ax.legend(title="Edge")
+
+
+def plot_campus_moves(ax, sets):
+    """
+    Stacked bars of the total number of campus board moves per date and edge.
+    """
+    days, edges, moves, _ = moves_spread_by_day_edge(sets, sets.edge_names)
+    x = np.arange(len(days))
+    _stacked_bars(ax, x, moves, edges, edge_colors(edges, "Blues"), [f"{edge}" for edge in edges])
+    ax.set_xticks(x)
+    ax.set_xticklabels(_date_labels(days), rotation=45)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("# Moves")
+    ax.set_title("Campus Board progression")
+    ax.legend()
+
+
+def plot_campus_spread(ax, sets):
+    """
+    Stacked bars of the total campus board spread per date and edge.
+    """
+    days, edges, _, spread = moves_spread_by_day_edge(sets, sets.edge_names)
+    x = np.arange(len(days))
+    _stacked_bars(ax, x, spread, edges, edge_colors(edges, "Blues"), [f"Edge {edge}" for edge in edges])
+    ax.set_xticks(x)
+    ax.set_xticklabels(_date_labels(days), rotation=45)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Spread per move")
+    ax.set_title("Campus Board progression")
+    ax.legend()
+
+
+def plot_pullups(ax, sets):
+    """
+    Stacked bars of the total pullup repetitions per date and added weight.
+    """
+    days, weights, reps = reps_by_day_weight(sets)
+    min_weight, max_weight = (min(weights), max(weights)) if weights else (0, 1)
+    greens = _cmap("Greens")
+    colors = {}
+    for weight in weights:
+        norm = (weight - min_weight) / (max_weight - min_weight) if max_weight > min_weight else 0
+        # Rescale norm to [0.2, 1.0] so that the lightest weight (norm=0) gets 0.2
+        colors[weight] = greens(0.2 + 0.8 * norm)
+    x = np.arange(len(days))
+    _stacked_bars(ax, x, reps, weights, colors, [f"Additional weight: {w:.1f} kg" for w in weights])
+    ax.set_xticks(x)
+    ax.set_xticklabels(_date_labels(days), rotation=45)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("# Repetitions")
+    ax.set_title("Pullup progression")
+    ax.grid(alpha=0.3)
+    ax.legend()
+
+
+def _intensity_bars(ax, x, series):
+    bottom = np.zeros(len(x))
+    for key, values in series.items():
+        if key not in ("fingerboard", "campusboard", "pullup", "project") and not values.any():
+            continue  # no outdoor climbs (or other scored types) logged, keep the legend as it was
+        ax.bar(x, values, bottom=bottom, color=INTENSITY_COLORS.get(key),
+               label=INTENSITY_LABELS.get(key, key.replace("_", " ").capitalize()))
+        bottom += values
+    return bottom
+
+
+def plot_intensity(ax, entries):
+    """
+    Stacked intensity per exercise type against days elapsed since the first workout,
+    with the total intensity, project grades and outdoor sessions marked.
+
+    Args:
+        ax: matplotlib Axes to draw on.
+        entries: Scored sessions (e.g. from crimpy.index.load_intensity_entries).
+
+    Returns:
+        list: (days elapsed, date, name) of the outdoor sessions that were marked.
+    """
+    dates, series, grades, outdoor = intensity_series(entries)
+    if not dates:
+        return []
+    start_date = dates[0]
+    x = np.array([(dt - start_date).days for dt in dates])
+    total_intensity = sum(series.values())
+
+    bottom = _intensity_bars(ax, x, series)
+    proj_intensity = series["project"]
+    for i, (xi, proj, label) in enumerate(zip(x, proj_intensity, grades)):
+        if label and proj > 0:
+            ax.text(
+                xi, bottom[i] - proj / 2,  # place roughly centered vertically in the bar
+                label,
+                ha="center", va="center",
+                fontsize=12, color="black", fontweight="bold",
+                rotation=0
+            )
+
+    # Plot the total intensity as a continuous line over the stacked bars.
+    ax.plot(x, total_intensity, color="black", marker="o", linestyle="-", linewidth=2, label="Total Intensity")
+
+    # Plot lines to mark outdoor sections
+    marked = []
+    for dt, name in outdoor:
+        xi = (datetime.combine(dt, datetime.min.time()) - start_date).days
+        ax.axvline(x=xi, color="gray", linestyle="--", linewidth=1.5, alpha=0.9, zorder=10)
+        marked.append((xi, dt, name))
+
+    ax.set_xticks(x)
+    ax.set_xlabel("Days")
+    ax.set_ylabel("Intensity")
+    ax.set_title(" ")
+
+    # Custom legend entry for outdoor sessions
+    from matplotlib.lines import Line2D
+    outdoor_legend = Line2D([0], [0], color="gray", linestyle="--", linewidth=1.0, label="Outdoor session")
+    handles, labels = ax.get_legend_handles_labels()
+    handles.append(outdoor_legend)
+    labels.append("Outdoor session")
+    ax.legend(handles, labels, title="Exercise Type", loc="upper left", bbox_to_anchor=(1, 1))
+    ax.grid(alpha=0.3)
+    return marked
+
+
+def plot_intensity_budget(ax, entries):
+    """
+    Stacked intensity per exercise type, one bar per workout.
+    """
+    dates, series, _, _ = intensity_series(entries)
+    x = np.arange(len(dates))
+    _intensity_bars(ax, x, series)
+    ax.set_xticks(x)
+    ax.set_xticklabels([dt.strftime("%d-%m-%Y") for dt in dates], rotation=45)
+    ax.set_xlabel("Workout Date")
+    ax.set_ylabel("Intensity")
+    ax.set_title(" ")
+    ax.grid(alpha=0.3)
+    ax.legend()
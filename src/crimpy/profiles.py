@@ -0,0 +1,111 @@
+# src/crimpy/profiles.py
+#
+# Per-athlete parameter profiles: reference values and weights of the intensity formulas
+# (crimpy.scorers), overriding the defaults. A profiles file is a JSON object mapping a
+# profile name to the parameters it changes, per scorer; the "default" profile, if given,
+# applies to every athlete and the others are read on top of it:
+#
+#   {
+#     "default": {"fingerboard": {"edge_ref": 30}},
+#     "alice":   {"pullup": {"reps_ref": 12, "weight_ref": 20}, "project": {"scale": 0.6}}
+#   }
+#
+# A profile compiles its parameters once into constants and lookup tables, so many athletes
+# can be scored in one batch (crimpy.batch.batch_intensity_breakdown) with no per-set cost.
+
+import json
+
+from crimpy.scorers import SCORERS
+
+DEFAULT = "default"
+
+
+class Profile:
+    def __init__(self, name=DEFAULT, params=None):
+        """
+        Parameters of the intensity formulas for one athlete.
+
+        Args:
+            name (str): Profile (athlete) name.
+            params (dict): Scorer name -> {parameter name: value}, overriding the defaults
+                of crimpy.scorers. Unknown scorers or parameters raise a ValueError.
+        """
+        self.name = name
+        self.params = {key: dict(values) for key, values in (params or {}).items()}
+        for key, values in self.params.items():
+            if key not in SCORERS:
+                raise ValueError(f"Unknown scorer {key!r} in profile {name!r}, expected one of {', '.join(SCORERS)}")
+            SCORERS[key].compile(values)
+        self._compiled = None
+
+    def __repr__(self):
+        return f"Profile({self.name!r})"
+
+    def compile(self):
+        """
+        Constants of every registered scorer for this profile, computed on first use.
+
+        Returns:
+            dict: scorer name -> crimpy.scorers.ScorerConstants.
+        """
+        # Scorers registered after the last call are compiled too.
+        if self._compiled is None or len(self._compiled) != len(SCORERS):
+            self._compiled = {
+                key: scorer.compile(self.params[key]) if key in self.params else scorer.defaults
+                for key, scorer in SCORERS.items()
+            }
+        return self._compiled
+
+    def constants(self, key):
+        """
+        ScorerConstants of one scorer.
+        """
+        return self.compile()[key]
+
+
+DEFAULT_PROFILE = Profile()
+
+
+def merge_params(base, params):
+    """
+    Parameters of base updated with params (both scorer name -> {parameter: value}).
+    """
+    merged = {key: dict(values) for key, values in base.items()}
+    for key, values in params.items():
+        merged.setdefault(key, {}).update(values)
+    return merged
+
+
+def parse_profiles(data):
+    """
+    Profiles from the content of a profiles file (see the module comment).
+
+    Returns:
+        dict: profile name -> Profile, always including "default".
+    """
+    base = data.get(DEFAULT, {})
+    profiles = {DEFAULT: Profile(DEFAULT, base) if base else DEFAULT_PROFILE}
+    for name, params in data.items():
+        if name != DEFAULT:
+            profiles[name] = Profile(name, merge_params(base, params))
+    return profiles
+
+
+def load_profiles(path):
+    """
+    Reads a JSON profiles file.
+
+    Returns:
+        dict: profile name -> Profile, always including "default".
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_profiles(json.load(f))
+
+
+def profile_for(profiles, athlete):
+    """
+    Profile of an athlete, the default one if the athlete has none.
+    """
+    if not profiles:
+        return DEFAULT_PROFILE
+    return profiles.get(athlete) or profiles.get(DEFAULT, DEFAULT_PROFILE)
@@ -1,6 +1,8 @@
 # src/crimpy/pullup.py
 
 class Pullup:
+    __slots__ = ("date", "edge", "repetitions", "weight_kg", "timeoff")
+
     def __init__(self, date, edge, set_data):
         """
         Initialize a Pullup instance.
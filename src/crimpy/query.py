@@ -0,0 +1,343 @@
+# src/crimpy/query.py
+#
+# Lazy queries over the workout history. A query only records its filters; nothing is read
+# until a result is asked for, and then the filters are pushed down as far as they go:
+#
+#   between(start, end)   data directory: the dates of the files come from the intensity
+#                         index (crimpy.index) for the files it holds unchanged, which are not
+#                         opened, and are read from the files added or changed since (their
+#                         date only: nothing is decoded or scored). Only the files in range
+#                         are parsed. Archive: the date of each line is read before the line
+#                         is decoded, lines out of range are skipped undecoded.
+#   of_type(...)          the sets of the other exercises are never parsed.
+#   where(condition)      evaluated on the set columns of the matching exercises only.
+#
+#   from crimpy.query import sessions, col
+#   q = sessions("data/").between("2025-03-01", "2025-03-31").of_type("fingerboard").where(col("edge_mm") <= 20)
+#   q.sets()            SetTable of the matching sets, ready for crimpy.aggregate and crimpy.plots
+#   q.intensity()       per-session intensity of the matching sets
+#   list(q)             the matching sessions
+#
+# A root of athlete directories or archives (as for crimpy.dataset) is queried per athlete:
+# sessions("athletes/", athlete="alice").
+
+import os
+import re
+import glob
+import json
+import operator
+from functools import lru_cache
+
+import numpy as np
+
+from crimpy.loader import Session, parse_date, parse_session
+from crimpy.records import SET_DTYPE, SetTable, rows_to_columns, select_kind
+from crimpy.scorers import SCORERS, EXERCISES, CLIMBS, scorer_for
+from crimpy.batch import scored_blocks
+from crimpy.outdoor import CLIMB_STYLES
+from crimpy.metrics import registry
+
+# Date of an archive line or a session file, read without decoding it.
+_LINE_DATE_RE = re.compile(r'"date"\s*:\s*"([^"]*)"')
+
+_OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+              "==": operator.eq, "!=": operator.ne}
+
+
+def _ordinal(value):
+    # Day ordinal of a date, datetime, ISO (or DD-MM-YYYY) string or ordinal; None stays None.
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    if isinstance(value, str):
+        return parse_date(value).toordinal()
+    return value.toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _day(date_str):
+    return parse_date(date_str).toordinal()
+
+
+def _file_day(path):
+    # Day ordinal of a session file from its "date" field alone, None if it cannot be read.
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            match = _LINE_DATE_RE.search(f.read())
+        return _day(match.group(1)) if match else None
+    except (OSError, ValueError):
+        return None
+
+
+class Condition:
+    def __init__(self, mask):
+        """
+        Condition on set rows, combined with & (and), | (or) and ~ (not).
+
+        Args:
+            mask: Function of SET_DTYPE rows returning a boolean array.
+        """
+        self.mask = mask
+
+    def __and__(self, other):
+        return Condition(lambda rows: self.mask(rows) & other.mask(rows))
+
+    def __or__(self, other):
+        return Condition(lambda rows: self.mask(rows) | other.mask(rows))
+
+    def __invert__(self):
+        return Condition(lambda rows: ~self.mask(rows))
+
+
+class Column:
+    def __init__(self, name):
+        """
+        A set field (see crimpy.records.SET_DTYPE: edge_mm, reps, weight_kg, timeon_s, ...),
+        compared with a value to make a Condition. Missing values (NaN) only match !=.
+        """
+        if name not in SET_DTYPE.names:
+            raise ValueError(f"Unknown set field {name!r}, expected one of {', '.join(SET_DTYPE.names)}")
+        self.name = name
+
+    def _compare(self, op, value):
+        func = _OPERATORS[op]
+        name = self.name
+        return Condition(lambda rows: func(np.asarray(rows[name]), value))
+
+    def __lt__(self, value):
+        return self._compare("<", value)
+
+    def __le__(self, value):
+        return self._compare("<=", value)
+
+    def __gt__(self, value):
+        return self._compare(">", value)
+
+    def __ge__(self, value):
+        return self._compare(">=", value)
+
+    def __eq__(self, value):
+        return self._compare("==", value)
+
+    def __ne__(self, value):
+        return self._compare("!=", value)
+
+    __hash__ = None
+
+    def isin(self, values):
+        name = self.name
+        return Condition(lambda rows: np.isin(np.asarray(rows[name]), list(values)))
+
+
+def col(name):
+    """
+    Column of a set field, for where(): col("edge_mm") <= 20.
+    """
+    return Column(name)
+
+
+def _scorer_name(ex_type):
+    # Scorer name, or an exercise or climb type as written in the files ("campus board", "lead").
+    if ex_type in SCORERS:
+        return ex_type
+    scorer = scorer_for(ex_type, EXERCISES)
+    if scorer is None and ex_type.lower() in CLIMB_STYLES:
+        scorer = scorer_for(ex_type, CLIMBS)
+    if scorer is None:
+        raise ValueError(f"Unknown exercise type {ex_type!r}, expected one of {', '.join(SCORERS)}")
+    return scorer.name
+
+
+class Query:
+    def __init__(self, source, start=None, end=None, keys=None, condition=None, index_path=None):
+        """
+        Lazy query over the sessions of a data directory or a .jsonl archive. Use sessions()
+        to create one, and between(), of_type() and where() to narrow it down.
+
+        Args:
+            source (str): Data directory or archive path.
+            start, end (int): Day ordinals bounding the sessions, None for no bound.
+            keys (frozenset): Scorer names of the exercises to keep, all if None.
+            condition (Condition): Condition on the sets, None to keep every set.
+            index_path (str): Location of the intensity index of a directory (crimpy.index).
+        """
+        self.source = source
+        self.start = start
+        self.end = end
+        self.keys = keys
+        self.condition = condition
+        self.index_path = index_path
+
+    def _replace(self, **changes):
+        fields = {"start": self.start, "end": self.end, "keys": self.keys, "condition": self.condition,
+                  "index_path": self.index_path}
+        fields.update(changes)
+        return Query(self.source, **fields)
+
+    def __repr__(self):
+        return (f"Query({self.source!r}, start={self.start}, end={self.end}, "
+                f"keys={sorted(self.keys) if self.keys is not None else None}, where={self.condition is not None})")
+
+    # --- filters ---
+
+    def between(self, start=None, end=None):
+        """
+        Sessions from start to end, both included (dates, ISO strings or day ordinals).
+        """
+        start, end = _ordinal(start), _ordinal(end)
+        if self.start is not None:
+            start = self.start if start is None else max(start, self.start)
+        if self.end is not None:
+            end = self.end if end is None else min(end, self.end)
+        return self._replace(start=start, end=end)
+
+    def of_type(self, *types):
+        """
+        Exercises of the given types: scorer names ("campusboard") or types as written in the
+        session files ("campus board"). Sessions without any of them are left out.
+        """
+        keys = frozenset(_scorer_name(t) for t in types)
+        if self.keys is not None:
+            keys &= self.keys
+        return self._replace(keys=keys)
+
+    def where(self, condition):
+        """
+        Sets matching condition (see col()), on top of the previous conditions.
+        """
+        return self._replace(condition=condition if self.condition is None else self.condition & condition)
+
+    # --- reading ---
+
+    def _in_range(self, day):
+        return (self.start is None or day >= self.start) and (self.end is None or day <= self.end)
+
+    def _directory_paths(self):
+        # Files of the directory in the date range, sorted by date, without scoring anything
+        # (the index is not refreshed).
+        from crimpy.index import IntensityIndex
+        data_dir = os.path.abspath(self.source)
+        with IntensityIndex(data_dir, self.index_path) as index:
+            known = index.days()
+        found = []
+        n_dates = 0
+        for path in glob.glob(os.path.join(data_dir, "*.json")):
+            st = os.stat(path)
+            row = known.get(path)
+            if row is not None and row[:2] == (st.st_mtime_ns, st.st_size):
+                day = row[2]
+            else:
+                day = _file_day(path)
+                n_dates += 1
+            # Files without a readable date are parsed, and reported there.
+            if day is None or self._in_range(day):
+                found.append((day if day is not None else -1, path))
+        registry.count("query_dates_read", n_dates)
+        return [path for _, path in sorted(found)]
+
+    def _directory_sessions(self):
+        if self.start is None and self.end is None:
+            # The whole history: the cached loader is the fastest way to read it.
+            from crimpy.loader import load_sessions
+            yield from load_sessions(self.source)
+            return
+        paths = self._directory_paths()
+        registry.count("query_files_read", len(paths))
+        for path in paths:
+            try:
+                yield parse_session(path)
+            except ValueError as e:  # also json.JSONDecodeError
+                print(f"Error reading {path}: {e}")
+
+    def _archive_sessions(self):
+        with open(self.source, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                match = _LINE_DATE_RE.search(line)
+                if match is None:
+                    continue
+                try:
+                    day = _day(match.group(1))
+                except ValueError as e:
+                    print(f"Error reading {self.source}:{line_no}: {e}")
+                    continue
+                if not self._in_range(day):
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    print(f"Error reading {self.source}:{line_no}: {e}")
+                    continue
+                source = data.pop("source", None)
+                data.pop("source_stat", None)
+                path = f"{self.source}:{source}" if source else f"{self.source}:{line_no}"
+                yield Session(path, data, parse_date(data["date"]))
+
+    def sessions(self):
+        """
+        The matching sessions: in the date range, with at least one exercise of the types
+        (if given). Sessions come sorted by date from a directory, in file order from an archive.
+        """
+        it = self._directory_sessions() if os.path.isdir(self.source) else self._archive_sessions()
+        for session in it:
+            if not self._in_range(session.date.toordinal()):
+                continue
+            if self.keys is not None and next(scored_blocks(session.data, self.keys), None) is None:
+                continue
+            yield session
+
+    __iter__ = sessions
+
+    def sets(self):
+        """
+        SetTable of the matching sets. Only the exercises of the types are parsed, and the
+        sets failing the condition are dropped.
+        """
+        table = SetTable()
+        for session in self.sessions():
+            table.add_session(session.date, session.data, self.keys)
+        if self.condition is not None:
+            table = table.filter(self.condition.mask(table.array))
+        registry.count("query_sets", len(table))
+        return table
+
+    def columns(self, ex_type):
+        """
+        SetColumns (crimpy.batch) of the matching sets of one exercise type.
+        """
+        key = _scorer_name(ex_type)
+        table = self.of_type(key).sets()
+        return rows_to_columns(select_kind(table.array, key), key, table.n_sessions)
+
+    def intensity(self, profile=None):
+        """
+        Intensity breakdown of the matching sets, per matching session.
+
+        Returns:
+            tuple: (session day ordinals, {key: intensity array}).
+        """
+        table = self.sets()
+        return np.asarray(table.session_days, dtype=np.int64), table.intensity_breakdown(profile)
+
+    def count(self):
+        """
+        Number of matching sets.
+        """
+        return len(self.sets())
+
+
+def sessions(source, athlete=None, index_path=None):
+    """
+    Lazy query over the sessions of a data directory or a .jsonl archive.
+
+    Args:
+        source (str): Data directory or archive, or a root of athletes (see
+            crimpy.dataset.athlete_sources) if athlete is given.
+        athlete (str): Athlete to query under the root.
+        index_path (str): Location of the intensity index of a directory (crimpy.index).
+    """
+    if athlete is not None:
+        from crimpy.dataset import athlete_sources
+        sources = athlete_sources(source)
+        if athlete not in sources:
+            raise ValueError(f"No athlete {athlete!r} in {source}")
+        source = sources[athlete]
+    return Query(source, index_path=index_path)
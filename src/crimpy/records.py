@@ -0,0 +1,259 @@
+# src/crimpy/records.py
+
+import numpy as np
+
+from crimpy.batch import SetColumns, scored_blocks, workout_intensity, group_breakdown
+from crimpy.scorers import SCORERS
+from crimpy.metrics import registry, timed
+
+
+def kind_codes():
+    """
+    Exercise type codes stored in the "kind" field: scorer name -> code (see crimpy.scorers).
+    """
+    return {name: scorer.code for name, scorer in SCORERS.items()}
+
+
+# One fixed-width row per set (100 bytes). Strings are parsed once, dates are day
+# ordinals (datetime.toordinal) and edge labels are interned in SetTable.edge_names.
+# Values the formulas read are float64, like the scalar path: float32 would round "7.3s" or
+# "12.3mm" and change the scores.
+# Outdoor climbs are rows too, with their grade index (crimpy.grades) and style factor.
+SET_DTYPE = np.dtype([
+    ("day", np.int32),
+    ("kind", np.int8),
+    ("session", np.int32),
+    ("exercise", np.int32),
+    ("edge_id", np.int16),
+    ("edge_mm", np.float64),
+    ("reps", np.int16),
+    ("timeon_s", np.float64),
+    ("timeoff_s", np.float64),
+    ("rest_s", np.float64),
+    ("span", np.float64),
+    ("n_steps", np.int16),
+    ("moves", np.int16),
+    ("spread", np.int16),
+    ("weight_kg", np.float64),
+    ("attempts", np.int16),
+    ("grade", np.float64),
+    ("style", np.float64),
+    ("locktime_s", np.float64),
+    ("n_success", np.int16),
+    ("success", np.int8),
+])
+
+# Fields after the first five (see SetTable.add_session), with their value when a set does
+# not have them.
+_ROW_DEFAULTS = tuple(
+    (name, np.nan if name in ("edge_mm", "weight_kg", "grade") else 0)
+    for name in SET_DTYPE.names[5:]
+)
+
+# Rows are buffered as tuples and converted to arrays in chunks of this size.
+CHUNK_SIZE = 8192
+
+
+def _campus_moves_spread(steps_str):
+    # Same counting as CampusBoard.compute_moves and CampusBoard.compute_spread.
+    moves = len(steps_str.split("-"))
+    try:
+        numbers = [int(n) for n in steps_str.split("-")]
+    except ValueError:
+        return moves, 0
+    return moves, sum(abs(numbers[i] - numbers[i - 1]) for i in range(1, len(numbers)))
+
+
+class SetTable:
+    def __init__(self):
+        """
+        Compact container for the sets of many sessions, stored in a NumPy structured array
+        of SET_DTYPE. Holds millions of sets at a fraction of the memory of per-set objects.
+        """
+        self.edge_names = []
+        self._edge_ids = {}
+        self._chunks = []
+        self._pending = []
+        self._array = None
+        self.n_sessions = 0
+        self.n_exercises = 0
+        self.session_days = []
+
+    def __len__(self):
+        return sum(len(c) for c in self._chunks) + len(self._pending)
+
+    def edge_id(self, edge):
+        """
+        Interned code of an edge label ("20mm", "bar", "Sphere", ...).
+        """
+        edge = "" if edge is None else str(edge)
+        code = self._edge_ids.get(edge)
+        if code is None:
+            code = len(self.edge_names)
+            self._edge_ids[edge] = code
+            self.edge_names.append(edge)
+        return code
+
+    def add_session(self, date, data, keys=None):
+        """
+        Appends the sets of the executed exercises (and climbs) of one session.
+
+        Args:
+            date (datetime): The workout date.
+            data (dict): The workout JSON content.
+            keys (set): Scorer names of the exercises to add, all of them if None. The
+                sets of the other exercises are not parsed.
+        """
+        day = date.toordinal()
+        session = self.n_sessions
+        self.n_sessions += 1
+        self.session_days.append(day)
+        for scorer, ex_type, sets in scored_blocks(data, keys):
+            exercise = self.n_exercises
+            self.n_exercises += 1
+            kind = scorer.code
+            campus = scorer.name == "campusboard"
+            for s in sets:
+                f = scorer.parse(s, ex_type)
+                if campus:
+                    if "steps" not in s:
+                        continue
+                    f["moves"], f["spread"] = _campus_moves_spread(s["steps"])
+                self._pending.append((day, kind, session, exercise, self.edge_id(s.get("edge")))
+                                     + tuple(f.get(name, default) for name, default in _ROW_DEFAULTS))
+        if len(self._pending) >= CHUNK_SIZE:
+            self._flush()
+        self._array = None
+
+    def extend(self, sessions):
+        """
+        Appends many loader Sessions (see crimpy.loader).
+        """
+        for session in sessions:
+            self.add_session(session.date, session.data)
+        return self
+
+    @classmethod
+    def from_sessions(cls, sessions):
+        return cls().extend(sessions)
+
+    def _flush(self):
+        if self._pending:
+            self._chunks.append(np.array(self._pending, dtype=SET_DTYPE))
+            self._pending = []
+
+    @property
+    def array(self):
+        """
+        All rows as one structured array, in insertion order.
+        """
+        if self._array is None:
+            self._flush()
+            if len(self._chunks) > 1:
+                self._chunks = [np.concatenate(self._chunks)]
+            self._array = self._chunks[0] if self._chunks else np.zeros(0, dtype=SET_DTYPE)
+        return self._array
+
+    def __getitem__(self, name):
+        return self.array[name]
+
+    def filter(self, mask):
+        """
+        SetTable of the rows where mask is True, with the same sessions and edge labels.
+        """
+        table = SetTable()
+        table.edge_names = list(self.edge_names)
+        table._edge_ids = dict(self._edge_ids)
+        table._chunks = [self.array[mask]]
+        table.n_sessions = self.n_sessions
+        table.n_exercises = self.n_exercises
+        table.session_days = list(self.session_days)
+        return table
+
+    def items(self):
+        rows = self.array
+        return ((name, rows[name]) for name in SET_DTYPE.names)
+
+    @property
+    def nbytes(self):
+        return self.array.nbytes + sum(len(e) for e in self.edge_names)
+
+    def of_kind(self, key):
+        """
+        Rows of one exercise type (scorer name, e.g. "pullup").
+        """
+        return select_kind(self.array, key)
+
+    def columns(self, key):
+        """
+        SetColumns of one exercise type, ready for the vectorized scoring in crimpy.batch.
+        Workouts are indexed by session number, in insertion order.
+        """
+        return rows_to_columns(self.of_kind(key), key, self.n_sessions)
+
+    def intensity_breakdown(self, profile=None):
+        """
+        Intensity breakdown of every session: key -> array with one value per session.
+        Scored with the parameters of profile (crimpy.profiles), the defaults if None.
+        """
+        return intensity_breakdown(self.array, self.n_sessions, profile)
+
+
+def _take(rows, mask):
+    # Works on structured arrays and on mappings of column arrays (see crimpy.store).
+    if isinstance(rows, np.ndarray):
+        return rows[mask]
+    return {name: np.asarray(values)[mask] for name, values in rows.items()}
+
+
+def select_kind(rows, key):
+    """
+    Rows of one exercise type, from a structured array or a mapping of SET_DTYPE columns.
+    """
+    return _take(rows, np.asarray(rows["kind"]) == SCORERS[key].code)
+
+
+def rows_to_columns(rows, key, n_sessions):
+    """
+    Builds the SetColumns of one exercise type from rows of SET_DTYPE.
+
+    Args:
+        rows (array or dict): Rows of that type only, in insertion order.
+        key (str): Scorer name.
+        n_sessions (int): Number of sessions (workouts) the session field refers to.
+    """
+    required = SCORERS[key].required
+    if required:
+        rows = _take(rows, np.asarray(rows[required]) != 0)
+    # Exercise numbers increase with insertion order, so np.unique keeps them in sequence.
+    exercise_ids, first, exercise = np.unique(rows["exercise"], return_index=True, return_inverse=True)
+    exercise_workout = rows["session"][first]
+    columns = {name: rows[name] for name in SET_DTYPE.names[5:]}
+    return SetColumns(key, n_sessions, exercise_workout, exercise.reshape(-1), **columns)
+
+
+def intensity_breakdown(rows, n_sessions, profile=None):
+    """
+    Scores every exercise type of SET_DTYPE rows with the vectorized formulas of crimpy.batch.
+    Registered scorers must only use fields of SET_DTYPE.
+
+    Returns:
+        dict: breakdown key -> float array with one value per session.
+    """
+    constants = profile.compile() if profile is not None else {}
+    per_scorer = {
+        key: workout_intensity(rows_to_columns(select_kind(rows, key), key, n_sessions), constants=constants.get(key))
+        for key in SCORERS
+    }
+    return group_breakdown(per_scorer, n_sessions)
+
+
+@timed("load_sets")
+def load_sets(data_dir):
+    """
+    SetTable of every session in data_dir (through the cached loader).
+    """
+    from crimpy.loader import load_sessions
+    table = SetTable.from_sessions(load_sessions(data_dir))
+    registry.count("sets_loaded", len(table))
+    return table
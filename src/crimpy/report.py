@@ -0,0 +1,173 @@
+# src/crimpy/report.py
+#
+# Headless batch rendering of the progression charts, for one athlete (a data directory)
+# or many (a root directory with one data sub-directory per athlete).
+#
+#   python -m crimpy.report data/ reports/ --format png pdf
+#   python -m crimpy.report athletes/ reports/ --athletes --workers 8
+
+import os
+import glob
+import json
+import hashlib
+import argparse
+
+from crimpy.intensity import SCORING_VERSION
+
+# Bump when the charts change, so that existing reports get rendered again.
+REPORT_VERSION = 1
+STATE_FILE = ".report_state.json"
+
+# Chart name -> (plotting function name in crimpy.plots, figure size, input kind).
+CHARTS = {
+    "fingerboard": ("plot_fingerboard", (10, 6), "sets"),
+    "campus_moves": ("plot_campus_moves", (10, 6), "sets"),
+    "campus_spread": ("plot_campus_spread", (10, 6), "sets"),
+    "pullups": ("plot_pullups", (10, 6), "sets"),
+    "intensity": ("plot_intensity", (12, 7), "entries"),
+    "intensity_budget": ("plot_intensity_budget", (12, 7), "entries"),
+}
+
+
+def input_fingerprint(data_dir, formats):
+    """
+    Hash of everything a report depends on: the session files (name, mtime, size),
+    the scoring and chart versions, and the output formats.
+    """
+    h = hashlib.sha1()
+    h.update(f"{SCORING_VERSION}:{REPORT_VERSION}:{','.join(sorted(formats))}".encode())
+    for file_path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        st = os.stat(file_path)
+        h.update(f"{os.path.basename(file_path)}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return h.hexdigest()
+
+
+def _render_chart(data_dir, chart, out_paths):
+    """
+    Renders one chart of one athlete to every output path. Runs in a worker process.
+
+    A bare matplotlib Figure is used (no pyplot), which renders through the non-interactive
+    Agg canvas and never needs a display.
+    """
+    from matplotlib.figure import Figure
+    from crimpy import plots
+    from crimpy.index import load_intensity_entries
+    from crimpy.records import load_sets
+
+    func_name, figsize, kind = CHARTS[chart]
+    if kind == "sets":
+        data = load_sets(data_dir)
+    else:
+        data = load_intensity_entries(data_dir)
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    getattr(plots, func_name)(ax, data)
+    fig.tight_layout()
+    for out_path in out_paths:
+        fig.savefig(out_path)
+    return out_paths
+
+
+def _read_state(out_dir):
+    try:
+        with open(os.path.join(out_dir, STATE_FILE), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(out_dir, state):
+    with open(os.path.join(out_dir, STATE_FILE), "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def render_reports(jobs, formats=("png",), charts=None, workers=None, force=False):
+    """
+    Renders the charts of one or many athletes, in parallel worker processes.
+
+    Charts of an athlete whose inputs did not change since the last render (same
+    fingerprint, all outputs present) are skipped.
+
+    Args:
+        jobs (list): (data_dir, out_dir) pairs, one per athlete.
+        formats (tuple): Output formats, any of "png", "svg", "pdf".
+        charts (list): Chart names (see CHARTS), all of them by default.
+        workers (int): Number of worker processes, None for every core.
+        force (bool): Render even if the inputs are unchanged.
+
+    Returns:
+        dict: out_dir -> list of written files (empty when skipped).
+    """
+    from crimpy.index import IntensityIndex
+    from crimpy.loader import load_sessions
+
+    charts = list(charts or CHARTS)
+    tasks = []
+    written = {}
+    fingerprints = {}
+    for data_dir, out_dir in jobs:
+        os.makedirs(out_dir, exist_ok=True)
+        fingerprint = input_fingerprint(data_dir, formats)
+        outputs = {chart: [os.path.join(out_dir, f"{chart}.{fmt}") for fmt in formats] for chart in charts}
+        state = _read_state(out_dir)
+        written[out_dir] = []
+        if not force and state.get("fingerprint") == fingerprint and all(
+                os.path.exists(p) for paths in outputs.values() for p in paths):
+            continue
+        # Warm the on-disk caches once here, rather than in every worker at the same time.
+        load_sessions(data_dir)
+        with IntensityIndex(data_dir) as index:
+            index.refresh()
+        fingerprints[out_dir] = fingerprint
+        tasks.extend((data_dir, out_dir, chart, outputs[chart]) for chart in charts)
+
+    if workers == 1 or len(tasks) <= 1:
+        results = [_render_chart(data_dir, chart, paths) for data_dir, _, chart, paths in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render_chart, data_dir, chart, paths) for data_dir, _, chart, paths in tasks]
+            results = [future.result() for future in futures]
+
+    for (_, out_dir, _, _), paths in zip(tasks, results):
+        written[out_dir].extend(paths)
+    for out_dir, fingerprint in fingerprints.items():
+        _write_state(out_dir, {"fingerprint": fingerprint, "charts": charts, "formats": list(formats)})
+    return written
+
+
+def athlete_jobs(root, out_dir):
+    """
+    One (data_dir, out_dir) job per sub-directory of root that holds session files.
+    """
+    jobs = []
+    for athlete_dir in sorted(glob.glob(os.path.join(root, "*", ""))):
+        if glob.glob(os.path.join(athlete_dir, "*.json")):
+            athlete = os.path.basename(os.path.normpath(athlete_dir))
+            jobs.append((athlete_dir, os.path.join(out_dir, athlete)))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the crimpy progression charts to image files.")
+    parser.add_argument("data_dir", help="session directory, or root of athlete directories with --athletes")
+    parser.add_argument("out_dir")
+    parser.add_argument("--athletes", action="store_true", help="one sub-directory of data_dir per athlete")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "svg", "pdf"])
+    parser.add_argument("--charts", nargs="+", choices=list(CHARTS))
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--force", action="store_true", help="render even if the inputs are unchanged")
+    parser.add_argument("--metrics", help="write stage timings to this file (.prom for Prometheus text, JSON otherwise)")
+    args = parser.parse_args()
+
+    jobs = athlete_jobs(args.data_dir, args.out_dir) if args.athletes else [(args.data_dir, args.out_dir)]
+    written = render_reports(jobs, formats=args.format, charts=args.charts, workers=args.workers, force=args.force)
+    for out_dir, paths in written.items():
+        print(f"{out_dir}: {len(paths)} files written" if paths else f"{out_dir}: unchanged, skipped")
+    if args.metrics:
+        from crimpy.metrics import registry
+        registry.write(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+# src/crimpy/rollup.py
+#
+# Time-bucketed rollups of the history, keyed on day ordinals: intensity (per breakdown
+# key), fingerboard effort and campus board moves and spread (per edge) and pullup
+# repetitions (per added weight), summed per day, ISO week (starting on Monday), month,
+# year or training block.
+#
+# Only the daily rollups are computed from the sets (with the vectorized group-by of
+# crimpy.aggregate). Coarser ones are sums of the rows of a finer one, and every rollup is
+# cached once computed:
+#
+#   sets -> day -> week
+#               -> month -> year
+#               -> block
+#
+#   engine = RollupEngine(load_sets("data/"), blocks=TrainingBlocks({"base": "2025-01-06", "peak": "2025-03-03"}))
+#   engine.rollup("effort", "week").query("2025-01-01", "2025-03-31")
+
+from datetime import date
+
+import numpy as np
+
+from crimpy.records import SetTable
+from crimpy.aggregate import effort_by_day_edge, moves_spread_by_day_edge, reps_by_day_weight
+from crimpy.metrics import timed
+
+PERIODS = ("day", "week", "month", "year", "block")
+
+# Rollup each period is derived from.
+PARENT = {"week": "day", "month": "day", "year": "month", "block": "day"}
+
+MEASURES = ("intensity", "effort", "campus", "pullup")
+
+
+def _ordinal(value):
+    # Day ordinal of a date, datetime, ISO string or ordinal.
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+def period_start(days, period):
+    """
+    First day (ordinal) of the day, week (starting on Monday), month or year of each day
+    ordinal. Training blocks are not calendar periods, see TrainingBlocks.start.
+    """
+    days = np.asarray(days, dtype=np.int64)
+    if period == "day":
+        return days
+    if period == "week":
+        # Ordinal 1 (0001-01-01) is a Monday.
+        return days - (days - 1) % 7
+    if period in ("month", "year"):
+        # Days are few and often repeated: convert each distinct one once.
+        uniq, inverse = np.unique(days, return_inverse=True)
+        starts = [date.fromordinal(int(d)).replace(day=1) for d in uniq]
+        if period == "year":
+            starts = [d.replace(month=1) for d in starts]
+        return np.array([d.toordinal() for d in starts], dtype=np.int64)[inverse.reshape(-1)]
+    raise ValueError(f"Unknown period {period!r}, expected one of {', '.join(PERIODS)}")
+
+
+class TrainingBlocks:
+    def __init__(self, blocks):
+        """
+        Custom training blocks (mesocycles): each one runs from its start day until the next
+        one starts, the last one has no end. Days before the first block are in no block.
+
+        Args:
+            blocks (dict): Block name -> start (date, ISO string or day ordinal).
+        """
+        items = sorted(((_ordinal(start), name) for name, start in blocks.items()))
+        self.starts = np.array([start for start, _ in items], dtype=np.int64)
+        self.names = [name for _, name in items]
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, days):
+        """
+        Index of the block of each day ordinal, -1 before the first block.
+        """
+        return np.searchsorted(self.starts, np.asarray(days, dtype=np.int64), side="right") - 1
+
+    def start(self, days):
+        """
+        Start day of the block of each day ordinal, -1 before the first block.
+        """
+        index = self.index(days)
+        return np.where(index >= 0, self.starts[np.maximum(index, 0)], -1) if len(self) else np.full(len(index), -1)
+
+    @classmethod
+    def parse(cls, items):
+        """
+        Blocks from "name=YYYY-MM-DD" strings (as given on a command line).
+        """
+        blocks = {}
+        for item in items:
+            name, sep, start = item.partition("=")
+            if not sep:
+                raise ValueError(f"Expected name=YYYY-MM-DD, got {item!r}")
+            blocks[name.strip()] = start.strip()
+        return cls(blocks)
+
+
+class Rollup:
+    def __init__(self, period, starts, labels, blocks=None, **values):
+        """
+        Sums per period and label (breakdown key, edge, weight), periods sorted by start.
+
+        Args:
+            period (str): One of PERIODS.
+            starts (array): First day (ordinal) of each period, sorted.
+            labels (list): Label of each column.
+            blocks (TrainingBlocks): The blocks, for the "block" period.
+            **values: Arrays of shape (n_periods, n_labels).
+        """
+        self.period = period
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.labels = list(labels)
+        self.blocks = blocks
+        self.values = values
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def key(self, days):
+        """
+        Start of the period of each day ordinal (as in self.starts).
+        """
+        if self.period == "block":
+            return self.blocks.start(days)
+        return period_start(days, self.period)
+
+    def coarsen(self, period, blocks=None):
+        """
+        Rollup of a coarser period, summing the rows of this one. Each of its periods must
+        fall in a single coarser period (days into anything, months into years).
+
+        Args:
+            period (str): Target period.
+            blocks (TrainingBlocks): Required for the "block" period.
+        """
+        if period == "block" and blocks is None:
+            raise ValueError("The block period needs training blocks")
+        coarse = Rollup(period, [], self.labels, blocks)
+        keys = coarse.key(self.starts)
+        keep = keys >= 0
+        keys = keys[keep]
+        # Keys do not decrease along the sorted starts, so each period is one run of rows.
+        starts, first = np.unique(keys, return_index=True)
+        coarse.starts = starts
+        coarse.values = {name: np.add.reduceat(v[keep], first, axis=0) if len(first) else v[:0]
+                         for name, v in self.values.items()}
+        return coarse
+
+    def names(self):
+        """
+        Label of each period: its ISO start date, or the block name.
+        """
+        if self.period == "block":
+            return [self.blocks.names[i] for i in self.blocks.index(self.starts).tolist()]
+        return [date.fromordinal(int(d)).isoformat() for d in self.starts]
+
+    def query(self, start=None, end=None):
+        """
+        Rows of the periods overlapping [start, end] (dates, ISO strings or ordinals, None for
+        no bound), leaving out the labels with nothing in them.
+
+        Returns:
+            dict: "days" (start of each period), "labels", one list of rows per value name,
+            and for blocks their "names".
+        """
+        i = 0 if start is None else int(np.searchsorted(self.starts, self._first_key(_ordinal(start))))
+        j = len(self.starts) if end is None else int(np.searchsorted(self.starts, _ordinal(end), side="right"))
+        values = {name: v[i:j] for name, v in self.values.items()}
+        used = np.zeros(len(self.labels), dtype=bool)
+        for v in values.values():
+            used |= (v != 0).any(axis=0)
+        result = {
+            "days": [date.fromordinal(int(d)).isoformat() for d in self.starts[i:j]],
+            "labels": [label for label, u in zip(self.labels, used) if u],
+            **{name: v[:, used].tolist() for name, v in values.items()},
+        }
+        if self.period == "block":
+            result["names"] = self.names()[i:j]
+        return result
+
+    def _first_key(self, day):
+        key = int(self.key([day])[0])
+        # Before the first block, the first block is the first one overlapping.
+        return day if key < 0 else key
+
+
+def _by_day(days, values):
+    # Per-day sums of per-session values: (sorted unique days, sums of shape (n_days,)).
+    uniq, index = np.unique(np.asarray(days, dtype=np.int64), return_inverse=True)
+    return uniq, np.bincount(index.reshape(-1), weights=values, minlength=len(uniq))
+
+
+class RollupEngine:
+    def __init__(self, sets, blocks=None, profile=None):
+        """
+        Cached rollups of a history.
+
+        Args:
+            sets: Set columns (SetTable or ColumnStore).
+            blocks (TrainingBlocks): Training blocks, for the "block" period.
+            profile (Profile): Parameters of the intensity formulas (crimpy.profiles),
+                the defaults if None.
+        """
+        self.sets = sets
+        # Kind selections are faster on one structured array than on a mapping of columns.
+        self._rows = sets.array if isinstance(sets, SetTable) else sets
+        self.profile = profile
+        self._blocks = blocks
+        self._sessions = None
+        self._cache = {}
+
+    @property
+    def blocks(self):
+        return self._blocks
+
+    @blocks.setter
+    def blocks(self, blocks):
+        # Only the block rollups depend on the blocks.
+        self._blocks = blocks
+        self._cache = {key: r for key, r in self._cache.items() if key[1] != "block"}
+
+    def sessions(self):
+        """
+        Day ordinal and intensity breakdown of every session, sorted by day.
+
+        Returns:
+            tuple: (day ordinals, {key: intensity array}).
+        """
+        if self._sessions is None:
+            days = np.asarray(self.sets.session_days, dtype=np.int64)
+            order = np.argsort(days, kind="stable")
+            breakdown = self.sets.intensity_breakdown(self.profile)
+            self._sessions = days[order], {key: values[order] for key, values in breakdown.items()}
+        return self._sessions
+
+    def rollup(self, measure, period="day"):
+        """
+        Rollup of one measure, computed from the sets at the day level and from the cached
+        finer rollup otherwise.
+
+        Args:
+            measure (str): "intensity" (values "intensity", one label per breakdown key),
+                "effort" (fingerboard "effort" per edge), "campus" ("moves" and "spread"
+                per edge) or "pullup" ("reps" per added weight).
+            period (str): One of PERIODS.
+
+        Returns:
+            Rollup
+        """
+        key = (measure, period)
+        rollup = self._cache.get(key)
+        if rollup is None:
+            if measure not in MEASURES:
+                raise ValueError(f"Unknown measure {measure!r}, expected one of {', '.join(MEASURES)}")
+            if period == "day":
+                rollup = self._daily(measure)
+            elif period in PARENT:
+                rollup = self.rollup(measure, PARENT[period]).coarsen(period, self._blocks)
+            else:
+                raise ValueError(f"Unknown period {period!r}, expected one of {', '.join(PERIODS)}")
+            self._cache[key] = rollup
+        return rollup
+
+    @timed("aggregate")
+    def _daily(self, measure):
+        rows, edge_names = self._rows, self.sets.edge_names
+        if measure == "intensity":
+            days, breakdown = self.sessions()
+            columns = [_by_day(days, values) for values in breakdown.values()]
+            uniq = columns[0][0] if columns else np.zeros(0, dtype=np.int64)
+            values = np.column_stack([sums for _, sums in columns]) if columns else np.zeros((0, 0))
+            return Rollup("day", uniq, list(breakdown), intensity=values)
+        if measure == "effort":
+            days, edges, effort = effort_by_day_edge(rows, edge_names)
+            return Rollup("day", days, edges, effort=effort)
+        if measure == "campus":
+            days, edges, moves, spread = moves_spread_by_day_edge(rows, edge_names)
+            return Rollup("day", days, edges, moves=moves, spread=spread)
+        days, weights, reps = reps_by_day_weight(rows)
+        return Rollup("day", days, weights, reps=reps)
+
+    def cached(self):
+        """
+        (measure, period) of the rollups computed so far.
+        """
+        return list(self._cache)
+
+    def clear(self):
+        """
+        Drops every cached rollup, e.g. after sets were added.
+        """
+        self._sessions = None
+        self._cache = {}
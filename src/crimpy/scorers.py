@@ -0,0 +1,516 @@
+# src/crimpy/scorers.py
+#
+# Registry of exercise scorers. Each scorer turns the sets of one exercise type into
+# numeric fields (parse) and scores them all at once on column arrays (set_intensity),
+# see crimpy.batch. Exercise types are dispatched with one dictionary lookup.
+#
+# Every type of workout_template.json has a scorer. Other types can be added by
+# registering a Scorer, e.g.
+#
+#   from crimpy.scorers import Scorer, register_scorer
+#
+#   register_scorer(Scorer(
+#       "repeaters", types=["repeaters"], group="fingerboard", scale=0.5,
+#       parse=lambda s, ex_type: {"reps": s.get("reps", 0)},
+#       set_intensity=lambda cols, p: cols.reps / p.reps_ref,
+#       params={"reps_ref": 6},
+#   ))
+#
+# Reference values and weights are parameters, which athlete profiles can override (see
+# crimpy.profiles). Each profile compiles them once into ScorerConstants, with lookup
+# tables for the edge, rest and grade factors.
+#
+# Scorers only using fields of crimpy.records.SET_DTYPE also work on SetTable and
+# ColumnStore rows.
+
+import numpy as np
+
+from crimpy.parsing import time_str_to_seconds, set_edge_mm
+from crimpy.grades import grade_value
+from crimpy.outdoor import CLIMB_STYLES, climb_grade
+
+EXERCISES = "exercises"
+CLIMBS = "climbs"
+
+
+class LookupTable:
+    def __init__(self, func, size):
+        """
+        Values of func precomputed for the integers 0 .. size-1 (edges in mm, rest times in
+        seconds, grade indices), which cover nearly every value found in the logs. Other values
+        go through func itself, so the table never changes a result.
+
+        Args:
+            func (callable): Float array -> float array, elementwise.
+            size (int): Number of precomputed values.
+        """
+        self.func = func
+        self.size = size
+        self.table = np.asarray(func(np.arange(size, dtype=float)), dtype=float)
+        self._values = self.table.tolist()
+
+    def __call__(self, x):
+        """
+        Value for one number (NaN for a missing edge or grade).
+        """
+        if 0 <= x < self.size and x == int(x):
+            return self._values[int(x)]
+        return float(self.func(np.array([x], dtype=float))[0])
+
+    def map(self, values):
+        """
+        Values for an array of numbers.
+        """
+        values = np.asarray(values, dtype=float)
+        with np.errstate(invalid="ignore"):
+            in_table = (values >= 0) & (values < self.size) & (values == np.floor(values))
+        if in_table.all():
+            return self.table[values.astype(np.intp)]
+        out = np.empty(len(values))
+        out[in_table] = self.table[values[in_table].astype(np.intp)]
+        out[~in_table] = self.func(values[~in_table])
+        return out
+
+
+class ScorerConstants:
+    def __init__(self, name, params, tables):
+        """
+        Reference values, weights and lookup tables of one scorer, for one parameter profile
+        (see crimpy.profiles). Parameters are attributes, e.g. constants.edge_ref.
+
+        Args:
+            name (str): Scorer name.
+            params (dict): Parameter name -> value, including "scale".
+            tables (dict): Table name -> (func(values, constants), size), see LookupTable.
+        """
+        self.name = name
+        self.params = dict(params)
+        for key, value in self.params.items():
+            setattr(self, key, value)
+        for key, (func, size) in tables.items():
+            setattr(self, key, LookupTable(lambda values, func=func: func(values, self), size))
+
+
+class Scorer:
+    def __init__(self, name, types, parse, set_intensity, scale, group=None, section=EXERCISES, required=None,
+                 params=None, tables=None, terms=None):
+        """
+        Scoring of one exercise type.
+
+        Args:
+            name (str): Unique scorer name (e.g. "fingerboard").
+            types (list): Lowercase "type" strings handled, as written in the session files.
+                None handles every type of the section that no other scorer claims.
+            parse (callable): (set dict, type string) -> dict of numeric fields, named as the
+                attributes of crimpy.batch.SetColumns.
+            set_intensity (callable): (SetColumns, ScorerConstants) -> array with the
+                intensity of every set.
+            scale (float): Default scaling constant of the exercise. The intensity of an
+                exercise is scale * (sum of its set intensities) / 10.
+            group (str): Breakdown key the intensity is added to (the name by default).
+            section (str): "exercises", or "climbs" for outdoor sessions.
+            required (str): Field that must be nonzero for a set to be scored.
+            params (dict): Default reference values and weights used by set_intensity.
+            tables (dict): Lookup tables built for each parameter profile: name ->
+                (func(float array, ScorerConstants) -> float array, size).
+            terms (callable): (SetColumns, ScorerConstants) -> dict of term name (see
+                crimpy.diagnostics.TERMS) or "rest_factor" -> array, reported to the
+                per-set diagnostics.
+        """
+        self.name = name
+        self.types = None if types is None else [t.lower() for t in types]
+        self.parse = parse
+        self.set_intensity = set_intensity
+        self.params = {"scale": scale, **(params or {})}
+        self.tables = dict(tables or {})
+        self.group = group or name
+        self.section = section
+        self.required = required
+        self.terms = terms
+        self.code = None
+        self.defaults = self.compile()
+
+    def compile(self, overrides=None):
+        """
+        ScorerConstants of the default parameters updated with overrides.
+
+        Raises:
+            ValueError: For an unknown parameter name.
+        """
+        params = dict(self.params)
+        for key, value in (overrides or {}).items():
+            if key not in params:
+                raise ValueError(f"Unknown parameter {key!r} for scorer {self.name!r}, "
+                                 f"expected one of {', '.join(params)}")
+            params[key] = float(value)
+        return ScorerConstants(self.name, params, self.tables)
+
+
+# Scorer name -> Scorer, in registration order (the order in which groups are summed).
+SCORERS = {}
+# Section -> {type string -> Scorer}, and section -> catch-all Scorer.
+_TYPES = {EXERCISES: {}, CLIMBS: {}}
+_DEFAULT = {}
+
+
+def register_scorer(scorer, replace=False):
+    """
+    Adds a scorer to the registry. Its kind code (see crimpy.records) is its position.
+
+    Raises:
+        ValueError: If the name or one of the types is already registered (unless replace).
+    """
+    types = _TYPES.setdefault(scorer.section, {})
+    if not replace:
+        if scorer.name in SCORERS:
+            raise ValueError(f"Scorer {scorer.name!r} is already registered")
+        for ex_type in scorer.types or []:
+            if ex_type in types:
+                raise ValueError(f"Exercise type {ex_type!r} is already scored by {types[ex_type].name!r}")
+    old = SCORERS.get(scorer.name)
+    scorer.code = old.code if old is not None else len(SCORERS)
+    SCORERS[scorer.name] = scorer
+    if scorer.types is None:
+        _DEFAULT[scorer.section] = scorer
+    else:
+        for ex_type in scorer.types:
+            types[ex_type] = scorer
+    return scorer
+
+
+def scorer_for(ex_type, section=EXERCISES):
+    """
+    Scorer of an exercise (or climb) type string, None if the type is not scored.
+    """
+    scorer = _TYPES[section].get(ex_type.lower())
+    return scorer if scorer is not None else _DEFAULT.get(section)
+
+
+def breakdown_keys():
+    """
+    Breakdown keys (scorer groups), in registration order.
+    """
+    return list(dict.fromkeys(scorer.group for scorer in SCORERS.values()))
+
+
+def _seconds(s, name):
+    return time_str_to_seconds(s.get(name, "0s"))
+
+
+def _edge_or_nan(s):
+    edge_val = set_edge_mm(s)
+    return np.nan if edge_val is None else edge_val
+
+
+def _weight_kg(s):
+    if "weight_kg" in s:
+        return float(s["weight_kg"])
+    elif "weight_lb" in s:
+        return float(s["weight_lb"]) * 0.453592
+    return np.nan
+
+
+def _steps(steps_str):
+    try:
+        return [float(x) for x in steps_str.split("-") if x]
+    except (AttributeError, ValueError):
+        return []
+
+
+# Sizes of the lookup tables: edges up to 100mm, rest times up to one hour, grades up to 9c+.
+EDGE_TABLE_SIZE = 101
+REST_TABLE_SIZE = 3601
+GRADE_TABLE_SIZE = 60
+
+
+def _rest_log(timeoff_s, p):
+    # Rest factor shared by most exercises: log(e - 1 + rest/rest_ref).
+    return np.log(np.e - 1 + timeoff_s / p.rest_ref)
+
+
+_REST_TABLE = {"rest_factor": (_rest_log, REST_TABLE_SIZE)}
+
+
+def _valid(values):
+    # Parsed edges and grades, not NaN (missing) or 0.
+    return (values == values) & (values != 0)
+
+
+# --- fingerboard ---
+
+def parse_fingerboard(s, ex_type=None):
+    return {
+        "edge_mm": _edge_or_nan(s),
+        "reps": s.get("reps", 0),
+        "timeon_s": _seconds(s, "timeon"),
+        "timeoff_s": _seconds(s, "timeoff"),
+        "rest_s": _seconds(s, "rest"),
+    }
+
+
+FINGERBOARD_PARAMS = {
+    "edge_ref": 35.0,  # reference edge in mm
+    "alpha": 1.5,  # exponent > 1 for convex reward
+    "timeon_ref": 7, "timeoff_ref": 3, "reps_ref": 6,
+    "w_timeon": 0.2, "w_timeoff": 0.1, "w_edge": 0.4, "w_reps": 0.3,
+    "rest_ref": 1800, "rest_scale": 1.8,
+}
+
+
+def fingerboard_edge_factor(edge_mm, p):
+    # Python's float pow, one edge at a time: numpy's ** differs from it in the last bit
+    # for some edges, and the scores must not depend on the table.
+    return np.array([(p.edge_ref / e) ** p.alpha if e == e and e != 0 else 1.0
+                     for e in np.asarray(edge_mm, dtype=float).tolist()], dtype=float)
+
+
+def fingerboard_rest_factor(rest_s, p):
+    return p.rest_scale * np.log(np.e - 1 + rest_s / p.rest_ref)
+
+
+def fingerboard_set_intensity(cols, p):
+    """
+    Vectorized per-set intensity of WorkoutIntensityCalculator.fingerboard_intensity.
+    """
+    if np.any(cols.timeoff_s == 0):
+        raise ZeroDivisionError("fingerboard set with zero timeoff")
+    edge_factor = p.edge_factor.map(cols.edge_mm)
+    intensity_set = ((cols.timeon_s/p.timeon_ref)*p.w_timeon + (p.timeoff_ref/cols.timeoff_s)*p.w_timeoff
+                     + (p.edge_ref*edge_factor)*p.w_edge + (cols.reps/p.reps_ref)*p.w_reps)
+    return intensity_set / p.rest_factor.map(cols.rest_s)
+
+
+# --- campus board ---
+
+def parse_campusboard(s, ex_type=None):
+    # Sets whose steps cannot be parsed get n_steps = 0, and are not scored.
+    steps = _steps(s.get("steps", ""))
+    return {
+        "edge_mm": _edge_or_nan(s),
+        "span": max(steps) - min(steps) if steps else 0.0,
+        "n_steps": len(steps),
+        "timeoff_s": _seconds(s, "timeoff"),
+    }
+
+
+CAMPUSBOARD_PARAMS = {
+    "edge_ref": 35.0, "ref_span": 3.0, "ref_steps": 6.0,
+    "w_span": 0.25, "w_step": 0.35, "w_edge": 0.40,
+    "rest_ref": 1200, "rest_div": 0.6,
+}
+
+
+def campusboard_edge_factor(edge_mm, p):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(_valid(edge_mm), 1.0 / edge_mm, 1 / p.edge_ref)
+
+
+def campusboard_rest_factor(timeoff_s, p):
+    return np.log(np.e - 1 + timeoff_s / p.rest_ref) / p.rest_div
+
+
+def campusboard_set_intensity(cols, p):
+    """
+    Vectorized per-set intensity of WorkoutIntensityCalculator.campusboard_intensity.
+    """
+    edge_factor = p.edge_factor.map(cols.edge_mm)
+    span_norm = cols.span / p.ref_span
+    step_norm = (cols.span / cols.n_steps) / (p.ref_span / p.ref_steps)
+    intensity_set = span_norm * p.w_span + step_norm * p.w_step + (p.edge_ref * edge_factor) * p.w_edge
+    return intensity_set / p.rest_factor.map(cols.timeoff_s)
+
+
+def parse_campus_boulder(s, ex_type=None):
+    return {"success": float(bool(s.get("success", False))), "timeoff_s": _seconds(s, "timeoff")}
+
+
+def campus_boulder_set_intensity(cols, p):
+    """
+    A boulder climbed on the campus board: one unit per attempt, two when sent.
+
+      intensity_set = (1 + success) / log(e - 1 + rest[s]/300s)
+    """
+    return (1 + cols.success) / p.rest_factor.map(cols.timeoff_s)
+
+
+def campus_boulder_terms(cols, p):
+    return {"success_term": 1 + cols.success, "rest_factor": p.rest_factor.map(cols.timeoff_s)}
+
+
+# --- pullups ---
+
+def parse_pullup(s, ex_type=None):
+    return {
+        "reps": s.get("repetitions", 0),
+        "weight_kg": _weight_kg(s),
+        "timeoff_s": _seconds(s, "timeoff"),
+    }
+
+
+PULLUP_PARAMS = {"reps_ref": 8, "weight_ref": 10, "w_reps": 0.5, "w_weight": 0.5, "rest_ref": 180}
+
+
+def pullup_set_intensity(cols, p):
+    """
+    Vectorized per-set intensity of WorkoutIntensityCalculator.pullup_intensity.
+    """
+    weight = np.where(np.isnan(cols.weight_kg), 0.0, cols.weight_kg)
+    intensity_set = (cols.reps/p.reps_ref)*p.w_reps + (weight/p.weight_ref)*p.w_weight
+    return intensity_set / p.rest_factor.map(cols.timeoff_s)
+
+
+def parse_pullup_lockoff(s, ex_type=None):
+    fields = parse_pullup(s)
+    fields["locktime_s"] = _seconds(s, "locktime")
+    return fields
+
+
+LOCKOFF_PARAMS = {"reps_ref": 8, "weight_ref": 10, "locktime_ref": 3,
+                  "w_reps": 0.4, "w_weight": 0.3, "w_locktime": 0.3, "rest_ref": 180}
+
+
+def pullup_lockoff_set_intensity(cols, p):
+    """
+    Pullups holding a lock-off at the top of each repetition:
+
+      intensity_set = [(reps/8)*0.4 + (weight/10)*0.3 + (locktime/3s)*0.3] / log(e - 1 + rest[s]/180s)
+    """
+    weight = np.where(np.isnan(cols.weight_kg), 0.0, cols.weight_kg)
+    intensity_set = ((cols.reps/p.reps_ref)*p.w_reps + (weight/p.weight_ref)*p.w_weight
+                     + (cols.locktime_s/p.locktime_ref)*p.w_locktime)
+    return intensity_set / p.rest_factor.map(cols.timeoff_s)
+
+
+def pullup_lockoff_terms(cols, p):
+    weight = np.where(np.isnan(cols.weight_kg), 0.0, cols.weight_kg)
+    return {"reps_term": (cols.reps/p.reps_ref)*p.w_reps, "weight_term": (weight/p.weight_ref)*p.w_weight,
+            "locktime_term": (cols.locktime_s/p.locktime_ref)*p.w_locktime,
+            "rest_factor": p.rest_factor.map(cols.timeoff_s)}
+
+
+def parse_deadhang(s, ex_type=None):
+    return {
+        "edge_mm": _edge_or_nan(s),
+        "weight_kg": _weight_kg(s),
+        "timeon_s": _seconds(s, "timeon"),
+        "timeoff_s": _seconds(s, "timeoff"),
+    }
+
+
+DEADHANG_PARAMS = {"edge_ref": 20.0, "alpha": 1.5, "timeon_ref": 10, "weight_ref": 10,
+                   "w_timeon": 0.4, "w_weight": 0.3, "w_edge": 0.3, "rest_ref": 180}
+
+
+def deadhang_set_intensity(cols, p):
+    """
+    Long hangs on an edge or a bar:
+
+      intensity_set = [(timeon/10s)*0.4 + (weight/10)*0.3 + edge_factor*0.3] / log(e - 1 + rest[s]/180s)
+
+    with edge_factor = (20mm/edge)^1.5, and 1 on a bar.
+    """
+    weight = np.where(np.isnan(cols.weight_kg), 0.0, cols.weight_kg)
+    edge_factor = p.edge_factor.map(cols.edge_mm)
+    intensity_set = (cols.timeon_s/p.timeon_ref)*p.w_timeon + (weight/p.weight_ref)*p.w_weight + edge_factor*p.w_edge
+    return intensity_set / p.rest_factor.map(cols.timeoff_s)
+
+
+def deadhang_terms(cols, p):
+    weight = np.where(np.isnan(cols.weight_kg), 0.0, cols.weight_kg)
+    return {"timeon_term": (cols.timeon_s/p.timeon_ref)*p.w_timeon, "weight_term": (weight/p.weight_ref)*p.w_weight,
+            "edge_term": p.edge_factor.map(cols.edge_mm)*p.w_edge, "rest_factor": p.rest_factor.map(cols.timeoff_s)}
+
+
+# --- projects ---
+
+def parse_project(s, ex_type=None):
+    return {"attempts": s.get("attempts", 0), "timeoff_s": _seconds(s, "timeoff")}
+
+
+PROJECT_PARAMS = {"rest_ref": 300}
+
+
+def project_set_intensity(cols, p):
+    """
+    Vectorized per-set intensity of WorkoutIntensityCalculator.project_intensity.
+    """
+    return cols.attempts / p.rest_factor.map(cols.timeoff_s)
+
+
+def project_terms(cols, p):
+    return {"attempts_term": cols.attempts, "rest_factor": p.rest_factor.map(cols.timeoff_s)}
+
+
+def parse_6in6(s, ex_type=None):
+    return {"n_success": s.get("n_success", 0), "timeoff_s": _seconds(s, "timeoff")}
+
+
+def six_in_six_set_intensity(cols, p):
+    """
+    Six boulders climbed six times in a row, counting the successful rounds:
+
+      intensity_set = n_success / log(e - 1 + rest[s]/300s)
+    """
+    return cols.n_success / p.rest_factor.map(cols.timeoff_s)
+
+
+def six_in_six_terms(cols, p):
+    return {"success_term": cols.n_success, "rest_factor": p.rest_factor.map(cols.timeoff_s)}
+
+
+# --- outdoor climbs ---
+
+def parse_climb(s, ex_type=""):
+    # The style of a climb comes from the type of its block.
+    grade = grade_value(climb_grade(s))
+    return {
+        "grade": np.nan if grade is None else grade,
+        "attempts": s.get("attempts", 1),
+        "style": CLIMB_STYLES.get(ex_type, 1.0),
+    }
+
+
+OUTDOOR_PARAMS = {"grade_ref": 36.0}  # 6a
+
+
+def outdoor_grade_factor(grade, p):
+    return np.where(_valid(grade), (grade / p.grade_ref) ** 2, 1.0)
+
+
+def outdoor_set_intensity(cols, p):
+    """
+    Vectorized per-set intensity of WorkoutIntensityCalculator.outdoor_intensity.
+    """
+    return cols.style * cols.attempts * p.grade_factor.map(cols.grade)
+
+
+_FINGERBOARD_TABLES = {"edge_factor": (fingerboard_edge_factor, EDGE_TABLE_SIZE),
+                       "rest_factor": (fingerboard_rest_factor, REST_TABLE_SIZE)}
+_DEADHANG_TABLES = {"edge_factor": (fingerboard_edge_factor, EDGE_TABLE_SIZE), **_REST_TABLE}
+_CAMPUSBOARD_TABLES = {"edge_factor": (campusboard_edge_factor, EDGE_TABLE_SIZE),
+                       "rest_factor": (campusboard_rest_factor, REST_TABLE_SIZE)}
+_OUTDOOR_TABLES = {"grade_factor": (outdoor_grade_factor, GRADE_TABLE_SIZE)}
+
+for _scorer in (
+    Scorer("fingerboard", ["fingerboard"], parse_fingerboard, fingerboard_set_intensity, 0.03,
+           params=FINGERBOARD_PARAMS, tables=_FINGERBOARD_TABLES),
+    Scorer("campusboard", ["campus board"], parse_campusboard, campusboard_set_intensity, 0.25, required="n_steps",
+           params=CAMPUSBOARD_PARAMS, tables=_CAMPUSBOARD_TABLES),
+    Scorer("pullup", ["pullup"], parse_pullup, pullup_set_intensity, 0.9,
+           params=PULLUP_PARAMS, tables=_REST_TABLE),
+    Scorer("project", ["project"], parse_project, project_set_intensity, 0.45,
+           params=PROJECT_PARAMS, tables=_REST_TABLE),
+    Scorer("outdoor", None, parse_climb, outdoor_set_intensity, 0.5, section=CLIMBS,
+           params=OUTDOOR_PARAMS, tables=_OUTDOOR_TABLES),
+    Scorer("sub_project", ["sub_project"], parse_project, project_set_intensity, 0.3, group="project",
+           params=PROJECT_PARAMS, tables=_REST_TABLE, terms=project_terms),
+    Scorer("6in6", ["6in6"], parse_6in6, six_in_six_set_intensity, 0.6, group="project",
+           params=PROJECT_PARAMS, tables=_REST_TABLE, terms=six_in_six_terms),
+    Scorer("campus_boulder", ["campus_boulder"], parse_campus_boulder, campus_boulder_set_intensity, 0.25,
+           group="campusboard", params=PROJECT_PARAMS, tables=_REST_TABLE, terms=campus_boulder_terms),
+    Scorer("pullup_lockoff", ["pullup_lockoff"], parse_pullup_lockoff, pullup_lockoff_set_intensity, 0.9,
+           group="pullup", params=LOCKOFF_PARAMS, tables=_REST_TABLE, terms=pullup_lockoff_terms),
+    Scorer("deadhang", ["deadhang"], parse_deadhang, deadhang_set_intensity, 0.5, group="fingerboard",
+           params=DEADHANG_PARAMS, tables=_DEADHANG_TABLES, terms=deadhang_terms),
+):
+    register_scorer(_scorer)
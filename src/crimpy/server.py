@@ -0,0 +1,289 @@
+# src/crimpy/server.py
+#
+# Local HTTP query API for dashboards, over a data directory or a JSON Lines archive.
+# Everything is aggregated once at startup into per-day matrices (days sorted, one column
+# per edge or added weight); a query for a date range is then a binary search on the days
+# and a slice, and its encoded response is cached.
+#
+#   python -m crimpy.server data/ --port 8080
+#
+#   GET /effort_by_edge?days=90              fingerboard effort per day and edge
+#   GET /campus_by_edge?start=2025-01-01     campus board moves and spread per day and edge
+#   GET /reps_by_weight?end=2025-04-30       pullup reps per day and added weight
+#   GET /intensity?period=week&days=365      intensity breakdown per day, week, month or year
+#   GET /rollup?measure=effort&period=block  any rollup of crimpy.rollup (intensity, effort,
+#                                            campus, pullup per day, week, month, year, block)
+#   GET /stats                               sessions, sets and cache counters
+#
+# Ranges are given by start and/or end (ISO dates, inclusive), or by days: the last N days
+# up to end, which defaults to the last session.
+
+import os
+import sys
+import json
+import threading
+import traceback
+import argparse
+from collections import OrderedDict
+from datetime import date
+from urllib.parse import urlsplit, parse_qsl
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+
+from crimpy.records import SetTable
+from crimpy.rollup import RollupEngine, TrainingBlocks, period_start
+from crimpy.metrics import registry
+
+PERIODS = ("day", "week", "month", "year")
+
+
+class QueryError(ValueError):
+    """
+    Invalid query parameters (answered with HTTP 400).
+    """
+
+
+def _iso(days):
+    return [date.fromordinal(int(d)).isoformat() for d in days]
+
+
+class QueryIndex:
+    # Query name -> method answering it, called with (start, end, params).
+    QUERIES = {
+        "effort_by_edge": "effort_by_edge",
+        "campus_by_edge": "campus_by_edge",
+        "reps_by_weight": "reps_by_weight",
+        "intensity": "intensity_query",
+        "rollup": "rollup_query",
+    }
+
+    def __init__(self, sessions, blocks=None):
+        """
+        In-memory aggregates of a history, built once.
+
+        Args:
+            sessions (iterable): Sessions (crimpy.loader or crimpy.archive).
+            blocks (TrainingBlocks): Training blocks of the "block" rollups (crimpy.rollup).
+        """
+        table = SetTable.from_sessions(sessions)
+        self.n_sessions = table.n_sessions
+        self.n_sets = len(table)
+        self.rollups = RollupEngine(table, blocks)
+        self.effort = self.rollups.rollup("effort")
+        self.campus = self.rollups.rollup("campus")
+        self.pullup = self.rollups.rollup("pullup")
+        # Intensity breakdown of every session, sorted by day.
+        self.session_days, self.breakdown = self.rollups.sessions()
+        self.first_day = int(self.session_days[0]) if len(self.session_days) else date.today().toordinal()
+        self.last_day = int(self.session_days[-1]) if len(self.session_days) else date.today().toordinal()
+
+    def date_range(self, params):
+        """
+        (start, end) day ordinals of the start, end and days query parameters.
+        """
+        try:
+            end = date.fromisoformat(params["end"]).toordinal() if "end" in params else self.last_day
+            if "start" in params:
+                start = date.fromisoformat(params["start"]).toordinal()
+            elif "days" in params:
+                days = int(params["days"])
+                if days < 1:
+                    raise ValueError(f"days must be at least 1, got {days}")
+                start = end - days + 1
+            else:
+                start = self.first_day
+        except ValueError as e:
+            raise QueryError(f"Invalid date range: {e}") from None
+        return start, end
+
+    def effort_by_edge(self, start, end, params):
+        return self.effort.query(start, end)
+
+    def campus_by_edge(self, start, end, params):
+        return self.campus.query(start, end)
+
+    def reps_by_weight(self, start, end, params):
+        return self.pullup.query(start, end)
+
+    def intensity_query(self, start, end, params):
+        return self.intensity(start, end, params.get("period", "week"))
+
+    def rollup_query(self, start, end, params):
+        measure = params.get("measure", "intensity")
+        try:
+            rollup = self.rollups.rollup(measure, params.get("period", "week"))
+        except ValueError as e:
+            raise QueryError(str(e)) from None
+        return {"measure": measure, "period": rollup.period, **rollup.query(start, end)}
+
+    def intensity(self, start, end, period="week"):
+        """
+        Intensity breakdown summed per period, for the sessions in [start, end].
+        """
+        if period not in PERIODS:
+            raise QueryError(f"Unknown period {period!r}, expected one of {', '.join(PERIODS)}")
+        i, j = np.searchsorted(self.session_days, [start, end + 1])
+        periods, index = np.unique(period_start(self.session_days[i:j], period), return_inverse=True)
+        index = index.reshape(-1)
+        sums = {key: np.bincount(index, weights=values[i:j], minlength=len(periods)).tolist()
+                for key, values in self.breakdown.items()}
+        return {"period": period, "days": _iso(periods), "breakdown": sums}
+
+    def run(self, name, params):
+        """
+        Answers one query.
+
+        Args:
+            name (str): Query name, one of QUERIES.
+            params (dict): Query parameters, as strings.
+
+        Returns:
+            dict: JSON-ready result.
+
+        Raises:
+            KeyError: For a name not in QUERIES.
+            QueryError: For invalid parameters.
+        """
+        method = getattr(self, self.QUERIES[name])
+        start, end = self.date_range(params)
+        return method(start, end, params)
+
+
+class ResponseCache:
+    def __init__(self, maxsize=1024):
+        """
+        Thread-safe LRU cache of encoded responses.
+        """
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, index, cache_size=1024):
+        """
+        HTTP server answering the queries of a QueryIndex, one thread per connection.
+
+        Args:
+            address (tuple): (host, port), port 0 for any free port.
+            index (QueryIndex): The aggregates to query.
+            cache_size (int): Number of cached responses, 0 to disable the cache.
+        """
+        super().__init__(address, QueryHandler)
+        self.index = index
+        self.cache = ResponseCache(cache_size) if cache_size else None
+
+    def answer(self, target):
+        """
+        Status and JSON body of a request target ("/intensity?period=week").
+        """
+        url = urlsplit(target)
+        name = url.path.strip("/")
+        params = dict(parse_qsl(url.query))
+        if name == "stats":
+            stats = {"sessions": self.index.n_sessions, "sets": self.index.n_sets,
+                     "cache": self.cache.stats() if self.cache else None}
+            return 200, json.dumps(stats).encode()
+        # Same parameters in any order share a cache entry.
+        key = (name, tuple(sorted(params.items())))
+        body = self.cache.get(key) if self.cache else None
+        if body is not None:
+            return 200, body
+        if name not in self.index.QUERIES:
+            return 404, json.dumps({"error": f"Unknown query {name!r}"}).encode()
+        try:
+            result = self.index.run(name, params)
+        except QueryError as e:
+            return 400, json.dumps({"error": str(e)}).encode()
+        except Exception:
+            # A bug, not a bad request: logged, and the connection stays usable.
+            traceback.print_exc(file=sys.stderr)
+            return 500, json.dumps({"error": f"Internal error answering {name!r}"}).encode()
+        body = json.dumps(result).encode()
+        if self.cache:
+            self.cache.put(key, body)
+        registry.count("queries_answered")
+        return 200, body
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes: without TCP_NODELAY, keep-alive clients wait
+    # for a delayed ACK (~40 ms) on every response.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        status, body = self.server.answer(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # one line per request is too much for a dashboard backend
+
+
+def load_index(source, blocks=None):
+    """
+    QueryIndex of a data directory or a .jsonl archive.
+    """
+    if os.path.isdir(source):
+        from crimpy.loader import load_sessions
+        return QueryIndex(load_sessions(source), blocks)
+    from crimpy.archive import iter_sessions
+    return QueryIndex(iter_sessions(source), blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve aggregate queries over a data directory or archive.")
+    parser.add_argument("source", help="data directory or .jsonl archive")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-size", type=int, default=1024, help="cached responses, 0 to disable")
+    parser.add_argument("--block", nargs="+", default=[], metavar="NAME=YYYY-MM-DD",
+                        help="training blocks, by start day, for /rollup?period=block")
+    args = parser.parse_args()
+    blocks = TrainingBlocks.parse(args.block) if args.block else None
+    server = QueryServer((args.host, args.port), load_index(args.source, blocks), args.cache_size)
+    print(f"{server.index.n_sets} sets from {server.index.n_sessions} sessions, "
+          f"serving on http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
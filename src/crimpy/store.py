@@ -0,0 +1,158 @@
+# src/crimpy/store.py
+#
+# Binary columnar store of set-level history: one fixed-width .npy column per field of
+# crimpy.records.SET_DTYPE, memory-mapped on open so that loading is zero-copy.
+#
+#   store_dir/
+#       meta.json          row/session counts, interned edge labels and kind codes
+#       session_day.npy    day ordinal of each session
+#       <field>.npy        one column per field (day, kind, edge_mm, reps, ...)
+#
+#   python -m crimpy.store data/ store/          (or sessions.jsonl instead of data/)
+
+import os
+import json
+import shutil
+import argparse
+import numpy as np
+
+from crimpy.records import SET_DTYPE, SetTable, intensity_breakdown, kind_codes, rows_to_columns, select_kind
+
+STORE_VERSION = 4
+
+
+def write_store(store_dir, table):
+    """
+    Writes a SetTable to store_dir, replacing any previous store there.
+
+    The store is written to a temporary directory next to store_dir and renamed into place
+    once complete, so a crash never leaves a mix of old and new columns behind.
+
+    Args:
+        store_dir (str): Output directory (its parent is created if needed).
+        table (SetTable): The sets to store.
+    """
+    store_dir = os.path.normpath(store_dir)
+    tmp_dir = f"{store_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    rows = table.array
+    for name in SET_DTYPE.names:
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(rows[name]))
+    np.save(os.path.join(tmp_dir, "session_day.npy"), np.asarray(table.session_days, dtype=np.int32))
+    meta = {
+        "version": STORE_VERSION,
+        "n_rows": int(len(rows)),
+        "n_sessions": table.n_sessions,
+        "n_exercises": table.n_exercises,
+        "edge_names": table.edge_names,
+        "kinds": kind_codes(),
+    }
+    # meta.json is written last: a store without it is incomplete.
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    # The previous store is moved aside, not deleted, until the new one is in place.
+    old_dir = f"{store_dir}.{os.getpid()}.old"
+    if os.path.exists(store_dir):
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(store_dir, old_dir)
+    os.replace(tmp_dir, store_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def build_store(sessions, store_dir):
+    """
+    Builds a store from an iterable of Sessions (from crimpy.loader or crimpy.archive).
+    """
+    table = SetTable()
+    for session in sessions:
+        table.add_session(session.date, session.data)
+    write_store(store_dir, table)
+    return ColumnStore(store_dir)
+
+
+class ColumnStore:
+    def __init__(self, store_dir):
+        """
+        Read-only view on a columnar store. Columns are memory-mapped on first access,
+        so opening a store is near-instant whatever its size.
+
+        Args:
+            store_dir (str): Directory written by write_store.
+        """
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported store version in {store_dir}: {meta.get('version')}")
+        self.n_rows = meta["n_rows"]
+        self.n_sessions = meta["n_sessions"]
+        self.n_exercises = meta["n_exercises"]
+        self.edge_names = meta["edge_names"]
+        # Kind codes follow the scorer registration order, which must match the writer's.
+        codes = kind_codes()
+        for name, code in meta["kinds"].items():
+            if codes.get(name, code) != code:
+                raise ValueError(f"Store {store_dir} uses kind code {code} for {name!r}, "
+                                 f"registered scorers use {codes[name]}")
+        self._columns = {}
+
+    def __len__(self):
+        return self.n_rows
+
+    def _load(self, name):
+        column = self._columns.get(name)
+        if column is None:
+            column = np.load(os.path.join(self.store_dir, f"{name}.npy"), mmap_mode="r")
+            self._columns[name] = column
+        return column
+
+    def __getitem__(self, name):
+        if name not in SET_DTYPE.names:
+            raise KeyError(name)
+        return self._load(name)
+
+    def items(self):
+        return ((name, self._load(name)) for name in SET_DTYPE.names)
+
+    @property
+    def session_days(self):
+        return self._load("session_day")
+
+    def of_kind(self, key):
+        """
+        Rows of one exercise type, as a dict of column arrays.
+        """
+        return select_kind(self, key)
+
+    def columns(self, key):
+        """
+        SetColumns of one exercise type, for the vectorized scoring in crimpy.batch.
+        """
+        return rows_to_columns(self.of_kind(key), key, self.n_sessions)
+
+    def intensity_breakdown(self, profile=None):
+        """
+        Intensity breakdown of every session: key -> array with one value per session.
+        Scored with the parameters of profile (crimpy.profiles), the defaults if None.
+        """
+        return intensity_breakdown(self, self.n_sessions, profile)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a columnar store from a data directory or a JSON Lines archive.")
+    parser.add_argument("source", help="data directory or .jsonl archive")
+    parser.add_argument("store_dir")
+    args = parser.parse_args()
+    if os.path.isdir(args.source):
+        from crimpy.loader import load_sessions
+        sessions = load_sessions(args.source)
+    else:
+        from crimpy.archive import iter_sessions
+        sessions = iter_sessions(args.source)
+    store = build_store(sessions, args.store_dir)
+    print(f"{len(store)} sets from {store.n_sessions} sessions written to {args.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
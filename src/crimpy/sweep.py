@@ -0,0 +1,370 @@
+# src/crimpy/sweep.py
+#
+# Parameter sweeps of the intensity formulas, to calibrate the empirical constants of
+# crimpy.scorers (alpha, rest references, term weights, ...) against the whole history.
+#
+# Parameters are named "<scorer>.<parameter>", e.g. "fingerboard.alpha" or "pullup.rest_ref".
+# The sets are parsed once; a block of parameter sets is then scored at once by giving the
+# swept parameters a leading parameter axis, which the set formulas broadcast over. Large
+# grids are split into blocks, optionally across a process pool.
+#
+#   python -m crimpy.sweep data/ --vary fingerboard.alpha=1.2,1.5,1.8 --vary pullup.rest_ref=120,180,240
+#   python -m crimpy.sweep data/ --oat 0.2                (each parameter alone at -20% and +20%)
+#   python -m crimpy.sweep data/ --sample 500 --vary fingerboard.alpha=1:2 --workers 4
+
+import os
+import random
+import argparse
+import itertools
+
+import numpy as np
+
+from crimpy.batch import flatten_all, group_breakdown, workout_intensity
+from crimpy.scorers import SCORERS
+
+# Upper bound on parameter sets x sets held in one broadcast array.
+MAX_BLOCK_ELEMENTS = 4_000_000
+
+
+def split_name(name):
+    """
+    "fingerboard.alpha" -> ("fingerboard", "alpha").
+
+    Raises:
+        ValueError: If the scorer or the parameter does not exist.
+    """
+    key, _, param = name.partition(".")
+    scorer = SCORERS.get(key)
+    if scorer is None:
+        raise ValueError(f"Unknown scorer {key!r} in {name!r}, expected one of {', '.join(SCORERS)}")
+    if param not in scorer.params:
+        raise ValueError(f"Unknown parameter {param!r} in {name!r}, expected one of {', '.join(scorer.params)}")
+    return key, param
+
+
+def parameter_names():
+    """
+    Every sweepable parameter, as "<scorer>.<parameter>".
+    """
+    return [f"{key}.{param}" for key, scorer in SCORERS.items() for param in scorer.params]
+
+
+def default_value(name):
+    key, param = split_name(name)
+    return SCORERS[key].params[param]
+
+
+def parameter_grid(values):
+    """
+    Every combination of the given parameter values.
+
+    Args:
+        values (dict): Parameter name -> list of values.
+
+    Returns:
+        list: Parameter sets (parameter name -> value).
+    """
+    for name in values:
+        split_name(name)
+    names = list(values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*(values[n] for n in names))]
+
+
+def random_parameters(ranges, n, seed=0):
+    """
+    n parameter sets drawn uniformly in the given ranges.
+
+    Args:
+        ranges (dict): Parameter name -> (low, high).
+        n (int): Number of parameter sets.
+        seed (int): Random seed.
+    """
+    for name in ranges:
+        split_name(name)
+    rng = random.Random(seed)
+    return [{name: rng.uniform(low, high) for name, (low, high) in ranges.items()} for _ in range(n)]
+
+
+def one_at_a_time(names=None, factors=(0.8, 1.2)):
+    """
+    Parameter sets moving one parameter at a time away from its default value.
+
+    Args:
+        names (list): Parameter names, all of them by default.
+        factors (tuple): Multipliers of the default value.
+    """
+    names = parameter_names() if names is None else names
+    return [{name: default_value(name) * factor} for name in names for factor in factors]
+
+
+def profile_params(param_set):
+    """
+    Parameter set -> crimpy.profiles.Profile parameters (scorer name -> {parameter: value}).
+    """
+    params = {}
+    for name, value in param_set.items():
+        key, param = split_name(name)
+        params.setdefault(key, {})[param] = value
+    return params
+
+
+class _Direct:
+    # Stands for a LookupTable when the parameters have a parameter axis: the table
+    # function is evaluated directly, broadcasting over that axis.
+    def __init__(self, func, constants):
+        self.func = func
+        self.constants = constants
+
+    def __call__(self, x):
+        return self.func(np.asarray(x, dtype=float), self.constants)
+
+    def map(self, values):
+        return self.func(np.asarray(values, dtype=float), self.constants)
+
+
+class BroadcastConstants:
+    def __init__(self, scorer, param_sets):
+        """
+        ScorerConstants-like parameters of one scorer for a block of parameter sets: the
+        swept parameters are (n_sets, 1) arrays, the others keep their default value.
+
+        Args:
+            scorer (Scorer): The scorer.
+            param_sets (list): Parameter sets (parameter name -> value).
+        """
+        self.name = scorer.name
+        self.params = dict(scorer.params)
+        for param, default in scorer.params.items():
+            name = f"{scorer.name}.{param}"
+            if any(name in p for p in param_sets):
+                self.params[param] = np.array([float(p.get(name, default)) for p in param_sets])[:, None]
+        for key, value in self.params.items():
+            setattr(self, key, value)
+        for key, (func, _) in scorer.tables.items():
+            setattr(self, key, _Direct(func, self))
+
+
+def swept_scorers(param_sets):
+    """
+    Names of the scorers with at least one parameter in param_sets.
+    """
+    return {split_name(name)[0] for p in param_sets for name in p}
+
+
+def _per_workout(cols, set_intensity, scale, n_params):
+    # workout_intensity with a leading parameter axis: each row gets its own bins in one bincount.
+    set_intensity = np.broadcast_to(set_intensity, (n_params, len(cols)))
+    offsets = np.arange(n_params)[:, None]
+    n_ex = cols.n_exercises
+    per_exercise = np.bincount((offsets * n_ex + cols.exercise).ravel(), weights=set_intensity.ravel(),
+                               minlength=n_params * n_ex).reshape(n_params, n_ex)
+    per_exercise = scale * per_exercise / 10
+    n_w = cols.n_workouts
+    return np.bincount((offsets * n_w + cols.exercise_workout).ravel(), weights=per_exercise.ravel(),
+                       minlength=n_params * n_w).reshape(n_params, n_w)
+
+
+class Sweep:
+    def __init__(self, workouts):
+        """
+        Intensity breakdowns of a fixed history under many parameter sets. The sets are
+        parsed once here; each parameter set then only costs the vectorized formulas.
+
+        Args:
+            workouts (list): Workout dicts as loaded from the JSON files.
+        """
+        self.n_workouts = len(workouts)
+        self.columns = flatten_all(workouts)
+        self.n_sets = sum(len(cols) for cols in self.columns.values())
+        # Scorers not swept in a block keep these values.
+        self._defaults = {key: workout_intensity(cols) for key, cols in self.columns.items()}
+
+    def baseline(self):
+        """
+        Breakdown with the default parameters: key -> array with one value per workout.
+        """
+        return group_breakdown(self._defaults, self.n_workouts)
+
+    def block_size(self):
+        """
+        Number of parameter sets scored at once, so that the broadcast arrays stay small.
+        """
+        return max(1, MAX_BLOCK_ELEMENTS // max(1, self.n_sets, self.n_workouts))
+
+    def evaluate_block(self, param_sets):
+        """
+        Breakdowns of a block of parameter sets, scored together.
+
+        Returns:
+            dict: breakdown key -> array of shape (len(param_sets), n_workouts).
+        """
+        n_params = len(param_sets)
+        swept = swept_scorers(param_sets)
+        per_scorer = {}
+        for key, cols in self.columns.items():
+            if key not in swept:
+                per_scorer[key] = np.broadcast_to(self._defaults[key], (n_params, self.n_workouts))
+                continue
+            scorer = SCORERS[key]
+            constants = BroadcastConstants(scorer, param_sets)
+            set_intensity = scorer.set_intensity(cols, constants) if len(cols) else np.zeros(0)
+            per_scorer[key] = _per_workout(cols, set_intensity, constants.scale, n_params)
+        breakdown = group_breakdown(per_scorer, self.n_workouts)
+        return {key: np.broadcast_to(values, (n_params, self.n_workouts)) for key, values in breakdown.items()}
+
+    def evaluate(self, param_sets, workers=1):
+        """
+        Breakdowns of every parameter set, block by block.
+
+        Args:
+            param_sets (list): Parameter sets (parameter name -> value), see parameter_grid,
+                random_parameters and one_at_a_time.
+            workers (int): Number of worker processes. None uses every core, 1 runs in-process.
+
+        Returns:
+            dict: breakdown key -> array of shape (len(param_sets), n_workouts).
+        """
+        size = self.block_size()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1:
+            # Smaller blocks, so that every worker gets some.
+            size = max(1, min(size, -(-len(param_sets) // workers)))
+        blocks = [param_sets[i:i + size] for i in range(0, len(param_sets), size)]
+
+        if workers == 1 or len(blocks) <= 1:
+            results = [self.evaluate_block(block) for block in blocks]
+        else:
+            # Imported here: the process pool machinery is slow to import and often not needed.
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+                results = list(pool.map(_evaluate_in_worker, blocks))
+
+        if not results:
+            return {key: np.zeros((0, self.n_workouts)) for key in self.baseline()}
+        return {key: np.concatenate([r[key] for r in results]) for key in results[0]}
+
+
+_worker_sweep = None
+
+
+def _init_worker(sweep):
+    # The parsed columns are sent once per worker, not once per block.
+    global _worker_sweep
+    _worker_sweep = sweep
+
+
+def _evaluate_in_worker(param_sets):
+    return {key: np.ascontiguousarray(values) for key, values in _worker_sweep.evaluate_block(param_sets).items()}
+
+
+def _correlation(a, b):
+    if len(a) < 2 or np.std(a) == 0 or np.std(b) == 0:
+        return float("nan")
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+def sensitivity(result, param_sets, baseline, target=None):
+    """
+    How the total intensity series moves away from the baseline for each parameter set.
+
+    Args:
+        result (dict): Output of Sweep.evaluate.
+        param_sets (list): The parameter sets evaluated.
+        baseline (dict): Output of Sweep.baseline.
+        target (array): Optional perceived effort of each workout (NaN where unknown), to
+            calibrate against.
+
+    Returns:
+        list: One dict per parameter set, with "params" (the parameter set),
+        "shift" (relative change of the summed intensity), "mean_abs_shift" and
+        "max_abs_shift" (per workout), "correlation" (with the baseline series) and,
+        with a target, "target_correlation".
+    """
+    total = sum(values for values in result.values())
+    base = sum(values for values in baseline.values())
+    base_sum = base.sum()
+    known = None if target is None else ~np.isnan(np.asarray(target, dtype=float))
+    rows = []
+    for i, params in enumerate(param_sets):
+        series = total[i]
+        diff = series - base
+        row = {"params": params}
+        row["shift"] = float(series.sum() / base_sum - 1) if base_sum else float("nan")
+        row["mean_abs_shift"] = float(np.abs(diff).mean()) if len(diff) else 0.0
+        row["max_abs_shift"] = float(np.abs(diff).max()) if len(diff) else 0.0
+        row["correlation"] = _correlation(series, base)
+        if known is not None:
+            row["target_correlation"] = _correlation(series[known], np.asarray(target, dtype=float)[known])
+        rows.append(row)
+    return rows
+
+
+def format_table(rows):
+    """
+    Sensitivity rows as an aligned text table.
+    """
+    if not rows:
+        return ""
+    columns = list(rows[0])
+    cells = [[" ".join(f"{name}={value:g}" for name, value in row[c].items()) if c == "params" else f"{row[c]:.4g}"
+              for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[j]) for r in cells)) for j, c in enumerate(columns)]
+    # Parameters left-aligned, numbers right-aligned.
+    def line(values):
+        return "  ".join(v.ljust(w) if j == 0 else v.rjust(w) for j, (v, w) in enumerate(zip(values, widths)))
+    lines = [line(columns)] + [line(r) for r in cells]
+    return "\n".join(lines)
+
+
+def _parse_vary(items):
+    # ["fingerboard.alpha=1.2,1.5"] -> ({name: [values]}, {}), ["fingerboard.alpha=1:2"] -> ({}, {name: (1, 2)})
+    values = {}
+    ranges = {}
+    for item in items:
+        name, _, spec = item.partition("=")
+        split_name(name)
+        if ":" in spec:
+            low, high = spec.split(":")
+            ranges[name] = (float(low), float(high))
+        else:
+            values[name] = [float(v) for v in spec.split(",") if v]
+    return values, ranges
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the parameters of the intensity formulas over a history.")
+    parser.add_argument("data_dir", help="session directory")
+    parser.add_argument("--vary", action="append", default=[], metavar="SCORER.PARAM=V1,V2|LOW:HIGH",
+                        help="values (grid) or range (with --sample) of a parameter, repeatable")
+    parser.add_argument("--sample", type=int, help="number of random parameter sets drawn in the --vary ranges")
+    parser.add_argument("--oat", type=float, help="move each parameter alone by +/- this fraction")
+    parser.add_argument("--effort", help="session key holding the perceived effort, to calibrate against")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 for every core)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from crimpy.loader import load_sessions
+    sessions = [s for s in load_sessions(args.data_dir) if "exercises" in s.data or s.is_outdoor]
+    sweep = Sweep([s.data for s in sessions])
+
+    values, ranges = _parse_vary(args.vary)
+    if args.oat:
+        param_sets = one_at_a_time(list(values) or None, (1 - args.oat, 1 + args.oat))
+    elif args.sample:
+        param_sets = random_parameters(ranges, args.sample, args.seed)
+    else:
+        param_sets = parameter_grid(values)
+    if not param_sets:
+        parser.error("nothing to sweep: give --vary values, --sample with --vary ranges, or --oat")
+
+    target = None
+    if args.effort:
+        target = np.array([float(s.data.get(args.effort, np.nan)) for s in sessions])
+    result = sweep.evaluate(param_sets, workers=args.workers or None)
+    print(f"{len(param_sets)} parameter sets over {len(sessions)} sessions ({sweep.n_sets} sets)")
+    print(format_table(sensitivity(result, param_sets, sweep.baseline(), target)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# src/crimpy/synthetic.py
+#
+# Synthetic workout sessions in the workout_template.json schema, for benchmarks and load
+# tests at scales the real data/ folder does not reach (10k to 10M sets).
+#
+#   python -m crimpy.synthetic synthetic/ --sets 100000
+#   python -m crimpy.synthetic synthetic.jsonl --sets 10000000 --mix fingerboard=2 campusboard=1
+
+import os
+import json
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from crimpy.scorers import SCORERS
+from crimpy.loader import DATE_FORMAT
+
+# Share of the sets of each exercise type, by scorer name. The other types of the template
+# (deadhang, 6in6, ...) can be added with --mix.
+DEFAULT_MIX = {
+    "fingerboard": 0.3,
+    "campusboard": 0.4,
+    "pullup": 0.15,
+    "project": 0.15,
+}
+
+FINGERBOARD_EDGES = ("15mm", "18mm", "20mm", "22mm", "25mm", "28mm", "35mm")
+CAMPUS_EDGES = ("20mm", "22mm", "28mm", "35mm", "Sphere")
+OUTDOOR_GRADES = ("5c", "6a", "6a+", "6b", "6b+", "6c", "6c+", "7a", "7a+", "7b")
+
+# Scorer name -> "type" string written in the session files.
+_EXERCISE_TYPES = {name: scorer.types[0] for name, scorer in SCORERS.items() if scorer.types}
+
+
+def _seconds(rng, choices):
+    return f"{rng.choice(choices)}s"
+
+
+def _fingerboard_set(rng):
+    return {"edge": rng.choice(FINGERBOARD_EDGES), "reps": rng.randint(4, 8),
+            "timeon": _seconds(rng, (7, 7, 10)), "timeoff": _seconds(rng, (3, 3, 5)),
+            "rest": _seconds(rng, (60, 90, 120, 180))}
+
+
+def _campus_set(rng):
+    # An increasing ladder of 2 to 4 rungs.
+    rungs = [1]
+    for _ in range(rng.randint(1, 3)):
+        rungs.append(min(rungs[-1] + rng.randint(1, 3), 9))
+    return {"edge": rng.choice(CAMPUS_EDGES), "steps": "-".join(str(r) for r in rungs),
+            "timeoff": _seconds(rng, (30, 60, 90, 120, 300)), "sides": rng.choice("LR")}
+
+
+def _pullup_set(rng):
+    s = {"edge": "bar", "repetitions": rng.randint(4, 10), "timeoff": _seconds(rng, (90, 120, 180, 360))}
+    if rng.random() < 0.7:
+        s["weight_kg"] = rng.choice((0, 5, 10, 15, 20))
+    else:
+        s["weight_lb"] = str(rng.choice((10, 20, 30)))
+    return s
+
+
+def _project_set(rng):
+    return {"attempts": rng.randint(1, 5), "timeoff": _seconds(rng, (180, 200, 300)),
+            "success": rng.random() < 0.4}
+
+
+def _campus_boulder_set(rng):
+    return {"timeoff": _seconds(rng, (120, 180, 300)), "success": rng.random() < 0.5}
+
+
+def _lockoff_set(rng):
+    s = _pullup_set(rng)
+    s["locktime"] = _seconds(rng, (2, 3, 5))
+    return s
+
+
+def _deadhang_set(rng):
+    return {"edge": rng.choice(FINGERBOARD_EDGES + ("bar",)), "timeon": _seconds(rng, (10, 20, 30)),
+            "timeoff": _seconds(rng, (120, 180)), "weight_kg": rng.choice((0, 5, 10))}
+
+
+def _6in6_set(rng):
+    return {"n_success": rng.randint(0, 6), "timeoff": _seconds(rng, (240, 300, 360))}
+
+
+_SET_MAKERS = {
+    "fingerboard": _fingerboard_set,
+    "campusboard": _campus_set,
+    "pullup": _pullup_set,
+    "project": _project_set,
+    "sub_project": _project_set,
+    "6in6": _6in6_set,
+    "campus_boulder": _campus_boulder_set,
+    "pullup_lockoff": _lockoff_set,
+    "deadhang": _deadhang_set,
+}
+
+
+def synthetic_session(rng, date, n_sets, mix=None):
+    """
+    One indoor session with n_sets sets spread over the exercise types of mix.
+
+    Args:
+        rng (random.Random): Source of randomness.
+        date (datetime): Session date.
+        n_sets (int): Number of sets in the session.
+        mix (dict): Scorer name -> relative share of the sets (DEFAULT_MIX by default).
+
+    Returns:
+        dict: The session, as it would be loaded from a JSON file.
+    """
+    mix = mix or DEFAULT_MIX
+    keys = [key for key in _SET_MAKERS if mix.get(key, 0) > 0]
+    counts = dict.fromkeys(keys, 0)
+    for key in rng.choices(keys, weights=[mix[key] for key in keys], k=n_sets):
+        counts[key] += 1
+    exercises = []
+    order = 0
+    for key in keys:
+        if counts[key] == 0:
+            continue
+        order += 1
+        make = _SET_MAKERS[key]
+        exercises.append({"type": _EXERCISE_TYPES[key], "executed": True, "order": order,
+                          "sets": [make(rng) for _ in range(counts[key])]})
+    # Planned but skipped exercises are part of real logs too.
+    if rng.random() < 0.1:
+        key = rng.choice(keys)
+        exercises.append({"type": _EXERCISE_TYPES[key], "executed": False, "order": 0,
+                          "sets": [_SET_MAKERS[key](rng)]})
+    return {"date": date.strftime(DATE_FORMAT), "exercises": exercises}
+
+
+def outdoor_session(rng, date):
+    """
+    One outdoor session, logging climbs instead of exercises.
+    """
+    sets = [{"Grade": rng.choice(OUTDOOR_GRADES), "attempts": rng.randint(1, 3), "success": rng.random() < 0.5}
+            for _ in range(rng.randint(2, 8))]
+    return {"date": date.strftime(DATE_FORMAT), "name": "Crag",
+            "climbs": [{"type": "lead", "executed": True, "order": 1, "sets": sets}]}
+
+
+def iter_synthetic(n_sets, mix=None, seed=0, start=datetime(2000, 1, 1), sets_per_session=30,
+                   outdoor_fraction=0.05):
+    """
+    Lazily yields sessions, one per day from start, until they hold n_sets exercise sets.
+    The output only depends on the arguments, so runs are reproducible.
+
+    Args:
+        n_sets (int): Total number of exercise sets (outdoor climbs are not counted).
+        mix (dict): Scorer name -> relative share of the sets (DEFAULT_MIX by default).
+        seed (int): Random seed.
+        start (datetime): Date of the first session.
+        sets_per_session (int): Average number of sets per indoor session.
+        outdoor_fraction (float): Share of outdoor sessions.
+
+    Yields:
+        dict: Sessions, as they would be loaded from JSON files.
+    """
+    rng = random.Random(seed)
+    remaining = n_sets
+    day = 0
+    while remaining > 0:
+        date = start + timedelta(days=day)
+        day += 1
+        if rng.random() < outdoor_fraction:
+            yield outdoor_session(rng, date)
+            continue
+        n = min(remaining, rng.randint(sets_per_session // 2, sets_per_session * 3 // 2) or 1)
+        remaining -= n
+        yield synthetic_session(rng, date, n, mix)
+
+
+def write_directory(out_dir, sessions):
+    """
+    Writes one JSON file per session to out_dir, like the files copied from the phone.
+
+    Returns:
+        int: Number of files written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    n = 0
+    for n, data in enumerate(sessions, 1):
+        with open(os.path.join(out_dir, f"synthetic_{n:07d}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    return n
+
+
+def write_archive(archive_path, sessions):
+    """
+    Writes the sessions to a JSON Lines archive readable by crimpy.archive.iter_sessions.
+
+    Returns:
+        int: Number of sessions written.
+    """
+    n = 0
+    with open(archive_path, "w", encoding="utf-8") as f:
+        for n, data in enumerate(sessions, 1):
+            record = dict(data, source=f"synthetic_{n:07d}.json")
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+    return n
+
+
+def parse_mix(items):
+    """
+    Parses ["fingerboard=2", "campusboard=1"] into a mix dictionary.
+    """
+    mix = {}
+    for item in items:
+        key, _, share = item.partition("=")
+        if key not in _SET_MAKERS:
+            raise ValueError(f"Unknown exercise {key!r}, expected one of {', '.join(_SET_MAKERS)}")
+        mix[key] = float(share or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic workout sessions.")
+    parser.add_argument("out", help="output directory, or a .jsonl archive")
+    parser.add_argument("--sets", type=int, default=10000)
+    parser.add_argument("--mix", nargs="+", default=[], help="shares by exercise, e.g. fingerboard=2 pullup=1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sets-per-session", type=int, default=30)
+    parser.add_argument("--outdoor", type=float, default=0.05, help="share of outdoor sessions")
+    args = parser.parse_args()
+
+    sessions = iter_synthetic(args.sets, mix=parse_mix(args.mix) or None, seed=args.seed,
+                              sets_per_session=args.sets_per_session, outdoor_fraction=args.outdoor)
+    if args.out.endswith(".jsonl"):
+        n = write_archive(args.out, sessions)
+    else:
+        n = write_directory(args.out, sessions)
+    print(f"{n} sessions ({args.sets} sets) written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
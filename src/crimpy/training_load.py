@@ -0,0 +1,260 @@
+# src/crimpy/training_load.py
+#
+# Training load over time, from the per-session intensity breakdowns:
+#
+#   daily load        sum of the session intensities of each calendar day (rest days are 0)
+#   acute / chronic   rolling means of the daily load over ACUTE_DAYS and CHRONIC_DAYS
+#   ACWR              acute / chronic workload ratio
+#   fatigue / fitness exponentially weighted means over the same windows, alpha = 2 / (days + 1)
+#   form              fitness - fatigue
+#   monotony, strain  mean / std of the load over the last week, and weekly load * monotony
+#
+# Windows reaching before the first day count the missing days as rest days. Each window is
+# summed on its own values, not as a difference of running totals, which would keep rounding
+# residue from the whole history (a window of rest days must sum to exactly 0).
+# The series functions compute everything at once; TrainingLoad keeps the same numbers up to
+# date one session at a time.
+
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+
+def _alpha(days):
+    return 2.0 / (days + 1)
+
+
+def daily_load(entries):
+    """
+    Daily training load from scored sessions (IndexEntry, ScoredSession, ... with a date and
+    a breakdown), with one value per calendar day from the first to the last session.
+
+    Returns:
+        tuple: (day ordinals, load array).
+    """
+    days = []
+    loads = []
+    for entry in entries:
+        if entry.breakdown:
+            days.append(entry.date.toordinal())
+            loads.append(sum(entry.breakdown.values()))
+    if not days:
+        return np.zeros(0, dtype=int), np.zeros(0)
+    days = np.asarray(days)
+    first = days.min()
+    load = np.bincount(days - first, weights=np.asarray(loads, dtype=float))
+    return np.arange(first, first + len(load)), load
+
+
+def _windows(values, window):
+    # View of the last `window` values at each position, counting days before the first one
+    # as rest days: shape (..., n, window) for series stacked on leading axes.
+    values = np.asarray(values, dtype=float)
+    padded = np.concatenate((np.zeros(values.shape[:-1] + (window - 1,)), values), axis=-1)
+    return sliding_window_view(padded, window, axis=-1)
+
+
+def _window_monotony(windows):
+    # Mean / standard deviation along the last axis, NaN for constant windows (whose
+    # computed standard deviation may be a rounding residue instead of 0).
+    windows = np.asarray(windows, dtype=float)
+    mean = windows.mean(axis=-1)
+    std = windows.std(axis=-1)
+    constant = windows.max(axis=-1) == windows.min(axis=-1)
+    return np.where(constant, np.nan, _ratio(mean, np.where(constant, 1.0, std)))
+
+
+def rolling_sum(values, window):
+    """
+    Sum of the last window values at each position, in O(n * window). Series stacked on
+    leading axes (one row per plan, ...) are rolled along the last axis.
+    """
+    return _windows(values, window).sum(axis=-1)
+
+
+def rolling_mean(values, window):
+    return rolling_sum(values, window) / window
+
+
+def _ratio(num, den):
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    out = np.full(np.broadcast(num, den).shape, np.nan)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def acwr(load, acute=ACUTE_DAYS, chronic=CHRONIC_DAYS):
+    """
+    Rolling-average acute:chronic workload ratio, NaN while the chronic load is 0.
+    """
+    return _ratio(rolling_mean(load, acute), rolling_mean(load, chronic))
+
+
+def ewma(load, days, initial=0.0):
+    """
+    Exponentially weighted moving average with alpha = 2 / (days + 1), starting from initial
+    (the value on the day before the first one). Stacked series are averaged along the last
+    axis, initial then has one value per series.
+    """
+    alpha = _alpha(days)
+    load = np.asarray(load, dtype=float)
+    if load.ndim > 1:
+        out = np.empty(load.shape)
+        value = np.broadcast_to(np.asarray(initial, dtype=float), load.shape[:-1]).copy()
+        for i in range(load.shape[-1]):
+            value += alpha * (load[..., i] - value)
+            out[..., i] = value
+        return out
+    out = np.empty(len(load))
+    value = float(initial)
+    for i, x in enumerate(load.tolist()):
+        value += alpha * (x - value)
+        out[i] = value
+    return out
+
+
+def monotony(load, window=ACUTE_DAYS):
+    """
+    Mean / standard deviation of the load over the last window days, NaN when it is constant.
+    """
+    return _window_monotony(_windows(load, window))
+
+
+def strain(load, window=ACUTE_DAYS):
+    """
+    Load of the last window days times its monotony.
+    """
+    return rolling_sum(load, window) * monotony(load, window)
+
+
+def load_series(entries, acute=ACUTE_DAYS, chronic=CHRONIC_DAYS):
+    """
+    Every training load series of scored sessions, one value per calendar day.
+
+    Returns:
+        dict: "day" (ordinals), "load", "acute", "chronic", "acwr", "fatigue", "fitness",
+        "form", "monotony" and "strain" arrays.
+    """
+    days, load = daily_load(entries)
+    fatigue = ewma(load, acute)
+    fitness = ewma(load, chronic)
+    return {
+        "day": days,
+        "load": load,
+        "acute": rolling_mean(load, acute),
+        "chronic": rolling_mean(load, chronic),
+        "acwr": acwr(load, acute, chronic),
+        "fatigue": fatigue,
+        "fitness": fitness,
+        "form": fitness - fatigue,
+        "monotony": monotony(load, acute),
+        "strain": strain(load, acute),
+    }
+
+
+class TrainingLoad:
+    def __init__(self, acute=ACUTE_DAYS, chronic=CHRONIC_DAYS):
+        """
+        Incremental training load: each add() and state() costs O(chronic), so a new session
+        does not require recomputing the whole history. Sessions must be added in
+        date order (several per day are fine).
+
+        Args:
+            acute (int): Acute window, in days.
+            chronic (int): Chronic window, in days.
+        """
+        if not 0 < acute <= chronic:
+            raise ValueError(f"Expected 0 < acute <= chronic, got {acute} and {chronic}")
+        self.acute = acute
+        self.chronic = chronic
+        self.day = None
+        # Loads of the last `chronic` days, oldest first.
+        self._window = deque([0.0] * chronic, maxlen=chronic)
+        self.fatigue = 0.0
+        self.fitness = 0.0
+
+    @classmethod
+    def from_entries(cls, entries, acute=ACUTE_DAYS, chronic=CHRONIC_DAYS):
+        state = cls(acute, chronic)
+        for entry in sorted(entries, key=lambda e: e.date):
+            if entry.breakdown:
+                state.add(entry.date, sum(entry.breakdown.values()))
+        return state
+
+    def _next_day(self):
+        # Slides the windows by one rest day.
+        self._window.append(0.0)
+        self.fatigue *= 1 - _alpha(self.acute)
+        self.fitness *= 1 - _alpha(self.chronic)
+
+    def _skip_days(self, n):
+        if n >= self.chronic:
+            # Both windows are only rest days now, the averages just decay.
+            self._window.extend([0.0] * self.chronic)
+            self.fatigue *= (1 - _alpha(self.acute)) ** n
+            self.fitness *= (1 - _alpha(self.chronic)) ** n
+        else:
+            for _ in range(n):
+                self._next_day()
+
+    def add(self, date, load):
+        """
+        Adds the load of one session.
+
+        Args:
+            date (datetime or date): Session date, not earlier than the previous one.
+            load (float): Session intensity (e.g. the sum of its breakdown).
+        """
+        day = date.toordinal()
+        if self.day is None:
+            # The window starts as `chronic` rest days before the first session.
+            self.day = day
+            self._skip_days(1)
+        elif day < self.day:
+            raise ValueError(f"Sessions must be added in date order: {date} is before the last one")
+        elif day > self.day:
+            self._skip_days(day - self.day)
+            self.day = day
+        self._window[-1] += load
+        # The averages are linear in today's load.
+        self.fatigue += _alpha(self.acute) * load
+        self.fitness += _alpha(self.chronic) * load
+
+    def advance(self, date):
+        """
+        Moves the state forward to date, counting the days in between as rest days.
+        """
+        day = date.toordinal()
+        if self.day is not None and day > self.day:
+            self._skip_days(day - self.day)
+            self.day = day
+
+    def state(self):
+        """
+        Current values, on the day of the last add() or advance().
+
+        Returns:
+            dict: Same keys as load_series (without "day" and "load"), as floats.
+        """
+        # The same window computations as the series functions, on the same values.
+        window = np.array(self._window)
+        acute_window = window[-self.acute:]
+        acute_sum = float(acute_window.sum())
+        acute = acute_sum / self.acute
+        chronic = float(window.sum()) / self.chronic
+        mono = float(_window_monotony(acute_window))
+        return {
+            "acute": acute,
+            "chronic": chronic,
+            "acwr": acute / chronic if chronic > 0 else float("nan"),
+            "fatigue": self.fatigue,
+            "fitness": self.fitness,
+            "form": self.fitness - self.fatigue,
+            "monotony": mono,
+            "strain": acute_sum * mono,
+        }
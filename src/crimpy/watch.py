@@ -0,0 +1,326 @@
+# src/crimpy/watch.py
+#
+# Live intensity updates: an asyncio service watching a data directory. When a session file
+# is copied, edited or deleted, only that file is validated and rescored (through the
+# intensity index), and subscribers receive the new aggregates right away.
+#
+# Changes come from the optional watchfiles package (OS file notifications) when it is
+# installed, and otherwise from polling the directory listing every `interval` seconds.
+# Bursts of writes to the same file (a phone sync, an editor saving) are debounced: a file
+# is processed once it has been quiet for `debounce` seconds.
+#
+# Subscribers are callbacks (plain functions or coroutines), async iterators (events()),
+# or dashboards reading the Server-Sent Events stream of serve_events():
+#
+#   python -m crimpy.watch data/ --port 8765
+#   curl -N http://127.0.0.1:8765/events        (GET /state for the current aggregates)
+
+import os
+import json
+import asyncio
+import argparse
+
+from crimpy.index import IntensityIndex
+from crimpy.training_load import TrainingLoad
+
+
+def _scan(data_dir):
+    # Stat key of every session file: path -> (mtime_ns, size).
+    keys = {}
+    with os.scandir(data_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".json") and entry.is_file():
+                st = entry.stat()
+                keys[os.path.abspath(entry.path)] = (st.st_mtime_ns, st.st_size)
+    return keys
+
+
+def _json_value(value):
+    # NaN (e.g. an undefined ACWR) is not valid JSON.
+    return None if isinstance(value, float) and value != value else value
+
+
+def entry_dict(entry):
+    """
+    JSON-ready view of an IndexEntry.
+    """
+    return {"path": entry.path, "date": entry.date.date().isoformat(), "outdoor": entry.outdoor,
+            "name": entry.name, "breakdown": entry.breakdown, "intensity": sum(entry.breakdown.values())}
+
+
+class Watcher:
+    def __init__(self, data_dir, interval=0.5, debounce=0.2, index_path=None):
+        """
+        Watches data_dir and keeps the intensity aggregates of its sessions up to date.
+
+        Args:
+            data_dir (str): Directory holding the *.json workout files.
+            interval (float): Polling period in seconds, when watchfiles is not installed.
+            debounce (float): Quiet time in seconds before a changed file is processed.
+            index_path (str): Location of the intensity index (see crimpy.index).
+        """
+        self.data_dir = os.path.abspath(data_dir)
+        self.interval = interval
+        self.debounce = debounce
+        self.index = IntensityIndex(self.data_dir, index_path)
+        self._subscribers = []
+        self._queues = []
+        self._pending = {}
+        self._keys = {}
+        self.entries = {}
+        self.totals = {}
+        self.load = TrainingLoad()
+
+    def close(self):
+        self.index.close()
+
+    # --- state ---
+
+    def load_initial(self):
+        """
+        Refreshes the index once and builds the aggregates from every session.
+        """
+        self.index.refresh()
+        self._keys = _scan(self.data_dir)
+        self.entries = {entry.path: entry for entry in self.index.entries()}
+        self.totals = {}
+        for entry in self.entries.values():
+            self._add_totals(entry.breakdown, 1)
+        self._rebuild_load()
+
+    def _add_totals(self, breakdown, sign):
+        for key, value in breakdown.items():
+            self.totals[key] = self.totals.get(key, 0.0) + sign * value
+
+    def _rebuild_load(self):
+        self.load = TrainingLoad.from_entries(self.entries.values())
+
+    def aggregates(self):
+        """
+        Current aggregates: number of sessions, date of the last one, intensity totals per
+        exercise type and training load (see crimpy.training_load) on the last session day.
+        """
+        last = max((entry.date for entry in self.entries.values()), default=None)
+        load = self.load.state() if self.load.day is not None else {}
+        return {
+            "sessions": len(self.entries),
+            "last_date": last.date().isoformat() if last else None,
+            "totals": self.totals,
+            "load": {key: _json_value(value) for key, value in load.items()},
+        }
+
+    def process(self, path):
+        """
+        Rescores one file and updates the aggregates. Called by the watch loop once the file
+        is quiet; can also be called directly. A file that cannot be read, parsed or scored
+        is dropped from the aggregates and reported in an "error" event, with its "error"
+        message; the service keeps watching.
+
+        Returns:
+            dict: The event sent to subscribers, None if the file did not change.
+        """
+        path = os.path.abspath(path)
+        try:
+            status = self.index.update(path)
+            error = self.index.errors.get(path)
+        except Exception as e:
+            # E.g. the file was deleted again while it was being read: one file must not
+            # stop the service.
+            status, error = "error", f"Error reading {path}: {type(e).__name__}: {e}"
+        if status == "unchanged":
+            return None
+        old = self.entries.pop(path, None)
+        if old is not None:
+            self._add_totals(old.breakdown, -1)
+        entry = self.index.entry(path) if status != "error" else None
+        if entry is not None:
+            self.entries[path] = entry
+            self._add_totals(entry.breakdown, 1)
+        if (status == "added" and entry is not None and entry.breakdown
+                and (self.load.day is None or entry.date.toordinal() >= self.load.day)):
+            # A new latest session only moves the load forward, in constant time.
+            self.load.add(entry.date, sum(entry.breakdown.values()))
+        elif old is not None or (entry is not None and entry.breakdown):
+            self._rebuild_load()
+        event = {
+            "type": "error" if status == "error" else "update",
+            "status": status,
+            "path": path,
+            "entry": entry_dict(entry) if entry is not None else None,
+            "aggregates": self.aggregates(),
+        }
+        if status == "error":
+            event["error"] = error
+        return event
+
+    # --- subscribers ---
+
+    def subscribe(self, callback):
+        """
+        Calls callback(event) after every processed change. Coroutine functions are awaited.
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    async def events(self):
+        """
+        Async iterator over the events, for as long as the caller keeps iterating.
+        """
+        queue = asyncio.Queue()
+        self._queues.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._queues.remove(queue)
+
+    async def _publish(self, event):
+        for queue in self._queues:
+            queue.put_nowait(event)
+        for callback in list(self._subscribers):
+            try:
+                result = callback(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                # One failing subscriber must not stop the service.
+                print(f"Subscriber {callback!r} failed: {e}")
+
+    # --- watching ---
+
+    def _changed(self, path):
+        # Starts, or restarts, the quiet period of a file.
+        self._pending[path] = asyncio.get_running_loop().time() + self.debounce
+
+    async def _flush_due(self):
+        now = asyncio.get_running_loop().time()
+        for path in [p for p, due in self._pending.items() if due <= now]:
+            del self._pending[path]
+            event = self.process(path)
+            if event is not None:
+                await self._publish(event)
+
+    async def _poll(self):
+        while True:
+            keys = _scan(self.data_dir)
+            for path in keys.keys() | self._keys.keys():
+                if keys.get(path) != self._keys.get(path):
+                    self._changed(path)
+            self._keys = keys
+            await self._flush_due()
+            await asyncio.sleep(min(self.interval, self.debounce) if self._pending else self.interval)
+
+    async def _notify(self, watchfiles):
+        # OS notifications; the debounce timers are checked between batches of changes.
+        async def flusher():
+            while True:
+                await self._flush_due()
+                await asyncio.sleep(self.debounce / 2)
+
+        task = asyncio.create_task(flusher())
+        try:
+            async for changes in watchfiles.awatch(self.data_dir, recursive=False):
+                for _, path in changes:
+                    if path.endswith(".json"):
+                        self._changed(os.path.abspath(path))
+        finally:
+            task.cancel()
+
+    async def run(self, polling=None):
+        """
+        Watches the directory until cancelled.
+
+        Args:
+            polling (bool): Force polling (True) or file notifications (False). By default,
+                notifications are used if the watchfiles package is installed.
+        """
+        self.load_initial()
+        watchfiles = None
+        if not polling:
+            try:
+                import watchfiles
+            except ImportError:
+                if polling is False:
+                    raise
+        if watchfiles is None:
+            await self._poll()
+        else:
+            await self._notify(watchfiles)
+
+
+async def _handle_client(watcher, reader, writer):
+    try:
+        request = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # headers are not used
+        parts = request.decode("latin-1").split()
+        path = parts[1] if len(parts) > 1 else "/"
+        if path == "/state":
+            body = json.dumps(watcher.aggregates()).encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body)
+        elif path == "/events":
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n\r\n")
+            writer.write(f"data: {json.dumps({'type': 'state', 'aggregates': watcher.aggregates()})}\n\n".encode())
+            await writer.drain()
+            async for event in watcher.events():
+                writer.write(f"data: {json.dumps(event)}\n\n".encode())
+                await writer.drain()
+        else:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+        pass  # client gone, or server shutting down
+    finally:
+        writer.close()
+
+
+async def serve_events(watcher, host="127.0.0.1", port=8765):
+    """
+    Serves the aggregates over HTTP: GET /state returns them as JSON, GET /events streams
+    every update as Server-Sent Events (readable by a browser EventSource).
+
+    Returns:
+        asyncio.Server: The started server.
+    """
+    return await asyncio.start_server(lambda r, w: _handle_client(watcher, r, w), host, port)
+
+
+async def _main(args):
+    watcher = Watcher(args.data_dir, interval=args.interval, debounce=args.debounce)
+    server = None
+    try:
+        if args.port:
+            server = await serve_events(watcher, args.host, args.port)
+            print(f"Serving on http://{args.host}:{args.port}/events")
+        if not args.quiet:
+            watcher.subscribe(lambda e: print(f"{e['status']}: {os.path.basename(e['path'])} -> "
+                                              f"{e['entry']['intensity'] if e['entry'] else '-'}"))
+        await watcher.run(polling=True if args.poll else None)
+    finally:
+        if server is not None:
+            server.close()
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a data directory and rescore sessions as they change.")
+    parser.add_argument("data_dir")
+    parser.add_argument("--interval", type=float, default=0.5, help="polling period in seconds")
+    parser.add_argument("--debounce", type=float, default=0.2, help="quiet time before a changed file is scored")
+    parser.add_argument("--poll", action="store_true", help="poll even if watchfiles is installed")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="serve /state and /events on this port")
+    parser.add_argument("--quiet", action="store_true", help="do not print the updates")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()